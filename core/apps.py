@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Contabiliza as consultas de cada requisição nas métricas
+        from .metrics import install_query_counter
+
+        connection_created.connect(install_query_counter, dispatch_uid="core_query_counter")
@@ -0,0 +1,124 @@
+"""
+Autenticação JWT para views assíncronas.
+
+As views assíncronas (executadas nativamente no event loop sob ASGI)
+não passam pelo ciclo de autenticação do DRF. Este módulo aplica o
+mesmo esquema do JWTAuthentication (cabeçalho `Authorization: Bearer`)
+utilizando o ORM assíncrono do Django para carregar o usuário.
+"""
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+
+_jwt_authentication = JWTAuthentication()
+
+
+async def aauthenticate(request):
+    """
+    Autentica a requisição a partir do access token JWT.
+
+    A validação do token não acessa o banco de dados; apenas o
+    carregamento do usuário utiliza o ORM (de forma assíncrona).
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Requisição recebida pela view assíncrona.
+
+    Returns
+    -------
+    User | None
+        Usuário autenticado, ou None caso o token esteja ausente,
+        inválido ou pertença a um usuário inexistente/inativo.
+    """
+    header = _jwt_authentication.get_header(request)
+    if header is None:
+        return None
+
+    raw_token = _jwt_authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    try:
+        token = _jwt_authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+
+    return await atoken_user(token)
+
+
+async def atoken_user(token):
+    """
+    Carrega o usuário de um token JWT já validado.
+
+    Parameters
+    ----------
+    token : rest_framework_simplejwt.tokens.Token
+        Token validado (assinatura, expiração e tipo).
+
+    Returns
+    -------
+    User | None
+        Usuário do token, ou None caso a claim esteja ausente ou o
+        usuário seja inexistente/inativo.
+    """
+    try:
+        user_id = token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        return None
+
+    User = get_user_model()
+
+    try:
+        user = await User.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        return None
+
+    if not user.is_active:
+        return None
+
+    return user
+
+
+def async_authenticated(view=None, *, authenticate=aauthenticate):
+    """
+    Decorator que restringe uma view assíncrona a usuários autenticados.
+
+    Equivalente à permissão IsAuthenticated das views DRF: o usuário
+    autenticado é atribuído a `request.user`.
+
+    Parameters
+    ----------
+    authenticate : Callable
+        Função assíncrona de autenticação (padrão `aauthenticate`),
+        para views que aceitam outras credenciais
+        (ex.: `@async_authenticated(authenticate=...)`).
+
+    Returns
+    -------
+    Callable
+        View assíncrona que responde 401 Unauthorized quando a
+        requisição não estiver autenticada.
+    """
+    if view is None:
+        return lambda view: async_authenticated(view, authenticate=authenticate)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await authenticate(request)
+
+        if user is None:
+            return JsonResponse(
+                {"detail": "As credenciais de autenticação não foram fornecidas ou são inválidas"},
+                status=401
+            )
+
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,154 @@
+"""
+Métricas da aplicação no formato Prometheus.
+
+Define as métricas de requisições HTTP (coletadas pelo
+MetricsMiddleware), de consultas ao banco de dados por requisição e de
+ingestão de eventos, expostas pelo endpoint `/metrics`.
+
+Com vários processos de aplicação (ex.: gunicorn/uvicorn com workers),
+a variável de ambiente PROMETHEUS_MULTIPROC_DIR deve apontar para um
+diretório vazio, gravável por todos os workers, antes da inicialização:
+cada processo grava suas métricas em arquivos nesse diretório e o
+endpoint agrega os valores de todos eles. O diretório deve ser limpo a
+cada reinício do servidor.
+"""
+import os
+from contextvars import ContextVar
+
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Requisições HTTP processadas",
+    ["view", "method", "status"],
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP",
+    ["view", "method"],
+)
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    ["view", "method"],
+    multiprocess_mode="livesum",
+)
+
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "Consultas ao banco de dados por requisição HTTP",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float("inf")),
+)
+
+INGESTED_EVENTS = Counter(
+    "monitoring_events_ingested_total",
+    "Eventos de monitoramento aceitos",
+    ["detected_class", "outcome"],
+)
+
+EVIDENCE_BYTES = Counter(
+    "monitoring_evidence_bytes_total",
+    "Bytes de evidência recebidos",
+)
+
+
+# Contador de consultas da requisição corrente. Variáveis de contexto
+# são propagadas pelo asgiref para as threads de `sync_to_async`, de
+# modo que as consultas das views assíncronas também são contadas.
+_query_count = ContextVar("query_count", default=None)
+
+
+class QueryCounter:
+    """
+    Contador mutável de consultas, compartilhado pelo contexto da requisição.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+
+def start_query_count() -> tuple[QueryCounter, object]:
+    """
+    Inicia a contagem de consultas do contexto corrente.
+
+    Returns
+    -------
+    tuple[QueryCounter, Token]
+        Contador e token para `stop_query_count`.
+    """
+    counter = QueryCounter()
+    return counter, _query_count.set(counter)
+
+
+def stop_query_count(token) -> None:
+    """
+    Encerra a contagem iniciada por `start_query_count`.
+    """
+    _query_count.reset(token)
+
+
+def count_query(execute, sql, params, many, context):
+    """
+    Execute wrapper que contabiliza as consultas no contador do contexto.
+    """
+    counter = _query_count.get()
+    if counter is not None:
+        counter.count += 1
+
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs) -> None:
+    """
+    Instala o `count_query` em cada nova conexão com o banco de dados.
+
+    Conectado ao sinal `connection_created` em CoreConfig.ready.
+    """
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def class_label(detected_class: str) -> str:
+    """
+    Normaliza a classe detectada para uso como label.
+
+    Quando MONITORING_DETECTION_CLASSES estiver configurado, classes
+    fora da lista são agrupadas em "other", limitando a cardinalidade
+    das séries (a classe é texto livre enviado pelos dispositivos).
+    """
+    known = settings.MONITORING_DETECTION_CLASSES
+    if known and detected_class not in known:
+        return "other"
+    return detected_class
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Gera a exposição das métricas no formato texto do Prometheus.
+
+    Returns
+    -------
+    tuple[bytes, str]
+        Conteúdo e Content-Type da resposta.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
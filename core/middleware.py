@@ -0,0 +1,105 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.urls import Resolver404, resolve
+
+from core.metrics import (
+    DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    start_query_count,
+    stop_query_count,
+)
+
+# Métodos registrados como rótulo; os demais são agrupados em "other",
+# evitando séries ilimitadas criadas por métodos arbitrários dos clientes
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"}
+
+
+class MetricsMiddleware:
+    """
+    Middleware responsável pela coleta de métricas das requisições HTTP.
+
+    Registra, por view e método, a quantidade de requisições por
+    status, a latência, as requisições em andamento e a quantidade de
+    consultas ao banco de dados (ver `core.metrics`).
+
+    Compatível com execução síncrona (WSGI) e assíncrona (ASGI), sem
+    forçar a adaptação das views assíncronas para threads.
+
+    Respostas em fluxo (exportação, transmissão ao vivo) são contadas,
+    mas não entram no histograma de latência: a view retorna antes do
+    envio do conteúdo, cuja duração depende do cliente.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        measurement = self._start(request)
+        response = None
+        try:
+            response = self.get_response(request)
+            return response
+        finally:
+            self._finish(request, measurement, response)
+
+    async def __acall__(self, request):
+        measurement = self._start(request)
+        response = None
+        try:
+            response = await self.get_response(request)
+            return response
+        finally:
+            self._finish(request, measurement, response)
+
+    def _start(self, request) -> tuple:
+        """
+        Identifica a view e inicia a medição da requisição.
+
+        Returns
+        -------
+        tuple
+            View, método, contador de consultas, token do contador e
+            instante inicial.
+        """
+        try:
+            match = resolve(request.path_info)
+            view = match.view_name or match.route
+        except Resolver404:
+            view = "unmatched"
+
+        method = request.method if request.method in METHODS else "other"
+
+        HTTP_REQUESTS_IN_PROGRESS.labels(view, method).inc()
+        counter, token = start_query_count()
+
+        return view, method, counter, token, time.perf_counter()
+
+    def _finish(self, request, measurement: tuple, response) -> None:
+        """
+        Registra as métricas ao final da requisição.
+        """
+        view, method, counter, token, started = measurement
+        duration = time.perf_counter() - started
+        stop_query_count(token)
+
+        status = response.status_code if response is not None else 500
+
+        HTTP_REQUESTS_IN_PROGRESS.labels(view, method).dec()
+        HTTP_REQUESTS.labels(view, method, status).inc()
+        DB_QUERIES.labels(view).observe(counter.count)
+
+        if response is None or not response.streaming:
+            HTTP_REQUEST_DURATION.labels(view, method).observe(duration)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-17 01:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogSystem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=255, verbose_name='Ação')),
+                ('timestamp', models.DateTimeField(auto_now_add=True, verbose_name='Data e Hora')),
+                ('status', models.CharField(max_length=100, verbose_name='Status')),
+                ('message', models.TextField(verbose_name='Mensagem')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Log do Sistema',
+                'verbose_name_plural': 'Logs do Sistema',
+                'db_table': 'log_system',
+                'ordering': ['-timestamp'],
+            },
+        ),
+    ]
@@ -0,0 +1,251 @@
+"""
+Paginação por cursor (keyset) das listagens de eventos.
+
+Em vez de OFFSET, cada página é obtida a partir da posição do último
+registro da página anterior, codificada no cursor: a consulta filtra
+os registros após (campo de ordenação, id) e utiliza o índice
+correspondente, com custo constante mesmo em páginas profundas. O id
+desempata registros com o mesmo valor do campo de ordenação.
+
+Formato da resposta:
+    {
+        "next": URL da próxima página, ou null na última página,
+        "results": [...]
+    }
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação keyset sobre (ordering_field, id).
+
+    O tamanho da página é definido por PAGINATION_PAGE_SIZE e pode ser
+    informado pelo cliente (`page_size`) até PAGINATION_MAX_PAGE_SIZE.
+
+    Compatível com views DRF (`paginate_queryset` /
+    `get_paginated_response`) e com views assíncronas
+    (`apaginate_queryset` / `get_paginated_data`).
+    """
+
+    ordering_field = "detected_at"
+    descending = True
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Cursor inválido"
+
+    def __init__(self):
+        self.next_url = None
+
+    def get_page_size(self, request) -> int:
+        """
+        Tamanho da página solicitado, limitado ao máximo configurado.
+        """
+        try:
+            page_size = int(self._params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.PAGINATION_PAGE_SIZE
+
+        return max(1, min(page_size, settings.PAGINATION_MAX_PAGE_SIZE))
+
+    def encode_cursor(self, instance) -> str:
+        """
+        Codifica a posição do registro informado.
+        """
+        position = [getattr(instance, self.ordering_field).isoformat(), instance.pk]
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, request) -> tuple[datetime, int] | None:
+        """
+        Decodifica o cursor recebido na querystring.
+
+        Raises
+        ------
+        NotFound
+            Caso o cursor seja inválido.
+        """
+        cursor = self._params(request).get(self.cursor_query_param)
+
+        if not cursor:
+            return None
+
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(value), int(pk)
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def page_queryset(self, queryset: QuerySet, request) -> QuerySet:
+        """
+        Ordena e filtra o queryset a partir do cursor.
+
+        Retorna um registro além do tamanho da página, que indica a
+        existência da próxima página.
+        """
+        field = self.ordering_field
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        if self.descending:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+        else:
+            queryset = queryset.order_by(field, "pk")
+
+        if position is not None:
+            value, pk = position
+            strict, inclusive = ("lt", "lte") if self.descending else ("gt", "gte")
+
+            # Equivalente a (field, id) < (value, pk) (ou > na ordem
+            # crescente), com o primeiro termo usado como limite do índice
+            queryset = queryset.filter(
+                Q(**{f"{field}__{inclusive}": value}),
+                Q(**{f"{field}__{strict}": value}) | Q(**{f"pk__{strict}": pk})
+            )
+
+        return queryset[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        """
+        Retorna os registros da página solicitada.
+        """
+        return self._page(list(self.page_queryset(queryset, request)), request)
+
+    async def apaginate_queryset(self, queryset: QuerySet, request) -> list:
+        """
+        Versão assíncrona de `paginate_queryset`.
+        """
+        return self._page([item async for item in self.page_queryset(queryset, request)], request)
+
+    def get_paginated_data(self, data) -> dict:
+        """
+        Envelope da resposta paginada.
+        """
+        return {"next": self.next_url, "results": data}
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor da página, retornado em `next`",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Quantidade de registros por página",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def _page(self, items: list, request) -> list:
+        """
+        Separa o registro excedente e monta a URL da próxima página.
+        """
+        self.next_url = None
+
+        if len(items) > self.page_size:
+            items = items[:self.page_size]
+            self.next_url = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                self.encode_cursor(items[-1])
+            )
+
+        return items
+
+    def _params(self, request):
+        """
+        Parâmetros da querystring (requisição DRF ou Django).
+        """
+        return getattr(request, "query_params", request.GET)
+
+
+class ChangesPagination(KeysetPagination):
+    """
+    Paginação do feed de alterações: registros criados após o cursor
+    `since`, em ordem crescente de (created_at, id).
+
+    A resposta inclui o cursor a partir do qual a próxima consulta deve
+    continuar (`cursor`), mesmo quando não há registros novos. Sem
+    `since`, nenhum registro é retornado e o cursor aponta para o
+    registro mais recente, permitindo que o cliente inicie o
+    acompanhamento a partir do estado atual.
+
+    Formato da resposta:
+        {
+            "cursor": cursor para a próxima consulta (null sem registros),
+            "next": URL da próxima página, ou null na última página,
+            "results": [...]
+        }
+    """
+
+    ordering_field = "created_at"
+    descending = False
+    cursor_query_param = "since"
+
+    def __init__(self):
+        super().__init__()
+        self.cursor = None
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        """
+        Retorna os registros posteriores ao cursor, ou nenhum registro
+        (apenas o cursor inicial) quando `since` não for informado.
+        """
+        if not self._params(request).get(self.cursor_query_param):
+            self.page_size = self.get_page_size(request)
+            head = queryset.order_by(f"-{self.ordering_field}", "-pk").first()
+            self.cursor = self.encode_cursor(head) if head is not None else None
+            return []
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_data(self, data) -> dict:
+        """
+        Envelope da resposta, com o cursor da próxima consulta.
+        """
+        return {"cursor": self.cursor, "next": self.next_url, "results": data}
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["cursor", "results"]
+        response_schema["properties"]["cursor"] = {"type": "string", "nullable": True}
+        return response_schema
+
+    def _page(self, items: list, request) -> list:
+        """
+        Além da página, define o cursor do último registro retornado
+        (ou mantém o cursor recebido, sem registros novos).
+        """
+        items = super()._page(items, request)
+        self.cursor = (
+            self.encode_cursor(items[-1]) if items
+            else self._params(request).get(self.cursor_query_param)
+        )
+        return items
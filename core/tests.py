@@ -1,3 +1,51 @@
-from django.test import TestCase
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from prometheus_client import REGISTRY
 
-# Create your tests here.
+from core.middleware import MetricsMiddleware
+
+
+class MetricsMiddlewareTests(SimpleTestCase):
+    """
+    Rótulos e latência registrados pelo MetricsMiddleware.
+    """
+
+    def process(self, request, response):
+        return MetricsMiddleware(lambda request: response)(request)
+
+    def sample(self, name: str, **labels) -> float:
+        return REGISTRY.get_sample_value(name, {"view": "metrics", **labels}) or 0
+
+    def test_unknown_method_is_labeled_other(self):
+        before = self.sample("http_requests_total", method="other", status="405")
+
+        self.process(RequestFactory().generic("BREW", "/metrics"), HttpResponse(status=405))
+
+        self.assertEqual(
+            self.sample("http_requests_total", method="other", status="405"),
+            before + 1,
+        )
+        self.assertIsNone(
+            REGISTRY.get_sample_value(
+                "http_requests_total", {"view": "metrics", "method": "BREW", "status": "405"}
+            )
+        )
+
+    def test_streaming_response_is_not_observed(self):
+        before = self.sample("http_request_duration_seconds_count", method="GET")
+        requests = self.sample("http_requests_total", method="GET", status="200")
+
+        self.process(RequestFactory().get("/metrics"), StreamingHttpResponse(iter([b"data"])))
+
+        self.assertEqual(self.sample("http_request_duration_seconds_count", method="GET"), before)
+        self.assertEqual(
+            self.sample("http_requests_total", method="GET", status="200"),
+            requests + 1,
+        )
+
+    def test_response_is_observed(self):
+        before = self.sample("http_request_duration_seconds_count", method="GET")
+
+        self.process(RequestFactory().get("/metrics"), HttpResponse())
+
+        self.assertEqual(self.sample("http_request_duration_seconds_count", method="GET"), before + 1)
@@ -1,5 +1,10 @@
 from django.urls import path
 
+from core.views import metrics_view
+
 urlpatterns = [
   
+    # MÉTRICAS (PROMETHEUS)
+    # GET /metrics
+    path("metrics", metrics_view, name="metrics"),
 ]
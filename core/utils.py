@@ -1,5 +1,5 @@
 from core.models import LogSystem
-from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.models import AbstractBaseUser
 
 def report_log(
     user,
@@ -15,8 +15,8 @@ def report_log(
     ações relevantes para auditoria, rastreabilidade e diagnóstico.
 
     O parâmetro `user` é normalizado para garantir que usuários
-    anônimos ou valores inválidos não causem falhas na persistência
-    do registro.
+    anônimos, dispositivos autenticados por chave ou valores inválidos
+    não causem falhas na persistência do registro.
 
     Parameters
     ----------
@@ -37,7 +37,7 @@ def report_log(
     """
     
     # Normaliza o usuário para evitar inconsistências
-    if not user or isinstance(user, AnonymousUser):
+    if not isinstance(user, AbstractBaseUser):
         user = None
     
     # Persiste o log no banco de dados   
@@ -46,4 +46,37 @@ def report_log(
         action = action,
         status = status,
         message = message
-    )
\ No newline at end of file
+    )
+
+async def areport_log(
+    user,
+    action: str,
+    status: str,
+    message: str
+) -> None:
+    """
+    Versão assíncrona de `report_log`, para uso em views assíncronas.
+
+    Utiliza o ORM assíncrono do Django, sem bloquear o event loop.
+
+    Parameters
+    ----------
+    user
+        Instância do usuário autenticado responsável pela ação,
+        ou None quando a ação não estiver associada a um usuário.
+    action : str
+        Identificador textual da ação executada.
+    status : str
+        Status da ação (ex.: SUCCESS, WARNING, ERROR).
+    message : str
+        Descrição detalhada do evento registrado.
+    """
+    if not isinstance(user, AbstractBaseUser):
+        user = None
+
+    await LogSystem.objects.acreate(
+        user = user,
+        action = action,
+        status = status,
+        message = message
+    )
@@ -0,0 +1,37 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from .metrics import render_metrics
+
+
+@require_GET
+def metrics_view(request) -> HttpResponse:
+    """
+    Expõe as métricas da aplicação no formato texto do Prometheus.
+
+    Quando METRICS_TOKEN estiver configurado, exige o cabeçalho
+    `Authorization: Bearer <METRICS_TOKEN>`; caso contrário, aceita
+    apenas requisições originadas de METRICS_ALLOWED_IPS.
+
+    Returns
+    -------
+    HttpResponse
+        - 200 OK: Métricas de todos os processos da aplicação
+        - 401 Unauthorized: Token ausente ou inválido
+        - 403 Forbidden: Origem não autorizada (sem METRICS_TOKEN)
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        provided = request.headers.get("Authorization", "")
+
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return HttpResponse(status=401)
+
+    elif request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponse(status=403)
+
+    content, content_type = render_metrics()
+    return HttpResponse(content, content_type=content_type)
@@ -0,0 +1,161 @@
+"""
+Views assíncronas do dashboard.
+
+Equivalentes às views DRF de `dashboard.views`, executadas nativamente
+no event loop quando a aplicação é servida via ASGI (`project.asgi`).
+As consultas utilizam o ORM assíncrono do Django, sem ocupar uma
+thread por requisição enquanto aguardam o banco de dados.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import NotFound
+
+from core.authentication import async_authenticated
+from core.pagination import KeysetPagination
+from core.utils import areport_log
+from monitoring.mac import format_mac, parse_mac
+from .cache import aevents_version, not_modified, response_etag, response_key
+from .dates import parse_date_range
+from .live import aauthenticate_live, event_stream
+from .queries import events_in_range
+from .serializers import dashboard_rows, encode_json, serialize_dashboard_rows
+
+
+@require_GET
+@async_authenticated
+async def dashboard_async(request) -> HttpResponse:
+    """
+    Retorna eventos de monitoramento filtrados por intervalo de datas.
+
+    Versão assíncrona de DashboardView.get, com os mesmos parâmetros,
+    o mesmo formato de resposta e o mesmo cache (ETag / If-None-Match).
+
+    Query params esperados:
+        - start_date (YYYY-MM-DD)
+        - end_date (YYYY-MM-DD)
+        - cursor (opcional, retornado em `next`)
+        - page_size (opcional)
+
+    Returns
+    -------
+    HttpResponse
+        - 200 OK: Página de eventos de monitoramento ({"next", "results"})
+        - 304 Not Modified: Nenhum evento novo desde o ETag informado
+        - 400 Bad Request: Parâmetros ausentes ou inválidos
+        - 401 Unauthorized: Usuário não autenticado
+        - 404 Not Found: Cursor inválido
+    """
+    start_date = request.GET.get("start_date")
+    end_date = request.GET.get("end_date")
+
+    if not start_date or not end_date:
+        return JsonResponse(
+            {"detail": "Parâmetros start_date e end_date são obrigatórios"},
+            status=400
+        )
+
+    try:
+        start_date, end_date = parse_date_range(start_date, end_date)
+
+    except ValueError:
+        return JsonResponse(
+            {"detail": "Formato de data inválido. Use YYYY-MM-DD"},
+            status=400
+        )
+
+    etag = response_etag(request, await aevents_version())
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if not_modified(request, etag):
+        return HttpResponseNotModified(headers=headers)
+
+    body = await cache.aget(response_key(etag))
+
+    if body is None:
+        paginator = KeysetPagination()
+
+        try:
+            events = await paginator.apaginate_queryset(
+                dashboard_rows(events_in_range(start_date, end_date)),
+                request
+            )
+
+        except NotFound as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=404)
+
+        body = encode_json(
+            paginator.get_paginated_data(serialize_dashboard_rows(events, request))
+        )
+        await cache.aset(response_key(etag), body, settings.DASHBOARD_CACHE_TTL)
+
+        await areport_log(
+            user=request.user,
+            action="Consultar Dashboard",
+            status="INFO",
+            message=f"{len(events)} eventos retornados no dashboard"
+        )
+
+    return HttpResponse(body, content_type="application/json", headers=headers)
+
+
+@require_GET
+@async_authenticated(authenticate=aauthenticate_live)
+async def dashboard_live(request) -> HttpResponse:
+    """
+    Transmite os novos eventos de monitoramento via Server-Sent Events.
+
+    A conexão permanece aberta e recebe, no formato de
+    DashboardEventSerializer, cada evento gravado após a conexão (ver
+    dashboard.live). Requer ASGI; a autenticação utiliza o cabeçalho
+    Authorization ou, para clientes EventSource, o token de curta
+    duração obtido em `/api/dashboard/live/token/`.
+
+    Query params esperados:
+        - token (opcional, LiveToken na ausência do cabeçalho)
+        - detected_class (opcional, filtra pela classe)
+        - mac_address (opcional, filtra pelo dispositivo)
+
+    Returns
+    -------
+    HttpResponse
+        - 200 OK: Fluxo text/event-stream (eventos `detection` e, ao
+          final, `overflow`)
+        - 400 Bad Request: Endereço MAC inválido
+        - 401 Unauthorized: Usuário não autenticado
+    """
+    detected_class = request.GET.get("detected_class") or None
+    mac_address = request.GET.get("mac_address")
+    mac = None
+
+    if mac_address:
+        try:
+            mac = parse_mac(mac_address)
+
+        except ValueError:
+            return JsonResponse(
+                {"detail": "MAC address inválido. Formato esperado XX:XX:XX:XX:XX:XX"},
+                status=400
+            )
+
+    await areport_log(
+        user=request.user,
+        action="Acompanhar Dashboard ao Vivo",
+        status="INFO",
+        message=(
+            "Conexão ao vivo aberta"
+            + (f" (classe {detected_class})" if detected_class else "")
+            + (f" (dispositivo {format_mac(mac)})" if mac is not None else "")
+        )
+    )
+
+    response = StreamingHttpResponse(
+        event_stream(request, detected_class, mac),
+        content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Desabilita o buffer de proxies (ex.: nginx) para entrega imediata
+    response["X-Accel-Buffering"] = "no"
+
+    return response
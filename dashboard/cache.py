@@ -0,0 +1,176 @@
+"""
+Cache de respostas do dashboard invalidado pela ingestão de eventos.
+
+Operadores costumam manter o dashboard aberto, consultando o mesmo
+intervalo de datas periodicamente. As respostas são mantidas no cache
+padrão do Django (CACHES), com chave derivada da URL da requisição e de
+uma versão dos eventos, incrementada após o commit de cada ingestão
+(receiver do sinal `events_persisted`, ver dashboard.signals). Assim,
+novos eventos invalidam todas as respostas sem que seja necessário
+enumerá-las.
+
+A versão é mantida no banco de dados (EventsVersion, registro único),
+e não no cache: com um cache local por processo (LocMemCache, padrão),
+cada processo teria a própria versão e não veria as ingestões dos
+demais processos nem dos workers do spool. As respostas em cache
+continuam locais a cada processo, mas são sempre identificadas pela
+versão compartilhada.
+
+Os incrementos são agrupados por processo (`VersionBumper`): no máximo
+um UPDATE do registro a cada DASHBOARD_VERSION_BUMP_INTERVAL segundos,
+evitando que cada ingestão dispute o bloqueio da mesma linha. Ingestões
+dentro do intervalo são cobertas por um incremento agendado ao final
+dele, de modo que novos eventos aparecem no dashboard com atraso máximo
+de um intervalo.
+
+A mesma chave é enviada no cabeçalho ETag: uma requisição com
+If-None-Match correspondente recebe 304 Not Modified sem consultar a
+tabela de eventos nem o cache de respostas.
+
+A versão não é incrementada quando eventos são removidos (arquivamento
+ou remoção de partições); essas respostas expiram após
+DASHBOARD_CACHE_TTL segundos.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils.http import parse_etags
+
+from .models import EventsVersion
+
+
+VERSION_PK = 1
+RESPONSE_KEY_FORMAT = "dashboard:response:%s"
+
+
+def _initial_version() -> dict:
+    """
+    Valores do registro de versão criado no primeiro acesso.
+
+    A versão é iniciada a partir do relógio, de modo que ETags emitidos
+    antes da recriação do banco de dados não voltem a ser válidos.
+    """
+    return {"version": time.time_ns()}
+
+
+def events_version() -> int:
+    """
+    Versão atual dos eventos.
+    """
+    version = EventsVersion.objects.filter(pk=VERSION_PK).values_list("version", flat=True).first()
+
+    if version is None:
+        version = EventsVersion.objects.get_or_create(pk=VERSION_PK, defaults=_initial_version())[0].version
+
+    return version
+
+
+async def aevents_version() -> int:
+    """
+    Versão assíncrona de `events_version`.
+    """
+    version = await EventsVersion.objects.filter(pk=VERSION_PK).values_list("version", flat=True).afirst()
+
+    if version is None:
+        version = (await EventsVersion.objects.aget_or_create(pk=VERSION_PK, defaults=_initial_version()))[0].version
+
+    return version
+
+
+class VersionBumper:
+    """
+    Incremento da versão dos eventos agrupado por intervalo, seguro
+    para threads.
+
+    O primeiro incremento após o intervalo é gravado imediatamente; os
+    seguintes, dentro do intervalo, agendam um único incremento para o
+    final dele, executado em uma thread de temporizador.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_bump = float("-inf")
+        self._scheduled = False
+
+    def bump(self) -> None:
+        with self._lock:
+            if self._scheduled:
+                return
+
+            now = time.monotonic()
+            delay = self._last_bump + settings.DASHBOARD_VERSION_BUMP_INTERVAL - now
+
+            if delay > 0:
+                self._scheduled = True
+                threading.Timer(delay, self._run_scheduled).start()
+                return
+
+            self._last_bump = now
+
+        self._update()
+
+    def flush(self) -> None:
+        """
+        Grava o incremento agendado.
+        """
+        with self._lock:
+            self._scheduled = False
+            self._last_bump = time.monotonic()
+
+        self._update()
+
+    def _run_scheduled(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # Conexão aberta pela thread do temporizador
+            connection.close()
+
+    def _update(self) -> None:
+        if not EventsVersion.objects.filter(pk=VERSION_PK).update(version=F("version") + 1):
+            EventsVersion.objects.get_or_create(pk=VERSION_PK, defaults=_initial_version())
+
+
+version_bumper = VersionBumper()
+
+
+def bump_events_version() -> None:
+    """
+    Invalida as respostas em cache e os ETags emitidos.
+
+    Executada após o commit da ingestão: a atualização ocorre fora da
+    transação dos eventos e mantém o registro bloqueado apenas durante
+    o próprio UPDATE, agrupado por `version_bumper`.
+    """
+    version_bumper.bump()
+
+
+def response_etag(request, version: int) -> str:
+    """
+    ETag da resposta a uma requisição na versão informada dos eventos.
+
+    Derivado da URL completa (caminho, host e querystring), que
+    determina o conteúdo da resposta, inclusive a URL da próxima página.
+    """
+    digest = hashlib.sha256(f"{version}:{request.build_absolute_uri()}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def response_key(etag: str) -> str:
+    """
+    Chave de cache da resposta identificada pelo ETag.
+    """
+    return RESPONSE_KEY_FORMAT % etag.strip('"')
+
+
+def not_modified(request, etag: str) -> bool:
+    """
+    Indica se o cliente já possui a resposta identificada pelo ETag
+    (cabeçalho If-None-Match).
+    """
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in etags or etag in etags
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from django.utils import timezone
+
+
+def parse_date_range(start_date: str, end_date: str) -> tuple[datetime, datetime]:
+    """
+    Converte o intervalo de datas informado na querystring do dashboard.
+
+    Parameters
+    ----------
+    start_date : str
+        Data inicial no formato YYYY-MM-DD.
+    end_date : str
+        Data final no formato YYYY-MM-DD.
+
+    Returns
+    -------
+    tuple[datetime, datetime]
+        Início do dia inicial e último segundo do dia final, no fuso
+        horário corrente (TIME_ZONE). Datas com fuso permitem ao
+        PostgreSQL restringir a consulta às partições do intervalo.
+
+    Raises
+    ------
+    ValueError
+        Caso alguma das datas não esteja no formato YYYY-MM-DD.
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    end = end.replace(hour=23, minute=59, second=59)
+
+    return timezone.make_aware(start), timezone.make_aware(end)
@@ -0,0 +1,107 @@
+"""
+Exportação de eventos em fluxo (streaming), em NDJSON ou CSV.
+
+Os eventos são lidos do banco de dados em blocos
+(`QuerySet.iterator(chunk_size=...)`, com cursor no servidor no
+PostgreSQL) e convertidos em linhas à medida que a resposta é enviada,
+de modo que o consumo de memória independe do tamanho do intervalo
+exportado.
+
+Sob ASGI, o Django consome iteradores síncronos por completo antes de
+enviar a resposta (montando a exportação inteira em memória). Por isso
+cada formato possui também um gerador assíncrono, alimentado por
+`QuerySet.aiterator(chunk_size=...)`, utilizado quando a requisição é
+servida via ASGI.
+"""
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from django.utils import timezone
+
+from monitoring.models import MonitoringEvent
+
+
+# Campos de cada linha exportada, com os nomes utilizados pelo dashboard
+EXPORT_FIELDS = ["id", "mac", "class_name", "datetime", "image"]
+
+
+class Echo:
+    """
+    Buffer que apenas devolve o valor gravado, permitindo que
+    `csv.writer` produza uma linha por vez.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_row(event: MonitoringEvent, request) -> dict:
+    """
+    Converte um evento para uma linha da exportação.
+
+    Parameters
+    ----------
+    event : MonitoringEvent
+        Evento com o dispositivo carregado (`select_related("device")`).
+    request : HttpRequest
+        Requisição, utilizada para montar a URL absoluta da evidência.
+
+    Returns
+    -------
+    dict
+        Valores de EXPORT_FIELDS, com a data no fuso corrente (ISO 8601).
+    """
+    return {
+        "id": event.pk,
+        "mac": event.mac_address,
+        "class_name": event.detected_class,
+        "datetime": timezone.localtime(event.detected_at).isoformat(),
+        "image": request.build_absolute_uri(event.evidence.url) if event.evidence else None,
+    }
+
+
+def ndjson_lines(events: Iterable[MonitoringEvent], request) -> Iterator[str]:
+    """
+    Gera uma linha JSON por evento.
+    """
+    for event in events:
+        yield json.dumps(export_row(event, request), ensure_ascii=False) + "\n"
+
+
+def csv_lines(events: Iterable[MonitoringEvent], request) -> Iterator[str]:
+    """
+    Gera o cabeçalho e uma linha CSV por evento.
+    """
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+
+    for event in events:
+        yield writer.writerow(export_row(event, request))
+
+
+async def andjson_lines(events: AsyncIterable[MonitoringEvent], request) -> AsyncIterator[str]:
+    """
+    Versão assíncrona de `ndjson_lines`, para respostas servidas via ASGI.
+    """
+    async for event in events:
+        yield json.dumps(export_row(event, request), ensure_ascii=False) + "\n"
+
+
+async def acsv_lines(events: AsyncIterable[MonitoringEvent], request) -> AsyncIterator[str]:
+    """
+    Versão assíncrona de `csv_lines`, para respostas servidas via ASGI.
+    """
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+
+    async for event in events:
+        yield writer.writerow(export_row(event, request))
+
+
+# Formatos disponíveis: (content type, gerador de linhas, gerador
+# assíncrono de linhas)
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", ndjson_lines, andjson_lines),
+    "csv": ("text/csv; charset=utf-8", csv_lines, acsv_lines),
+}
@@ -0,0 +1,248 @@
+"""
+Transmissão ao vivo de novos eventos para o dashboard (Server-Sent
+Events).
+
+Em vez de consultar DashboardView periodicamente, o dashboard pode
+manter uma conexão aberta com `/api/dashboard/live/` e receber apenas
+os eventos gravados após a conexão. A distribuição é feita por um
+broker em memória (pub/sub no processo): após o commit de cada
+ingestão, o receiver do sinal `events_persisted` publica os eventos
+gravados, que são entregues à fila de cada assinatura cujos filtros
+(classe e/ou dispositivo) correspondam.
+
+O broker é local ao processo: cada conexão recebe os eventos ingeridos
+pelo mesmo processo ASGI. Com vários processos, ou com ingestão pelo
+spool (`process_monitoring_queue`), o dashboard deve complementar a
+transmissão consultando os endpoints REST periodicamente.
+
+Uma assinatura que não consome os eventos no ritmo da ingestão
+(fila com DASHBOARD_LIVE_MAX_PENDING eventos pendentes) é encerrada com
+o evento `overflow`, indicando ao cliente que recarregue os dados pelos
+endpoints REST antes de reconectar.
+
+O EventSource dos navegadores não permite definir o cabeçalho
+Authorization. Além do access token no cabeçalho, a conexão aceita um
+token de curta duração (`LiveToken`, DASHBOARD_LIVE_TOKEN_LIFETIME
+segundos) no parâmetro `token` da querystring, obtido em
+`/api/dashboard/live/token/`. O token é exclusivo desta conexão (não é
+aceito pelos demais endpoints) e só é verificado ao conectar: após a
+expiração, cada reconexão exige um novo token.
+"""
+import asyncio
+import threading
+from collections import namedtuple
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import Token
+
+from core.authentication import aauthenticate, atoken_user
+from monitoring.models import MonitoringEvent
+from .serializers import DASHBOARD_ROW_FIELDS, encode_json, serialize_dashboard_rows
+
+
+# Linha publicada, com os campos de `dashboard_rows`
+LiveRow = namedtuple("LiveRow", DASHBOARD_ROW_FIELDS)
+
+
+class Subscription:
+    """
+    Assinatura de uma conexão ao vivo.
+
+    A fila pertence ao event loop da conexão e é alimentada apenas por
+    ele (via `call_soon_threadsafe`), a partir da thread que publicou
+    os eventos.
+
+    Parameters
+    ----------
+    loop : asyncio.AbstractEventLoop
+        Event loop da conexão.
+    detected_class : str | None
+        Classe dos eventos entregues (None = todas).
+    mac : int | None
+        MAC do dispositivo dos eventos entregues (None = todos).
+    """
+
+    def __init__(self, loop, detected_class: str | None = None, mac: int | None = None):
+        self.loop = loop
+        self.detected_class = detected_class
+        self.mac = mac
+        self.queue = asyncio.Queue(settings.DASHBOARD_LIVE_MAX_PENDING)
+        self.overflowed = False
+
+    def matches(self, row: LiveRow) -> bool:
+        """
+        Indica se o evento atende aos filtros da assinatura.
+        """
+        return (
+            (self.detected_class is None or row.detected_class == self.detected_class)
+            and (self.mac is None or row.device__mac == self.mac)
+        )
+
+    def offer(self, rows: list[LiveRow]) -> None:
+        """
+        Enfileira os eventos; executado no event loop da conexão.
+        """
+        for row in rows:
+            if self.overflowed:
+                return
+
+            try:
+                self.queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self.overflowed = True
+
+
+class LiveBroker:
+    """
+    Broker pub/sub em memória das conexões ao vivo do processo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def subscribe(self, detected_class: str | None = None, mac: int | None = None) -> Subscription:
+        """
+        Registra uma assinatura no event loop corrente.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), detected_class, mac)
+
+        with self._lock:
+            self._subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove uma assinatura (ex.: após a desconexão do cliente).
+        """
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, events: list[MonitoringEvent]) -> None:
+        """
+        Entrega os eventos gravados às assinaturas correspondentes.
+
+        Pode ser chamado de qualquer thread; deve ser executado após o
+        commit dos eventos.
+
+        Parameters
+        ----------
+        events : list[MonitoringEvent]
+            Eventos persistidos, com o dispositivo atribuído.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+
+        if not subscriptions:
+            return
+
+        rows = [
+            LiveRow(event.pk, event.detected_at, event.detected_class, event.evidence.name, event.device.mac)
+            for event in events
+        ]
+
+        for subscription in subscriptions:
+            matching = [row for row in rows if subscription.matches(row)]
+
+            if not matching:
+                continue
+
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, matching)
+            except RuntimeError:
+                # Event loop encerrado sem remover a assinatura
+                self.unsubscribe(subscription)
+
+
+live_broker = LiveBroker()
+
+
+class LiveToken(Token):
+    """
+    Token JWT de curta duração para a conexão ao vivo, informado na
+    querystring (`?token=...`).
+
+    Possui tipo próprio: não é aceito como access token pelos demais
+    endpoints, e access tokens não são aceitos na querystring.
+    """
+
+    token_type = "live"
+    lifetime = timedelta(seconds=settings.DASHBOARD_LIVE_TOKEN_LIFETIME)
+
+
+async def aauthenticate_live(request):
+    """
+    Autentica a conexão ao vivo pelo cabeçalho Authorization ou, na
+    ausência dele, pelo LiveToken do parâmetro `token`.
+
+    Returns
+    -------
+    User | None
+        Usuário autenticado, ou None caso nenhuma credencial válida
+        tenha sido informada.
+    """
+    user = await aauthenticate(request)
+    raw_token = request.GET.get("token")
+
+    if user is not None or not raw_token:
+        return user
+
+    try:
+        token = LiveToken(raw_token)
+    except TokenError:
+        return None
+
+    return await atoken_user(token)
+
+
+async def event_stream(request, detected_class: str | None = None, mac: int | None = None) -> AsyncIterator[str]:
+    """
+    Mensagens Server-Sent Events dos novos eventos.
+
+    Cada evento é enviado como `event: detection`, com o id do evento e
+    os dados no formato de DashboardEventSerializer. Na ausência de
+    eventos, um comentário é enviado a cada DASHBOARD_LIVE_KEEPALIVE
+    segundos, mantendo a conexão aberta em proxies.
+
+    A assinatura é registrada no início da transmissão e removida do
+    broker quando o cliente desconecta; respostas descartadas antes do
+    envio não deixam assinaturas no broker.
+
+    Parameters
+    ----------
+    detected_class : str | None
+        Classe dos eventos entregues (None = todas).
+    mac : int | None
+        MAC do dispositivo dos eventos entregues (None = todos).
+    """
+    subscription = live_broker.subscribe(detected_class, mac)
+
+    try:
+        # Após o estouro da fila, os eventos já enfileirados são
+        # entregues antes do evento overflow
+        while not (subscription.overflowed and subscription.queue.empty()):
+            try:
+                row = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    timeout=settings.DASHBOARD_LIVE_KEEPALIVE
+                )
+
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            rows = [row]
+            while not subscription.queue.empty():
+                rows.append(subscription.queue.get_nowait())
+
+            for row, data in zip(rows, serialize_dashboard_rows(rows, request)):
+                yield f"id: {row.pk}\nevent: detection\ndata: {encode_json(data).decode()}\n\n"
+
+        yield "event: overflow\ndata: {}\n\n"
+
+    finally:
+        live_broker.unsubscribe(subscription)
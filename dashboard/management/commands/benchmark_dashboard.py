@@ -0,0 +1,152 @@
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from dashboard.queries import events_in_range
+from dashboard.serializers import (
+    DashboardEventSerializer,
+    dashboard_rows,
+    encode_json,
+    serialize_dashboard_rows,
+)
+from monitoring.models import Device, MonitoringEvent
+
+
+SAMPLE_DEVICES = 50
+SAMPLE_CLASSES = ["person", "vehicle", "animal", "bicycle", "fire"]
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável pela comparação entre o serializer do dashboard
+    (DashboardEventSerializer + JSONRenderer) e o caminho rápido
+    (`dashboard_rows` + `serialize_dashboard_rows` + `encode_json`).
+
+    Para cada tamanho informado, mede o tempo de leitura, serialização e
+    codificação JSON dos eventos por cada caminho (melhor de --repeat
+    execuções) e verifica se ambos produzem o mesmo payload. Os eventos
+    sintéticos são gravados em uma transação desfeita ao final.
+
+    Uso:
+        python manage.py benchmark_dashboard --sizes 10000,100000 --repeat 3
+    """
+
+    help = "Compara o serializer do dashboard com o caminho rápido de serialização"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000",
+            help="Quantidades de eventos serializados, separadas por vírgula"
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Execuções por tamanho (é considerada a mais rápida)"
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="Host das URLs de evidência (deve constar em ALLOWED_HOSTS)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options["sizes"].split(",")})
+        except ValueError:
+            raise CommandError("--sizes deve conter números inteiros separados por vírgula")
+
+        if not sizes or sizes[0] <= 0:
+            raise CommandError("--sizes deve conter números positivos")
+
+        request = RequestFactory().get("/api/dashboard/", HTTP_HOST=options["host"])
+        end = datetime.now(tz=timezone.utc)
+
+        with transaction.atomic():
+            start = self._load_sample(sizes[-1], end)
+            queryset = events_in_range(start, end).order_by("-detected_at", "-pk")
+
+            for size in sizes:
+                serializer_time, serializer_body = self._measure(
+                    options["repeat"],
+                    lambda: JSONRenderer().render(
+                        DashboardEventSerializer(
+                            list(queryset.select_related("device")[:size]),
+                            many=True,
+                            context={"request": request}
+                        ).data
+                    )
+                )
+                fast_time, fast_body = self._measure(
+                    options["repeat"],
+                    lambda: encode_json(
+                        serialize_dashboard_rows(list(dashboard_rows(queryset)[:size]), request)
+                    )
+                )
+
+                if json.loads(serializer_body) != json.loads(fast_body):
+                    raise CommandError(f"Payloads divergentes para {size} eventos")
+
+                self.stdout.write(
+                    f"{size} eventos: serializer {serializer_time * 1000:.0f} ms, "
+                    f"caminho rápido {fast_time * 1000:.0f} ms "
+                    f"({serializer_time / fast_time:.1f}x)"
+                )
+
+            # Descarta a amostra
+            transaction.set_rollback(True)
+
+    def _measure(self, repeat: int, function) -> tuple[float, bytes]:
+        """
+        Menor tempo de execução da função e o resultado produzido.
+        """
+        best, result = None, None
+
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        return best, result
+
+    def _load_sample(self, size: int, end: datetime) -> datetime:
+        """
+        Grava a amostra sintética de dispositivos e eventos.
+
+        Returns
+        -------
+        datetime
+            Início do intervalo que contém a amostra.
+        """
+        random_state = random.Random(0)
+
+        # MACs localmente administrados (bit 0x02), fora da faixa de
+        # dispositivos reais
+        Device.objects.bulk_create(
+            Device(mac=0x02_00_00_00_00_00 | index, name="benchmark_dashboard")
+            for index in range(SAMPLE_DEVICES)
+        )
+        devices = list(Device.objects.filter(name="benchmark_dashboard"))
+
+        MonitoringEvent.objects.bulk_create(
+            (
+                MonitoringEvent(
+                    device=random_state.choice(devices),
+                    detected_class=random_state.choice(SAMPLE_CLASSES),
+                    detected_at=end - timedelta(seconds=index),
+                    evidence=f"monitoring/evidence/{index % 256:02x}/{index:064x}.jpg",
+                )
+                for index in range(size)
+            ),
+            batch_size=1000
+        )
+
+        return end - timedelta(seconds=size)
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.utils import report_log
+from dashboard.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável pelo recálculo das contagens agregadas (rollups)
+    do dashboard a partir dos eventos (ver dashboard.rollups).
+
+    Sem opções, recalcula o dia corrente e o anterior: executado
+    periodicamente (ex.: cron a cada poucos minutos), mantém os gráficos
+    atualizados quando DASHBOARD_ROLLUPS_AT_INGEST está desabilitado.
+
+    Intervalos anteriores ao período de retenção (eventos possivelmente
+    arquivados ou removidos) são recusados. As contagens consideram os
+    eventos persistidos: detecções agrupadas em incidentes contam uma
+    vez (ver dashboard.rollups).
+
+    Uso:
+        python manage.py rebuild_rollups
+        python manage.py rebuild_rollups --start 2026-01-01 --end 2026-01-31
+    """
+
+    help = "Recalcula as contagens agregadas de eventos do dashboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            help="Primeiro dia recalculado (YYYY-MM-DD, padrão: ontem)"
+        )
+        parser.add_argument(
+            "--end",
+            help="Último dia recalculado (YYYY-MM-DD, padrão: hoje)"
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        try:
+            start = (
+                datetime.strptime(options["start"], "%Y-%m-%d").date()
+                if options["start"] else today - timedelta(days=1)
+            )
+            end = (
+                datetime.strptime(options["end"], "%Y-%m-%d").date()
+                if options["end"] else today
+            )
+        except ValueError:
+            raise CommandError("Formato de data inválido. Use YYYY-MM-DD")
+
+        if start > end:
+            raise CommandError("--start deve ser anterior ou igual a --end")
+
+        try:
+            written = rebuild_rollups(start, end)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        report_log(
+            user=None,
+            action="Recalcular Rollups",
+            status="SUCCESS",
+            message=(
+                f"Contagens de {start} a {end} recalculadas: "
+                f"{written['hour']} horárias, {written['day']} diárias"
+            )
+        )
+
+        self.stdout.write(
+            f"{written['hour']} contagens horárias e {written['day']} diárias "
+            f"recalculadas de {start} a {end}"
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.10 on 2026-10-17 01:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('monitoring', '0006_event_detected_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyEventRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Início do intervalo agregado', verbose_name='Intervalo')),
+                ('detected_class', models.CharField(help_text='Nome do objeto de risco identificado pelo modelo', max_length=100, verbose_name='Classe Detectada')),
+                ('count', models.PositiveIntegerField(default=0, help_text='Quantidade de eventos no intervalo', verbose_name='Quantidade de Eventos')),
+                ('device', models.ForeignKey(db_index=False, help_text='Dispositivo edge que gerou os eventos', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='monitoring.device', verbose_name='Dispositivo')),
+            ],
+            options={
+                'verbose_name': 'Contagem Diária de Eventos',
+                'verbose_name_plural': 'Contagens Diárias de Eventos',
+                'ordering': ['bucket'],
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'device', 'detected_class'), name='daily_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyEventRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Início do intervalo agregado', verbose_name='Intervalo')),
+                ('detected_class', models.CharField(help_text='Nome do objeto de risco identificado pelo modelo', max_length=100, verbose_name='Classe Detectada')),
+                ('count', models.PositiveIntegerField(default=0, help_text='Quantidade de eventos no intervalo', verbose_name='Quantidade de Eventos')),
+                ('device', models.ForeignKey(db_index=False, help_text='Dispositivo edge que gerou os eventos', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='monitoring.device', verbose_name='Dispositivo')),
+            ],
+            options={
+                'verbose_name': 'Contagem Horária de Eventos',
+                'verbose_name_plural': 'Contagens Horárias de Eventos',
+                'ordering': ['bucket'],
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'device', 'detected_class'), name='hourly_rollup_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventsVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(help_text='Incrementada a cada ingestão de eventos', verbose_name='Versão')),
+            ],
+            options={
+                'verbose_name': 'Versão dos Eventos',
+                'verbose_name_plural': 'Versões dos Eventos',
+            },
+        ),
+    ]
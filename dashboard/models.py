@@ -0,0 +1,131 @@
+from django.db import models
+
+from monitoring.models import Device
+
+
+class EventRollup(models.Model):
+    """
+    Base dos models de contagens agregadas de eventos (rollups).
+
+    Cada instância representa a quantidade de eventos de um dispositivo
+    e classe em um intervalo de tempo (bucket). As contagens são
+    atualizadas na ingestão e recalculadas pelo comando
+    `rebuild_rollups` (ver dashboard.rollups), permitindo que os
+    gráficos do dashboard leiam poucas linhas em vez dos eventos.
+    """
+    bucket = models.DateTimeField(
+        verbose_name="Intervalo",
+        help_text="Início do intervalo agregado"
+    )
+
+    device = models.ForeignKey(
+        Device,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name="+",
+        verbose_name="Dispositivo",
+        help_text="Dispositivo edge que gerou os eventos"
+    )
+
+    detected_class = models.CharField(
+        max_length=100,
+        verbose_name="Classe Detectada",
+        help_text="Nome do objeto de risco identificado pelo modelo"
+    )
+
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Quantidade de Eventos",
+        help_text="Quantidade de eventos no intervalo"
+    )
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação legível da contagem agregada.
+
+        Returns
+        -------
+        str
+            Representação textual da contagem.
+        """
+        return f"{self.bucket} | {self.device.mac_address} | {self.detected_class} | {self.count}"
+
+    class Meta:
+        abstract = True
+
+
+class HourlyEventRollup(EventRollup):
+    """
+    Contagem de eventos por hora, dispositivo e classe.
+    """
+
+    class Meta:
+        """
+        Metadados do model HourlyEventRollup.
+
+        A constraint de unicidade também atende às consultas por
+        intervalo de datas do endpoint de rollups.
+        """
+        verbose_name = "Contagem Horária de Eventos"
+        verbose_name_plural = "Contagens Horárias de Eventos"
+        ordering = ["bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "device", "detected_class"],
+                name="hourly_rollup_key"
+            ),
+        ]
+
+
+class DailyEventRollup(EventRollup):
+    """
+    Contagem de eventos por dia (TIME_ZONE), dispositivo e classe.
+    """
+
+    class Meta:
+        """
+        Metadados do model DailyEventRollup.
+        """
+        verbose_name = "Contagem Diária de Eventos"
+        verbose_name_plural = "Contagens Diárias de Eventos"
+        ordering = ["bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "device", "detected_class"],
+                name="daily_rollup_key"
+            ),
+        ]
+
+
+class EventsVersion(models.Model):
+    """
+    Versão dos eventos exibidos no dashboard (registro único).
+
+    Incrementada após o commit de cada ingestão e utilizada nas chaves
+    do cache de respostas e nos ETags do dashboard (ver
+    dashboard.cache). Mantida no banco de dados, é compartilhada por
+    todos os processos, inclusive os workers do spool, independentemente
+    do backend de cache configurado.
+    """
+    version = models.BigIntegerField(
+        verbose_name="Versão",
+        help_text="Incrementada a cada ingestão de eventos"
+    )
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação legível da versão.
+
+        Returns
+        -------
+        str
+            Representação textual da versão.
+        """
+        return str(self.version)
+
+    class Meta:
+        """
+        Metadados do model EventsVersion.
+        """
+        verbose_name = "Versão dos Eventos"
+        verbose_name_plural = "Versões dos Eventos"
@@ -0,0 +1,99 @@
+"""
+Consultas de eventos compartilhadas pelas views do dashboard.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from monitoring.models import MonitoringEvent
+
+
+def events_in_range(start: datetime, end: datetime) -> QuerySet:
+    """
+    Eventos de monitoramento detectados no intervalo informado.
+
+    Filtro base do dashboard (listagem, versão assíncrona e agregações),
+    atendido pelo índice de `detected_at` e, com a tabela particionada,
+    restrito às partições do intervalo.
+
+    Parameters
+    ----------
+    start : datetime
+        Início do intervalo (inclusivo), conforme `parse_date_range`.
+    end : datetime
+        Fim do intervalo (inclusivo), conforme `parse_date_range`.
+
+    Returns
+    -------
+    QuerySet
+        Eventos do intervalo, sem ordenação definida.
+    """
+    return MonitoringEvent.objects.filter(detected_at__range=(start, end))
+
+
+def events_registered_until(moment: datetime) -> QuerySet:
+    """
+    Eventos de monitoramento registrados no backend até o instante
+    informado.
+
+    Filtro base do feed de alterações, atendido pelo índice de
+    (`created_at`, `id`).
+
+    Parameters
+    ----------
+    moment : datetime
+        Limite superior (inclusivo) de `created_at`.
+
+    Returns
+    -------
+    QuerySet
+        Eventos registrados até o instante, sem ordenação definida.
+    """
+    return MonitoringEvent.objects.filter(created_at__lte=moment)
+
+
+def changes_horizon() -> datetime:
+    """
+    Limite superior de `created_at` dos eventos entregues pelo feed de
+    alterações.
+
+    O `created_at` é definido antes do commit da ingestão: uma
+    transação ainda aberta pode confirmar eventos anteriores aos já
+    visíveis, que ficariam atrás do cursor. No PostgreSQL, o limite não
+    ultrapassa o início da transação de escrita mais antiga ainda em
+    andamento (`pg_stat_activity`), de modo que uma ingestão demorada
+    apenas atrasa o feed. Nos demais bancos, apenas o atraso
+    DASHBOARD_CHANGES_LAG se aplica.
+
+    Em ambos os casos, o atraso é descontado do limite, cobrindo a
+    diferença entre o relógio dos servidores da aplicação (que definem
+    o `created_at`) e o do banco de dados.
+
+    Returns
+    -------
+    datetime
+        Instante até o qual os eventos registrados já foram confirmados.
+    """
+    horizon = timezone.now()
+
+    if connection.vendor == "postgresql":
+        # As demais sessões só são visíveis com o mesmo usuário do banco
+        # de dados (ou pg_read_all_stats). A leitura de pg_stat_activity
+        # é mantida até o fim da transação corrente; o snapshot anterior
+        # é descartado
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_stat_clear_snapshot()")
+            cursor.execute(
+                "SELECT MIN(xact_start) FROM pg_stat_activity "
+                "WHERE datname = current_database() "
+                "AND backend_xid IS NOT NULL AND pid <> pg_backend_pid()"
+            )
+            oldest = cursor.fetchone()[0]
+
+        if oldest is not None:
+            horizon = min(horizon, oldest)
+
+    return horizon - timedelta(seconds=settings.DASHBOARD_CHANGES_LAG)
@@ -0,0 +1,201 @@
+"""
+Contagens agregadas de eventos (rollups) para os gráficos do dashboard.
+
+As tabelas HourlyEventRollup e DailyEventRollup mantêm a quantidade de
+eventos por intervalo, dispositivo e classe. Os intervalos seguem o
+fuso horário configurado (TIME_ZONE), o mesmo das datas informadas ao
+dashboard.
+
+As contagens são mantidas de duas formas:
+- Na ingestão: o receiver do sinal `events_persisted` incrementa as
+  contagens na mesma transação que grava os eventos
+  (DASHBOARD_ROLLUPS_AT_INGEST)
+- Pelo comando `rebuild_rollups`: recalcula as contagens de um
+  intervalo de dias a partir dos eventos, como rotina periódica quando
+  a atualização na ingestão estiver desabilitada ou para corrigir
+  divergências
+
+As contagens referem-se aos eventos persistidos, assim como a listagem
+do dashboard: detecções agrupadas em um incidente existente
+(MONITORING_COALESCE_WINDOW) não geram eventos e não são contabilizadas;
+cada incidente conta uma vez, pelo seu evento representativo. O total
+de detecções de um incidente está em `Incident.event_count`.
+
+As contagens não são decrementadas quando eventos são removidos
+(arquivamento ou remoção de partições), preservando o histórico dos
+gráficos. Por isso, `rebuild_rollups` recusa intervalos anteriores ao
+período de retenção (ver `retention_cutoff`), que zerariam as contagens
+de eventos já removidos.
+"""
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from monitoring.archive import load_manifests
+from monitoring.models import MonitoringEvent
+from .models import DailyEventRollup, HourlyEventRollup
+
+
+# Granularidades disponíveis e os models correspondentes
+ROLLUPS = {
+    "hour": HourlyEventRollup,
+    "day": DailyEventRollup,
+}
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """
+    Início do intervalo (hora ou dia, no fuso corrente) de um instante.
+    """
+    local = timezone.localtime(moment)
+
+    if granularity == "hour":
+        return local.replace(minute=0, second=0, microsecond=0)
+
+    return day_start(local.date())
+
+
+def day_start(day: date) -> datetime:
+    """
+    Início do dia informado no fuso corrente.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def increment_rollups(events: list[MonitoringEvent]) -> None:
+    """
+    Incrementa as contagens dos intervalos dos eventos informados.
+
+    Deve ser executada na transação que persiste os eventos. As linhas
+    são atualizadas em ordem determinística, evitando deadlocks entre
+    transações concorrentes que atualizam as mesmas contagens.
+
+    Parameters
+    ----------
+    events : list[MonitoringEvent]
+        Eventos persistidos.
+    """
+    for granularity, model in ROLLUPS.items():
+        counts = Counter(
+            (bucket_start(event.detected_at, granularity), event.device_id, event.detected_class)
+            for event in events
+        )
+
+        for (bucket, device_id, detected_class), count in sorted(counts.items()):
+            key = {"bucket": bucket, "device_id": device_id, "detected_class": detected_class}
+
+            if model.objects.filter(**key).update(count=F("count") + count):
+                continue
+
+            try:
+                with transaction.atomic():
+                    model.objects.create(count=count, **key)
+
+            except IntegrityError:
+                # Contagem criada por uma transação concorrente
+                model.objects.filter(**key).update(count=F("count") + count)
+
+
+def retention_cutoff() -> datetime:
+    """
+    Instante anterior ao qual os eventos podem ter sido removidos do
+    banco de dados.
+
+    Corresponde ao período de retenção (MONITORING_RETENTION_DAYS) ou,
+    se posterior, ao limite da execução mais recente do arquivamento
+    (`archive_events --days`).
+    """
+    cutoff = timezone.now() - timedelta(days=settings.MONITORING_RETENTION_DAYS)
+
+    for manifest in load_manifests():
+        cutoff = max(cutoff, datetime.fromisoformat(manifest["cutoff"]))
+
+    return cutoff
+
+
+def lock_rollups() -> None:
+    """
+    Bloqueia as tabelas de rollup até o fim da transação corrente.
+
+    No PostgreSQL, o modo SHARE ROW EXCLUSIVE aguarda as transações de
+    ingestão que já atualizaram as contagens e impede novas
+    atualizações até o commit, de modo que o recálculo considere todos
+    os eventos confirmados. Nos demais bancos, a primeira escrita do
+    recálculo obtém o bloqueio de escrita do banco de dados.
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    tables = ", ".join(
+        connection.ops.quote_name(model._meta.db_table) for model in ROLLUPS.values()
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {tables} IN SHARE ROW EXCLUSIVE MODE")
+
+
+def rebuild_rollups(start: date, end: date) -> dict[str, int]:
+    """
+    Recalcula as contagens dos dias informados a partir dos eventos.
+
+    O recálculo é feito em uma única transação, serializado com as
+    atualizações da ingestão (ver `lock_rollups`).
+
+    Parameters
+    ----------
+    start : date
+        Primeiro dia recalculado.
+    end : date
+        Último dia recalculado (inclusivo).
+
+    Returns
+    -------
+    dict[str, int]
+        Quantidade de contagens gravadas por granularidade.
+
+    Raises
+    ------
+    ValueError
+        Caso o intervalo comece antes de `retention_cutoff`.
+    """
+    lower, upper = day_start(start), day_start(end + timedelta(days=1))
+
+    cutoff = retention_cutoff()
+    if lower < cutoff:
+        raise ValueError(
+            f"Intervalo anterior ao período de retenção "
+            f"({timezone.localtime(cutoff):%Y-%m-%d %H:%M}): os eventos "
+            "removidos não seriam contabilizados"
+        )
+
+    events = MonitoringEvent.objects.filter(detected_at__gte=lower, detected_at__lt=upper)
+    written = {}
+
+    with transaction.atomic():
+        lock_rollups()
+
+        for granularity, model in ROLLUPS.items():
+            # A remoção precede a leitura dos eventos: a contagem é feita
+            # com o bloqueio obtido
+            model.objects.filter(bucket__gte=lower, bucket__lt=upper).delete()
+
+            rows = (
+                events
+                .annotate(bucket=Trunc("detected_at", granularity, tzinfo=timezone.get_current_timezone()))
+                .values("bucket", "device_id", "detected_class")
+                .annotate(count=Count("id"))
+                .order_by()
+            )
+            created = model.objects.bulk_create(
+                (model(**row) for row in rows),
+                batch_size=1000
+            )
+
+            written[granularity] = len(created)
+
+    return written
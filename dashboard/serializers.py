@@ -1,4 +1,11 @@
+import orjson
+from django.conf import settings
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
+from monitoring.mac import format_mac
 from monitoring.models import MonitoringEvent
 
 
@@ -12,6 +19,8 @@ class DashboardEventSerializer(serializers.ModelSerializer):
 
     Ajustes importantes:
     - Converte o campo de imagem em URL ABSOLUTA
+    - Expõe as URLs dos derivados (miniatura e pré-visualização),
+      evitando que o dashboard baixe o frame completo de cada evento
     - Evita que o frontend precise conhecer detalhes de infraestrutura
     - Mantém o backend como fonte única de verdade
     """
@@ -35,6 +44,10 @@ class DashboardEventSerializer(serializers.ModelSerializer):
         help_text="URL absoluta da imagem de evidência do evento"
     )
 
+    thumbnails = serializers.SerializerMethodField(
+        help_text="URLs absolutas dos derivados da evidência, por tamanho"
+    )
+
     class Meta:
         """
         Metadados do serializer DashboardEventSerializer.
@@ -48,6 +61,7 @@ class DashboardEventSerializer(serializers.ModelSerializer):
             "class_name",
             "datetime",
             "image",
+            "thumbnails",
         ]
 
     def get_image(self, obj) -> str | None:
@@ -78,4 +92,261 @@ class DashboardEventSerializer(serializers.ModelSerializer):
             # Fallback seguro (não esperado em produção)
             return obj.evidence.url
 
-        return request.build_absolute_uri(obj.evidence.url)
\ No newline at end of file
+        return request.build_absolute_uri(obj.evidence.url)
+
+    def get_thumbnails(self, obj) -> dict[str, str] | None:
+        """
+        Retorna as URLs absolutas dos derivados da evidência.
+
+        As URLs apontam para o endpoint de derivados, que gera sob
+        demanda os derivados ainda não produzidos (ver
+        `derivative_url_prefixes`).
+
+        Parameters
+        ----------
+        obj : MonitoringEvent
+            Instância do evento de monitoramento.
+
+        Returns
+        -------
+        dict[str, str] | None
+            URL de cada tamanho configurado em
+            MONITORING_EVIDENCE_DERIVATIVES, ou None caso não exista
+            imagem associada ao evento.
+        """
+        if not obj.evidence:
+            return None
+
+        prefixes = derivative_url_prefixes(self.context.get("request"))
+        name = filepath_to_uri(obj.evidence.name)
+
+        return {size: prefix + name for size, prefix in prefixes.items()}
+
+
+class DashboardChangesSerializer(serializers.Serializer):
+    """
+    Serializer de saída do feed de alterações do dashboard (ChangesView),
+    no formato de ChangesPagination.
+    """
+
+    cursor = serializers.CharField(
+        allow_null=True,
+        help_text="Cursor para a próxima consulta (`since`)"
+    )
+
+    next = serializers.URLField(
+        allow_null=True,
+        help_text="URL da próxima página, ou null na última página"
+    )
+
+    results = DashboardEventSerializer(many=True)
+
+
+class LiveTokenSerializer(serializers.Serializer):
+    """
+    Serializer de saída do token da conexão ao vivo (LiveTokenView).
+    """
+
+    token = serializers.CharField(
+        help_text="Token informado no parâmetro `token` de /api/dashboard/live/"
+    )
+
+    expires_in = serializers.IntegerField(
+        help_text="Validade do token, em segundos"
+    )
+
+
+def derivative_url_prefixes(request) -> dict[str, str]:
+    """
+    Prefixo das URLs dos derivados de cada tamanho configurado.
+
+    A URL de um derivado é o prefixo do tamanho seguido do nome da
+    evidência. O endpoint de derivados (`dashboard-derivative`)
+    redireciona para o arquivo no storage, gerando-o antes caso ainda
+    não exista; assim, as URLs são válidas mesmo antes da geração em
+    segundo plano (ou sem ela).
+
+    Parameters
+    ----------
+    request : HttpRequest | None
+        Requisição, utilizada para montar as URLs absolutas.
+
+    Returns
+    -------
+    dict[str, str]
+        Prefixo por nome de tamanho de MONITORING_EVIDENCE_DERIVATIVES.
+    """
+    prefixes = {}
+
+    for size in settings.MONITORING_EVIDENCE_DERIVATIVES:
+        url = reverse("dashboard-derivative", kwargs={"size": size, "name": "_"})[:-1]
+        prefixes[size] = request.build_absolute_uri(url) if request is not None else url
+
+    return prefixes
+
+
+# Campos lidos pelo caminho rápido de serialização do dashboard
+DASHBOARD_ROW_FIELDS = ("pk", "detected_at", "detected_class", "evidence", "device__mac")
+
+
+def dashboard_rows(queryset: QuerySet, *fields: str) -> QuerySet:
+    """
+    Restringe um queryset de eventos às colunas do dashboard.
+
+    Retorna tuplas nomeadas (`values_list(named=True)`), sem instanciar
+    models; os atributos `pk` e `detected_at` permitem a paginação
+    keyset (KeysetPagination). Campos adicionais (ex.: o campo de
+    ordenação de outra paginação) podem ser informados em `fields`.
+    """
+    return queryset.values_list(*DASHBOARD_ROW_FIELDS, *fields, named=True)
+
+
+def serialize_dashboard_rows(rows: list, request) -> list[dict]:
+    """
+    Caminho rápido equivalente a DashboardEventSerializer(many=True).
+
+    Produz a mesma saída do serializer, a partir das linhas de
+    `dashboard_rows`: a URL base das evidências, o fuso horário e os
+    prefixos das URLs dos derivados são resolvidos uma vez por requisição, em
+    vez de uma vez por campo de cada evento. As URLs são montadas como
+    em FileSystemStorage.url (storage de evidências).
+
+    Parameters
+    ----------
+    rows : list
+        Linhas retornadas por `dashboard_rows`.
+    request : HttpRequest
+        Requisição, utilizada para montar as URLs absolutas.
+
+    Returns
+    -------
+    list[dict]
+        Eventos no formato de DashboardEventSerializer.
+    """
+    base_url = request.build_absolute_uri(MonitoringEvent.evidence.field.storage.base_url)
+    current_timezone = timezone.get_current_timezone()
+    prefixes = derivative_url_prefixes(request).items()
+    macs = {}
+    data = []
+
+    for row in rows:
+        mac = macs.get(row.device__mac)
+        if mac is None:
+            mac = macs[row.device__mac] = format_mac(row.device__mac)
+
+        detected_at = row.detected_at.astimezone(current_timezone).isoformat()
+        if detected_at.endswith("+00:00"):
+            detected_at = detected_at[:-6] + "Z"
+
+        image = thumbnails = None
+        if row.evidence:
+            name = filepath_to_uri(row.evidence)
+            image = base_url + name
+            thumbnails = {size: prefix + name for size, prefix in prefixes}
+
+        data.append({
+            "mac": mac,
+            "class_name": row.detected_class,
+            "datetime": detected_at,
+            "image": image,
+            "thumbnails": thumbnails,
+        })
+
+    return data
+
+
+def encode_json(data) -> bytes:
+    """
+    Codifica o payload em JSON compacto (UTF-8), no mesmo formato do
+    JSONRenderer do DRF.
+
+    Utiliza o orjson, várias vezes mais rápido que o módulo json na
+    codificação das páginas do dashboard, compostas apenas por
+    strings, inteiros e None.
+    """
+    return orjson.dumps(data)
+
+
+class EventRollupSerializer(serializers.Serializer):
+    """
+    Serializer de saída das contagens agregadas de eventos (rollups).
+
+    Utiliza os mesmos nomes de campos de DashboardEventSerializer para
+    o dispositivo e a classe.
+    """
+
+    bucket = serializers.DateTimeField(
+        help_text="Início do intervalo (hora ou dia)"
+    )
+
+    mac = serializers.CharField(
+        source="device.mac_address",
+        help_text="Endereço MAC do dispositivo edge"
+    )
+
+    class_name = serializers.CharField(
+        source="detected_class",
+        help_text="Classe do objeto de risco detectado"
+    )
+
+    count = serializers.IntegerField(
+        help_text="Quantidade de eventos no intervalo"
+    )
+
+
+class ArchivedEventSerializer(serializers.Serializer):
+    """
+    Serializer de saída dos eventos do arquivo frio (ArchiveView).
+
+    Utiliza os mesmos nomes de campos de DashboardEventSerializer, com
+    a evidência servida por ArchiveEvidenceView.
+    """
+
+    mac = serializers.CharField(
+        help_text="Endereço MAC do dispositivo edge"
+    )
+
+    class_name = serializers.CharField(
+        help_text="Classe do objeto de risco detectado"
+    )
+
+    datetime = serializers.DateTimeField(
+        help_text="Data e hora da detecção"
+    )
+
+    image = serializers.URLField(
+        allow_null=True,
+        help_text="URL da evidência arquivada"
+    )
+
+    archive = serializers.CharField(
+        help_text="Identificador do arquivo que contém o evento"
+    )
+
+
+class AggregateRowSerializer(serializers.Serializer):
+    """
+    Serializer de saída das contagens do endpoint de agregação
+    (AggregateView).
+
+    Os campos de grupo são incluídos apenas quando informados em
+    `group_by`.
+    """
+
+    bucket = serializers.DateTimeField(
+        help_text="Início do intervalo de agregação"
+    )
+
+    class_name = serializers.CharField(
+        required=False,
+        help_text="Classe detectada (group_by=class)"
+    )
+
+    mac = serializers.CharField(
+        required=False,
+        help_text="Endereço MAC do dispositivo (group_by=device)"
+    )
+
+    count = serializers.IntegerField(
+        help_text="Quantidade de eventos no intervalo"
+    )
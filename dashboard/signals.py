@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+
+from monitoring.models import MonitoringEvent
+from monitoring.services import events_persisted
+from .cache import bump_events_version
+from .live import live_broker
+from .rollups import increment_rollups
+
+
+@receiver(events_persisted, sender=MonitoringEvent)
+def update_event_rollups(sender, events: list[MonitoringEvent], **kwargs) -> None:
+    """
+    Atualiza as contagens agregadas do dashboard com os eventos gravados.
+    """
+    if settings.DASHBOARD_ROLLUPS_AT_INGEST:
+        increment_rollups(events)
+
+
+@receiver(events_persisted, sender=MonitoringEvent)
+def invalidate_dashboard_cache(sender, events: list[MonitoringEvent], **kwargs) -> None:
+    """
+    Invalida as respostas em cache do dashboard após o commit dos
+    eventos gravados.
+
+    Incrementar a versão antes do commit permitiria que uma consulta
+    concorrente gravasse no cache, com a nova versão, uma resposta sem
+    os eventos ainda não confirmados.
+    """
+    transaction.on_commit(bump_events_version)
+
+
+@receiver(events_persisted, sender=MonitoringEvent)
+def publish_live_events(sender, events: list[MonitoringEvent], **kwargs) -> None:
+    """
+    Publica os eventos gravados nas conexões ao vivo do dashboard após
+    o commit (ver dashboard.live).
+    """
+    transaction.on_commit(lambda: live_broker.publish(events))
@@ -1,3 +1,509 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.timezone import localdate
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from monitoring.models import Device, MonitoringEvent
+from monitoring.services import persist_events
+from . import cache as dashboard_cache
+from .cache import VersionBumper, bump_events_version, events_version
+from .export import export_row
+from .live import LiveToken, event_stream, live_broker
+from .queries import changes_horizon
+from .rollups import ROLLUPS, day_start, rebuild_rollups
+from .serializers import encode_json
+
+
+@override_settings(DASHBOARD_VERSION_BUMP_INTERVAL=0)
+class EventsVersionTests(TestCase):
+    """
+    Versão dos eventos utilizada pelo cache de respostas do dashboard.
+    """
+
+    def setUp(self):
+        patcher = mock.patch("dashboard.cache.version_bumper", VersionBumper())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_version_is_kept_in_database(self):
+        version = events_version()
+
+        # Independe do cache local do processo
+        cache.clear()
+
+        self.assertEqual(events_version(), version)
+
+    def test_bump_changes_version(self):
+        version = events_version()
+
+        bump_events_version()
+
+        self.assertEqual(events_version(), version + 1)
+
+    def test_bump_before_first_read(self):
+        bump_events_version()
+
+        self.assertIsNotNone(events_version())
+
+    @override_settings(DASHBOARD_VERSION_BUMP_INTERVAL=60)
+    def test_bumps_are_coalesced(self):
+        version = events_version()
+
+        with mock.patch("dashboard.cache.threading.Timer") as timer:
+            for _ in range(3):
+                bump_events_version()
+
+        # Apenas o primeiro incremento é gravado; os demais agendam um único
+        self.assertEqual(events_version(), version + 1)
+        timer.assert_called_once()
+
+        dashboard_cache.version_bumper.flush()
+
+        self.assertEqual(events_version(), version + 2)
+
+
+class EncodeJsonTests(SimpleTestCase):
+    """
+    Codificação das respostas do dashboard.
+    """
+
+    def test_matches_drf_renderer(self):
+        data = {
+            "count": 1,
+            "next": None,
+            "results": [{"mac": "AA:BB:CC:DD:EE:01", "class_name": "pessoa ç", "image": None}],
+        }
+
+        self.assertEqual(encode_json(data), JSONRenderer().render(data))
+
+
+class DashboardViewTests(TestCase):
+    """
+    Consulta de eventos do dashboard (/api/dashboard/).
+    """
+
+    def setUp(self):
+        user = User.objects.create_user("operator", password="secret", is_staff=True)
+        self.headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        self.params = {"start_date": "2026-01-01", "end_date": "2026-01-01"}
+
+        device = Device.objects.create(mac=0xAABBCCDDEE01)
+        for minute in range(5):
+            MonitoringEvent.objects.create(
+                device=device,
+                detected_class="person",
+                detected_at=datetime(2026, 1, 1, 10, minute, tzinfo=timezone.utc),
+                evidence=f"monitoring/evidence/{minute}.jpg",
+            )
+
+        self.addCleanup(cache.clear)
+
+    def fetch_pages(self, path: str, params: dict) -> list[list[dict]]:
+        pages = []
+        response = self.client.get(path, params, headers=self.headers)
+
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json()["results"])
+
+            if response.json()["next"] is None:
+                return pages
+
+            response = self.client.get(response.json()["next"], headers=self.headers)
+
+    def test_pages_follow_cursor(self):
+        pages = self.fetch_pages("/api/dashboard/", {**self.params, "page_size": 2})
+        minutes = [row["datetime"][14:16] for page in pages for row in page]
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(minutes, ["04", "03", "02", "01", "00"])
+
+    def test_event_listing_is_paginated(self):
+        pages = self.fetch_pages("/api/monitoring/", {"page_size": 3})
+
+        self.assertEqual([len(page) for page in pages], [3, 2])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get("/api/dashboard/", {**self.params, "cursor": "invalid"}, headers=self.headers)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_unchanged_response_is_not_modified(self):
+        response = self.client.get("/api/dashboard/", self.params, headers=self.headers)
+
+        cached = self.client.get(
+            "/api/dashboard/", self.params,
+            headers={**self.headers, "If-None-Match": response["ETag"]},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    @override_settings(DASHBOARD_VERSION_BUMP_INTERVAL=0)
+    def test_new_events_change_etag(self):
+        response = self.client.get("/api/dashboard/", self.params, headers=self.headers)
+
+        with mock.patch("dashboard.cache.version_bumper", VersionBumper()):
+            MonitoringEvent.objects.create(
+                device=Device.objects.get(),
+                detected_class="car",
+                detected_at=datetime(2026, 1, 1, 10, 5, tzinfo=timezone.utc),
+                evidence="monitoring/evidence/5.jpg",
+            )
+            bump_events_version()
+
+        updated = self.client.get(
+            "/api/dashboard/", self.params,
+            headers={**self.headers, "If-None-Match": response["ETag"]},
+        )
+
+        self.assertEqual(updated.status_code, 200)
+        self.assertNotEqual(updated["ETag"], response["ETag"])
+        self.assertEqual(len(updated.json()["results"]), 6)
+
+    def aggregate(self, **params):
+        return self.client.get("/api/dashboard/aggregate/", {**self.params, **params}, headers=self.headers)
+
+    def test_aggregate_counts_per_bucket(self):
+        response = self.aggregate(bucket="minute")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["count"] for row in response.json()], [1] * 5)
+        self.assertEqual(response.json()[0]["bucket"][11:16], "07:00")
+
+    def test_aggregate_group_by(self):
+        response = self.aggregate(group_by="class,device")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [{key: row[key] for key in ("class_name", "mac", "count")} for row in response.json()],
+            [{"class_name": "person", "mac": "AA:BB:CC:DD:EE:01", "count": 5}],
+        )
+
+    def test_aggregate_rejects_invalid_params(self):
+        self.assertEqual(self.aggregate(bucket="week").status_code, 400)
+        self.assertEqual(self.aggregate(group_by="camera").status_code, 400)
+        # Intervalos de um minuto em mais de AGGREGATE_MAX_BUCKETS
+        self.assertEqual(self.aggregate(end_date="2026-01-31", bucket="minute").status_code, 400)
+
+    async def test_async_view_matches_sync_view(self):
+        sync = await sync_to_async(self.client.get)("/api/dashboard/", self.params, headers=self.headers)
+        response = await self.async_client.get("/api/dashboard/async/", self.params, headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync.json())
+
+    async def test_async_view_requires_authentication(self):
+        response = await self.async_client.get("/api/dashboard/async/", self.params)
+
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(DASHBOARD_ROLLUPS_AT_INGEST=True, MONITORING_COALESCE_WINDOW=0)
+class RollupTests(TestCase):
+    """
+    Contagens agregadas mantidas na ingestão e recalculadas por comando.
+    """
+
+    def setUp(self):
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir, ignore_errors=True)
+        patcher = override_settings(MONITORING_ARCHIVE_DIR=archive_dir)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+        user = User.objects.create_user("operator", password="secret", is_staff=True)
+        self.headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+        self.day = localdate() - timedelta(days=1)
+        device = Device.objects.create(mac=0xAABBCCDDEE01)
+        persist_events([
+            MonitoringEvent(
+                device=device,
+                detected_class="person",
+                detected_at=day_start(self.day) + timedelta(hours=hour, minutes=minute),
+                evidence=f"monitoring/evidence/{hour}{minute}.jpg",
+            )
+            for hour, minute in ((10, 0), (10, 30), (11, 0))
+        ])
+
+    def counts(self) -> dict[str, list[int]]:
+        return {
+            granularity: list(model.objects.order_by("bucket").values_list("count", flat=True))
+            for granularity, model in ROLLUPS.items()
+        }
+
+    def test_ingestion_increments_rollups(self):
+        self.assertEqual(self.counts(), {"hour": [2, 1], "day": [3]})
+
+    def test_rebuild_matches_ingestion(self):
+        expected = self.counts()
+        for model in ROLLUPS.values():
+            model.objects.all().delete()
+
+        rebuild_rollups(self.day, self.day)
+
+        self.assertEqual(self.counts(), expected)
+
+    def test_rebuild_before_retention_is_refused(self):
+        with self.assertRaises(ValueError):
+            rebuild_rollups(self.day - timedelta(days=365), self.day)
+
+        self.assertEqual(self.counts(), {"hour": [2, 1], "day": [3]})
+
+    def test_rollup_view(self):
+        response = self.client.get(
+            "/api/dashboard/rollups/",
+            {"start_date": self.day.isoformat(), "end_date": self.day.isoformat(), "granularity": "hour"},
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["count"] for row in response.json()], [2, 1])
+
+
+class ExportStreamingTests(TestCase):
+    """
+    Exportação em fluxo servida via ASGI.
+    """
+
+    def setUp(self):
+        user = User.objects.create_user("operator", password="secret", is_staff=True)
+        self.token = str(RefreshToken.for_user(user).access_token)
+
+        device = Device.objects.create(mac=0xAABBCCDDEE01)
+        for minute in range(3):
+            MonitoringEvent.objects.create(
+                device=device,
+                detected_class="person",
+                detected_at=datetime(2026, 1, 1, 10, minute, tzinfo=timezone.utc),
+                evidence=f"monitoring/evidence/{minute}.jpg",
+            )
+
+    @override_settings(DASHBOARD_EXPORT_CHUNK_SIZE=1)
+    async def test_export_is_streamed_under_asgi(self):
+        steps = []
+
+        def record_row(event, request):
+            steps.append("row")
+            return export_row(event, request)
+
+        with mock.patch("dashboard.export.export_row", side_effect=record_row):
+            response = await self.async_client.get(
+                "/api/dashboard/export/",
+                {"start_date": "2026-01-01", "end_date": "2026-01-01"},
+                headers={"Authorization": f"Bearer {self.token}"},
+            )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_async)
+
+            lines = []
+            async for chunk in response.streaming_content:
+                steps.append("chunk")
+                lines.append(json.loads(chunk))
+
+        # Cada linha é enviada antes da leitura do evento seguinte
+        self.assertEqual(steps, ["row", "chunk"] * 3)
+        self.assertEqual([line["datetime"][11:16] for line in lines], ["07:00", "07:01", "07:02"])
+
+    def test_csv_export(self):
+        response = self.client.get(
+            "/api/dashboard/export/",
+            {"start_date": "2026-01-01", "end_date": "2026-01-01", "file_format": "csv"},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+
+        self.assertEqual([row["datetime"][11:16] for row in rows], ["07:00", "07:01", "07:02"])
+        self.assertEqual({row["mac"] for row in rows}, {"AA:BB:CC:DD:EE:01"})
+
+    def test_invalid_format_is_rejected(self):
+        response = self.client.get(
+            "/api/dashboard/export/",
+            {"start_date": "2026-01-01", "end_date": "2026-01-01", "file_format": "xlsx"},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(DASHBOARD_CHANGES_LAG=60)
+class ChangesFeedTests(TestCase):
+    """
+    Feed de alterações do dashboard (/api/dashboard/changes/).
+    """
+
+    def setUp(self):
+        user = User.objects.create_user("operator", password="secret", is_staff=True)
+        self.headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        self.device = Device.objects.create(mac=0xAABBCCDDEE01)
+
+    def create_event(self, detected_class: str, age: timedelta) -> None:
+        event = MonitoringEvent.objects.create(
+            device=self.device,
+            detected_class=detected_class,
+            detected_at=datetime(2026, 1, 1, 10, tzinfo=timezone.utc),
+            evidence="monitoring/evidence/a.jpg",
+        )
+        MonitoringEvent.objects.filter(pk=event.pk).update(
+            created_at=datetime.now(timezone.utc) - age
+        )
+
+    def changes(self, since: str | None = None) -> dict:
+        response = self.client.get(
+            "/api/dashboard/changes/",
+            {"since": since} if since else {},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_events_after_cursor_are_returned(self):
+        self.create_event("person", timedelta(hours=1))
+        initial = self.changes()
+
+        self.create_event("vehicle", timedelta(minutes=10))
+        self.create_event("animal", timedelta(seconds=0))
+        changes = self.changes(initial["cursor"])
+
+        self.assertEqual(initial["results"], [])
+        # Eventos dentro do atraso ficam para a consulta seguinte
+        self.assertEqual([row["class_name"] for row in changes["results"]], ["vehicle"])
+        self.assertEqual(self.changes(changes["cursor"])["results"], [])
+
+    @skipUnless(connection.vendor == "postgresql", "Transações de outras sessões requerem PostgreSQL")
+    def test_horizon_waits_for_open_write_transaction(self):
+        other = connection.get_new_connection(connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                # Atribui um identificador de transação, como uma ingestão
+                cursor.execute(
+                    "SELECT txid_current(), xact_start FROM pg_stat_activity "
+                    "WHERE pid = pg_backend_pid()"
+                )
+                started = cursor.fetchone()[1]
+
+                self.assertLessEqual(changes_horizon(), started - timedelta(seconds=60))
+        finally:
+            other.close()
+
+
+class LiveAuthenticationTests(TestCase):
+    """
+    Autenticação da conexão ao vivo por token na querystring.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("operator", password="secret", is_staff=True)
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+    async def connect(self, token: str):
+        return await self.async_client.get("/api/dashboard/live/", {"token": token})
+
+    async def test_live_token_in_query(self):
+        response = await self.async_client.post(
+            "/api/dashboard/live/token/",
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+        live = await self.connect(response.json()["token"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(live.status_code, 200)
+        # A assinatura só é registrada quando a transmissão é iniciada
+        self.assertFalse(live_broker._subscriptions)
+
+    async def test_access_token_in_query_is_rejected(self):
+        response = await self.connect(self.access_token)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_live_token_is_not_access_token(self):
+        token = str(LiveToken.for_user(self.user))
+
+        response = await self.async_client.get(
+            "/api/dashboard/export/",
+            {"start_date": "2026-01-01", "end_date": "2026-01-01"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_expired_live_token_is_rejected(self):
+        token = LiveToken.for_user(self.user)
+        token.set_exp(lifetime=timedelta(seconds=-1))
+
+        response = await self.connect(str(token))
+
+        self.assertEqual(response.status_code, 401)
+
+
+class LiveBrokerTests(SimpleTestCase):
+    """
+    Entrega dos eventos publicados às conexões ao vivo.
+    """
+
+    def events(self) -> list[MonitoringEvent]:
+        device = Device(mac=0xAABBCCDDEE01)
+        return [
+            MonitoringEvent(
+                pk=pk,
+                device=device,
+                detected_class=detected_class,
+                detected_at=datetime(2026, 1, 1, 10, pk, tzinfo=timezone.utc),
+                evidence=f"monitoring/evidence/{pk}.jpg",
+            )
+            for pk, detected_class in ((1, "person"), (2, "car"))
+        ]
+
+    async def test_subscription_receives_matching_events(self):
+        subscription = live_broker.subscribe(detected_class="car")
+        self.addCleanup(live_broker.unsubscribe, subscription)
+
+        live_broker.publish(self.events())
+        await asyncio.sleep(0)
+
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.queue.get_nowait().pk, 2)
+
+    @override_settings(DASHBOARD_LIVE_MAX_PENDING=1)
+    async def test_slow_subscription_overflows(self):
+        subscription = live_broker.subscribe()
+        self.addCleanup(live_broker.unsubscribe, subscription)
+
+        live_broker.publish(self.events())
+        await asyncio.sleep(0)
+
+        self.assertTrue(subscription.overflowed)
+
+    async def test_event_stream_sends_published_events(self):
+        stream = event_stream(RequestFactory().get("/api/dashboard/live/"))
+        message = asyncio.ensure_future(anext(stream))
+
+        # A assinatura é registrada no início da transmissão
+        await asyncio.sleep(0)
+        live_broker.publish(self.events()[:1])
+
+        self.assertTrue((await message).startswith("id: 1\nevent: detection\ndata: "))
+
+        await stream.aclose()
+
+        self.assertFalse(live_broker._subscriptions)
@@ -6,11 +6,70 @@ Este módulo define exclusivamente os endpoints relacionados
 delegando toda a lógica de agregação e filtragem para a view.
 """
 from django.urls import path
-from dashboard.views import DashboardView
+from dashboard.async_views import dashboard_async, dashboard_live
+from dashboard.views import (
+    AggregateView,
+    ArchiveEvidenceView,
+    ArchiveView,
+    ChangesView,
+    DashboardView,
+    DerivativeView,
+    ExportView,
+    LiveTokenView,
+    RollupView,
+)
 
 urlpatterns = [
     
     # DASHBOARD
     # GET /api/dashboard/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
-    path("", DashboardView.as_view(), name="dashboard")        
-]
\ No newline at end of file
+    path("", DashboardView.as_view(), name="dashboard"),
+
+    # DASHBOARD (VIEW ASSÍNCRONA, ASGI)
+    # GET /api/dashboard/async/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    path("async/", dashboard_async, name="dashboard-async"),
+
+    # EVENTOS REGISTRADOS APÓS UM CURSOR
+    # GET /api/dashboard/changes/?since=<cursor>
+    path("changes/", ChangesView.as_view(), name="dashboard-changes"),
+
+    # NOVOS EVENTOS AO VIVO (SERVER-SENT EVENTS, ASGI)
+    # GET /api/dashboard/live/?detected_class=person&mac_address=XX:XX:XX:XX:XX:XX
+    path("live/", dashboard_live, name="dashboard-live"),
+
+    # TOKEN DA CONEXÃO AO VIVO (CLIENTES EVENTSOURCE)
+    # POST /api/dashboard/live/token/
+    path("live/token/", LiveTokenView.as_view(), name="dashboard-live-token"),
+
+    # CONTAGENS AGREGADAS PARA GRÁFICOS
+    # GET /api/dashboard/rollups/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&granularity=hour|day
+    path("rollups/", RollupView.as_view(), name="dashboard-rollups"),
+
+    # SÉRIES TEMPORAIS AGREGADAS NO BANCO DE DADOS
+    # GET /api/dashboard/aggregate/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&bucket=minute|hour|day&group_by=class,device
+    path("aggregate/", AggregateView.as_view(), name="dashboard-aggregate"),
+
+    # EXPORTAÇÃO EM FLUXO (NDJSON OU CSV)
+    # GET /api/dashboard/export/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&file_format=ndjson|csv
+    path("export/", ExportView.as_view(), name="dashboard-export"),
+
+    # ARQUIVO FRIO DE EVENTOS (SOMENTE LEITURA)
+    # GET /api/dashboard/archive/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    path("archive/", ArchiveView.as_view(), name="dashboard-archive"),
+
+    # EVIDÊNCIA ARQUIVADA
+    # GET /api/dashboard/archive/<archive_id>/evidence/<name>
+    path(
+        "archive/<str:archive_id>/evidence/<path:name>",
+        ArchiveEvidenceView.as_view(),
+        name="dashboard-archive-evidence"
+    ),
+
+    # DERIVADOS DAS EVIDÊNCIAS (GERADOS SOB DEMANDA)
+    # GET /api/dashboard/derivatives/<size>/<evidence_name>
+    path(
+        "derivatives/<str:size>/<path:name>",
+        DerivativeView.as_view(),
+        name="dashboard-derivative"
+    ),
+]
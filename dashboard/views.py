@@ -1,16 +1,72 @@
-from datetime import datetime
+import mimetypes
+from datetime import datetime, timedelta
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.db.models import Count
+from django.db.models.functions import Trunc
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter
 from drf_spectacular.utils import extend_schema
 
+from core.pagination import ChangesPagination, KeysetPagination
 from core.utils import report_log
-from monitoring.models import MonitoringEvent
-from .serializers import DashboardEventSerializer
+from monitoring.archive import query_archive, read_evidence
+from monitoring.derivatives import derivative_name, ensure_derivatives, is_evidence_name
+from monitoring.mac import format_mac, parse_mac
+from monitoring.storage import evidence_storage
+from .cache import events_version, not_modified, response_etag, response_key
+from .dates import parse_date_range
+from .export import EXPORT_FORMATS
+from .live import LiveToken
+from .queries import changes_horizon, events_in_range, events_registered_until
+from .rollups import ROLLUPS
+from .serializers import (
+    AggregateRowSerializer,
+    ArchivedEventSerializer,
+    DashboardChangesSerializer,
+    DashboardEventSerializer,
+    EventRollupSerializer,
+    LiveTokenSerializer,
+    dashboard_rows,
+    encode_json,
+    serialize_dashboard_rows,
+)
+
+
+# Quantidade máxima de eventos retornados por consulta ao arquivo
+ARCHIVE_MAX_RESULTS = 1000
+
+# Intervalo máximo (dias) das consultas de contagens horárias
+ROLLUP_MAX_HOURLY_DAYS = 31
+
+# Intervalos de agregação disponíveis no endpoint de agregação
+AGGREGATE_BUCKETS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+# Dimensões de agrupamento e os campos correspondentes
+AGGREGATE_DIMENSIONS = {
+    "class": "detected_class",
+    "device": "device__mac",
+}
+
+# Quantidade máxima de intervalos de uma consulta de agregação
+AGGREGATE_MAX_BUCKETS = 10000
+
+# Quantidade máxima de linhas (intervalos x grupos) de uma agregação
+AGGREGATE_MAX_ROWS = 10000
 
 
 class DashboardView(APIView):
@@ -24,6 +80,8 @@ class DashboardView(APIView):
     O acesso é restrito a usuários autenticados.
     """
     permission_classes = [IsAuthenticated]
+    # Utilizada na view e na documentação da resposta paginada
+    pagination_class = KeysetPagination
     
     @extend_schema(
     parameters=[
@@ -39,29 +97,50 @@ class DashboardView(APIView):
             required=True,
             type=str,
         ),
+        OpenApiParameter(
+            name="cursor",
+            description="Cursor da página, retornado em `next`",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="page_size",
+            description="Quantidade de eventos por página",
+            required=False,
+            type=int,
+        ),
     ],
-    responses=DashboardEventSerializer(many=True),
+    responses={200: DashboardEventSerializer(many=True), 304: None, 400: None, 404: None},
     )
-    def get(self, request: Request) -> Response:
+    def get(self, request: Request) -> HttpResponse | Response:
         """
         Retorna eventos de monitoramento filtrados por intervalo de datas.
 
         Responsabilidades:
         - Validar parâmetros de data informados na querystring
         - Converter datas para objetos datetime
-        - Filtrar eventos no intervalo informado
-        - Serializar os dados no formato esperado pelo dashboard
-        - Registrar a operação em log
+        - Responder 304 quando o ETag informado em If-None-Match
+          corresponder à versão atual dos eventos (ver dashboard.cache)
+        - Filtrar eventos no intervalo informado, paginados por cursor
+          (mais recentes primeiro)
+        - Serializar os dados no formato de DashboardEventSerializer,
+          pelo caminho rápido (`serialize_dashboard_rows`), reaproveitando
+          a resposta em cache quando disponível
+        - Registrar a operação em log (apenas respostas calculadas)
 
         Query params esperados:
             - start_date (YYYY-MM-DD)
             - end_date (YYYY-MM-DD)
+            - cursor (opcional, retornado em `next`)
+            - page_size (opcional)
 
         Returns
         -------
-        Response
-            - 200 OK: Lista de eventos de monitoramento
+        HttpResponse | Response
+            - 200 OK: Página de eventos de monitoramento ({"next", "results"})
+            - 304 Not Modified: Nenhum evento novo desde o ETag informado
             - 400 Bad Request: Parâmetros ausentes ou inválidos
+            - 404 Not Found: Cursor inválido
         """
         start_date = request.query_params.get("start_date")
         end_date = request.query_params.get("end_date")
@@ -73,9 +152,7 @@ class DashboardView(APIView):
             )
         
         try:
-            start_date = datetime.strptime(start_date, "%Y-%m-%d")
-            end_date = datetime.strptime(end_date, "%Y-%m-%d")
-            end_date = end_date.replace(hour=23, minute=59, second=59)
+            start_date, end_date = parse_date_range(start_date, end_date)
         
         except ValueError:
             return Response(
@@ -83,24 +160,809 @@ class DashboardView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        events = MonitoringEvent.objects.filter(
-            detected_at__range=(start_date, end_date)
-        ).order_by("-detected_at")
-        
-        serializer = DashboardEventSerializer(
-            events,
-            many=True,
-            context={"request": request}
+        etag = response_etag(request, events_version())
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        body = cache.get(response_key(etag))
+
+        if body is None:
+            paginator = self.pagination_class()
+            events = paginator.paginate_queryset(
+                dashboard_rows(events_in_range(start_date, end_date)),
+                request
+            )
+
+            body = encode_json(
+                paginator.get_paginated_data(serialize_dashboard_rows(events, request))
+            )
+            cache.set(response_key(etag), body, settings.DASHBOARD_CACHE_TTL)
+
+            report_log(
+                user=request.user,
+                action="Consultar Dashboard",
+                status="INFO",
+                message=f"{len(events)} eventos retornados no dashboard"
+            )
+
+        return HttpResponse(body, content_type="application/json", headers=headers)
+
+class ChangesView(APIView):
+    """
+    View responsável pelo feed de alterações do dashboard.
+
+    Retorna apenas os eventos registrados após um cursor (`since`),
+    em ordem de registro, e o cursor a partir do qual a próxima
+    consulta deve continuar (ver ChangesPagination). Destina-se a
+    clientes que não mantêm a conexão ao vivo (`/api/dashboard/live/`):
+    cada atualização transfere apenas os eventos novos, em vez de todo
+    o intervalo exibido.
+
+    Para iniciar o acompanhamento, o cliente obtém o cursor inicial
+    (consulta sem `since`) antes de carregar o intervalo por
+    DashboardView, de modo que nenhum evento registrado entre as duas
+    consultas seja perdido.
+
+    Eventos registrados nos últimos DASHBOARD_CHANGES_LAG segundos, ou
+    após o início de uma transação de ingestão ainda não confirmada,
+    só são retornados na consulta seguinte: a transação pode gravar
+    eventos com `created_at` anterior ao de eventos já visíveis, que
+    seriam ignorados após o avanço do cursor (ver `changes_horizon`).
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="since",
+            description="Cursor retornado em `cursor` pela consulta anterior (vazio = cursor inicial)",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="page_size",
+            description="Quantidade de eventos por página",
+            required=False,
+            type=int,
+        ),
+    ],
+    responses={200: DashboardChangesSerializer, 404: None},
+    )
+    def get(self, request: Request) -> HttpResponse:
+        """
+        Retorna os eventos registrados após o cursor informado.
+
+        Responsabilidades:
+        - Limitar a consulta aos eventos já confirmados
+          (`changes_horizon`)
+        - Sem cursor, retornar apenas o cursor do evento mais recente
+        - Com cursor, retornar os eventos seguintes (paginados) e o
+          novo cursor, no formato de DashboardEventSerializer
+        - Registrar a operação em log
+
+        Query params esperados:
+            - since (opcional, retornado em `cursor`)
+            - page_size (opcional)
+
+        Returns
+        -------
+        HttpResponse
+            - 200 OK: Eventos novos e cursor ({"cursor", "next", "results"})
+            - 404 Not Found: Cursor inválido
+        """
+        paginator = ChangesPagination()
+        events = paginator.paginate_queryset(
+            dashboard_rows(
+                events_registered_until(changes_horizon()),
+                "created_at"
+            ),
+            request
         )
-        
+
         report_log(
             user=request.user,
-            action="Consultar Dashboard",
+            action="Consultar Alterações do Dashboard",
             status="INFO",
-            message=f"{events.count()} eventos retornados no dashboard"
+            message=f"{len(events)} eventos novos retornados no dashboard"
         )
-        
+
+        return HttpResponse(
+            encode_json(paginator.get_paginated_data(serialize_dashboard_rows(events, request))),
+            content_type="application/json"
+        )
+
+
+class LiveTokenView(APIView):
+    """
+    View responsável pela emissão do token da conexão ao vivo.
+
+    O EventSource dos navegadores não permite definir o cabeçalho
+    Authorization; o cliente obtém aqui um token de curta duração
+    (LiveToken) e o informa no parâmetro `token` de
+    `/api/dashboard/live/` (ver dashboard.live).
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=None, responses={200: LiveTokenSerializer})
+    def post(self, request: Request) -> Response:
+        """
+        Emite um token da conexão ao vivo para o usuário autenticado.
+
+        Returns
+        -------
+        Response
+            - 200 OK: Token e validade, em segundos
+        """
+        token = LiveToken.for_user(request.user)
+
+        report_log(
+            user=request.user,
+            action="Emitir Token do Dashboard ao Vivo",
+            status="INFO",
+            message="Token da conexão ao vivo emitido"
+        )
+
+        return Response({
+            "token": str(token),
+            "expires_in": settings.DASHBOARD_LIVE_TOKEN_LIFETIME,
+        })
+
+
+class RollupView(APIView):
+    """
+    View responsável por fornecer as contagens agregadas de eventos
+    (rollups) para os gráficos do dashboard.
+
+    Retorna a quantidade de eventos por hora ou por dia, dispositivo e
+    classe, lida das tabelas de rollup (ver dashboard.rollups), sem
+    percorrer os eventos do intervalo.
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="start_date",
+            description="Data inicial (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="end_date",
+            description="Data final (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="granularity",
+            description="Granularidade das contagens (hour ou day, padrão day)",
+            required=False,
+            type=str,
+            enum=list(ROLLUPS),
+        ),
+        OpenApiParameter(
+            name="mac_address",
+            description="MAC do dispositivo (XX:XX:XX:XX:XX:XX)",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="detected_class",
+            description="Classe detectada",
+            required=False,
+            type=str,
+        ),
+    ],
+    responses=EventRollupSerializer(many=True),
+    )
+    def get(self, request: Request) -> Response:
+        """
+        Retorna as contagens de eventos do intervalo de datas.
+
+        Responsabilidades:
+        - Validar parâmetros informados na querystring
+        - Filtrar as contagens da granularidade solicitada
+        - Serializar as contagens em ordem cronológica
+        - Registrar a operação em log
+
+        Query params esperados:
+            - start_date (YYYY-MM-DD)
+            - end_date (YYYY-MM-DD)
+            - granularity (opcional, hour ou day)
+            - mac_address (opcional)
+            - detected_class (opcional)
+
+        Returns
+        -------
+        Response
+            - 200 OK: Lista de contagens
+            - 400 Bad Request: Parâmetros ausentes ou inválidos
+        """
+        start_date = request.query_params.get("start_date")
+        end_date = request.query_params.get("end_date")
+        granularity = request.query_params.get("granularity", "day")
+
+        if not start_date or not end_date:
+            return Response(
+                {"detail": "Parâmetros start_date e end_date são obrigatórios"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if granularity not in ROLLUPS:
+            return Response(
+                {"detail": f"Granularidade inválida. Use {' ou '.join(ROLLUPS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start_date, end_date = parse_date_range(start_date, end_date)
+
+        except ValueError:
+            return Response(
+                {"detail": "Formato de data inválido. Use YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if granularity == "hour" and end_date - start_date > timedelta(days=ROLLUP_MAX_HOURLY_DAYS):
+            return Response(
+                {"detail": f"Contagens horárias limitadas a {ROLLUP_MAX_HOURLY_DAYS} dias"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rollups = ROLLUPS[granularity].objects.select_related("device").filter(
+            bucket__range=(start_date, end_date)
+        )
+
+        mac_address = request.query_params.get("mac_address")
+
+        if mac_address:
+            try:
+                rollups = rollups.filter(device__mac=parse_mac(mac_address))
+
+            except ValueError:
+                return Response(
+                    {"detail": "MAC address inválido. Formato esperado XX:XX:XX:XX:XX:XX"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        detected_class = request.query_params.get("detected_class")
+
+        if detected_class:
+            rollups = rollups.filter(detected_class=detected_class)
+
+        serializer = EventRollupSerializer(rollups, many=True)
+
+        report_log(
+            user=request.user,
+            action="Consultar Rollups do Dashboard",
+            status="INFO",
+            message=f"{len(serializer.data)} contagens ({granularity}) retornadas"
+        )
+
         return Response(
             serializer.data,
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class AggregateView(APIView):
+    """
+    View responsável por fornecer séries temporais de eventos agregadas
+    no banco de dados.
+
+    Aplica o mesmo filtro de intervalo de datas de DashboardView e
+    retorna a quantidade de eventos por intervalo de tempo (minuto, hora
+    ou dia), opcionalmente agrupada por classe e/ou dispositivo. O
+    tamanho da resposta depende da quantidade de intervalos e grupos,
+    e não da quantidade de eventos.
+
+    Alternativa às contagens de RollupView para granularidades ou
+    períodos não cobertos pelas tabelas de rollup.
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="start_date",
+            description="Data inicial (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="end_date",
+            description="Data final (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="bucket",
+            description="Intervalo de agregação (minute, hour ou day, padrão hour)",
+            required=False,
+            type=str,
+            enum=list(AGGREGATE_BUCKETS),
+        ),
+        OpenApiParameter(
+            name="group_by",
+            description="Dimensões de agrupamento separadas por vírgula (class, device)",
+            required=False,
+            type=str,
+        ),
+    ],
+    responses={200: AggregateRowSerializer(many=True), 400: None},
+    )
+    def get(self, request: Request) -> Response:
+        """
+        Retorna a quantidade de eventos por intervalo de tempo.
+
+        Responsabilidades:
+        - Validar parâmetros informados na querystring
+        - Agregar os eventos do intervalo no banco de dados
+          (date_trunc / COUNT)
+        - Retornar uma linha por intervalo e grupo, em ordem cronológica
+        - Registrar a operação em log
+
+        Query params esperados:
+            - start_date (YYYY-MM-DD)
+            - end_date (YYYY-MM-DD)
+            - bucket (opcional, minute, hour ou day)
+            - group_by (opcional, class e/ou device)
+
+        Returns
+        -------
+        Response
+            - 200 OK: Lista de contagens ({"bucket", "count"}, acrescidas
+              de "class_name" e/ou "mac" conforme group_by)
+            - 400 Bad Request: Parâmetros ausentes ou inválidos, ou
+              resultado acima de AGGREGATE_MAX_ROWS linhas
+        """
+        start_date = request.query_params.get("start_date")
+        end_date = request.query_params.get("end_date")
+        bucket = request.query_params.get("bucket", "hour")
+        group_by = [
+            dimension.strip()
+            for dimension in request.query_params.get("group_by", "").split(",")
+            if dimension.strip()
+        ]
+
+        if not start_date or not end_date:
+            return Response(
+                {"detail": "Parâmetros start_date e end_date são obrigatórios"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if bucket not in AGGREGATE_BUCKETS:
+            return Response(
+                {"detail": f"Intervalo inválido. Use {', '.join(AGGREGATE_BUCKETS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        invalid = [dimension for dimension in group_by if dimension not in AGGREGATE_DIMENSIONS]
+
+        if invalid:
+            return Response(
+                {"detail": f"Agrupamento inválido: {', '.join(invalid)}. Use {', '.join(AGGREGATE_DIMENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start_date, end_date = parse_date_range(start_date, end_date)
+
+        except ValueError:
+            return Response(
+                {"detail": "Formato de data inválido. Use YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if (end_date - start_date) / AGGREGATE_BUCKETS[bucket] > AGGREGATE_MAX_BUCKETS:
+            return Response(
+                {"detail": f"O intervalo excede {AGGREGATE_MAX_BUCKETS} intervalos de agregação ({bucket})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        fields = [AGGREGATE_DIMENSIONS[dimension] for dimension in dict.fromkeys(group_by)]
+
+        rows = (
+            events_in_range(start_date, end_date)
+            .annotate(bucket=Trunc("detected_at", bucket, tzinfo=timezone.get_current_timezone()))
+            .values("bucket", *fields)
+            .annotate(count=Count("id"))
+            .order_by("bucket", *fields)
+        )
+
+        # Com agrupamento, a quantidade de linhas depende também dos
+        # grupos existentes no intervalo: a consulta é limitada
+        rows = list(rows[:AGGREGATE_MAX_ROWS + 1])
+
+        if len(rows) > AGGREGATE_MAX_ROWS:
+            return Response(
+                {
+                    "detail": (
+                        f"A agregação excede {AGGREGATE_MAX_ROWS} linhas. "
+                        "Reduza o intervalo, o agrupamento ou use um intervalo de agregação maior"
+                    )
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        series = []
+        for row in rows:
+            item = {"bucket": timezone.localtime(row["bucket"]).isoformat()}
+
+            if "detected_class" in row:
+                item["class_name"] = row["detected_class"]
+            if "device__mac" in row:
+                item["mac"] = format_mac(row["device__mac"])
+
+            item["count"] = row["count"]
+            series.append(item)
+
+        report_log(
+            user=request.user,
+            action="Consultar Agregação do Dashboard",
+            status="INFO",
+            message=f"{len(series)} contagens ({bucket}) retornadas"
+        )
+
+        return Response(
+            series,
+            status=status.HTTP_200_OK
+        )
+
+
+class ExportView(APIView):
+    """
+    View responsável pela exportação dos eventos de um intervalo de
+    datas, para auditoria.
+
+    Ao contrário de DashboardView, a resposta não é paginada nem montada
+    em memória: os eventos são lidos em blocos e enviados em fluxo
+    (StreamingHttpResponse), em NDJSON ou CSV (ver dashboard.export).
+    Sob ASGI, o fluxo é produzido por um gerador assíncrono.
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="start_date",
+            description="Data inicial (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="end_date",
+            description="Data final (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="file_format",
+            description="Formato do arquivo (ndjson ou csv, padrão ndjson)",
+            required=False,
+            type=str,
+            enum=list(EXPORT_FORMATS),
+        ),
+    ],
+    responses={(200, "application/x-ndjson"): str, (200, "text/csv"): str},
+    )
+    def get(self, request: Request) -> StreamingHttpResponse | Response:
+        """
+        Exporta os eventos de monitoramento do intervalo informado.
+
+        Responsabilidades:
+        - Validar parâmetros informados na querystring
+        - Ler os eventos do intervalo em blocos, em ordem cronológica
+        - Enviar uma linha por evento, sem carregar o intervalo em memória
+        - Registrar a operação em log
+
+        Query params esperados:
+            - start_date (YYYY-MM-DD)
+            - end_date (YYYY-MM-DD)
+            - file_format (opcional, ndjson ou csv)
+
+        Returns
+        -------
+        StreamingHttpResponse | Response
+            - 200 OK: Arquivo com os eventos do intervalo
+            - 400 Bad Request: Parâmetros ausentes ou inválidos
+        """
+        start_date = request.query_params.get("start_date")
+        end_date = request.query_params.get("end_date")
+        file_format = request.query_params.get("file_format", "ndjson")
+
+        if not start_date or not end_date:
+            return Response(
+                {"detail": "Parâmetros start_date e end_date são obrigatórios"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"Formato inválido. Use {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start, end = parse_date_range(start_date, end_date)
+
+        except ValueError:
+            return Response(
+                {"detail": "Formato de data inválido. Use YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        content_type, lines, alines = EXPORT_FORMATS[file_format]
+        events = (
+            events_in_range(start, end)
+            .select_related("device")
+            .order_by("detected_at", "id")
+        )
+        chunk_size = settings.DASHBOARD_EXPORT_CHUNK_SIZE
+
+        if isinstance(request._request, ASGIRequest):
+            # Sob ASGI, um iterador síncrono seria consumido por completo
+            # antes do envio
+            content = alines(events.aiterator(chunk_size=chunk_size), request)
+        else:
+            content = lines(events.iterator(chunk_size=chunk_size), request)
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="events-{start_date}-{end_date}.{file_format}"'
+        )
+
+        report_log(
+            user=request.user,
+            action="Exportar Eventos",
+            status="INFO",
+            message=f"Exportação {file_format} de {start_date} a {end_date}"
+        )
+
+        return response
+
+
+class ArchiveView(APIView):
+    """
+    View responsável pela consulta somente leitura do arquivo frio de
+    eventos (ver monitoring.archive).
+
+    Os eventos removidos do banco de dados pelo comando
+    `archive_events` continuam disponíveis para consulta por intervalo
+    de datas, com as evidências servidas por ArchiveEvidenceView.
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="start_date",
+            description="Data inicial (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="end_date",
+            description="Data final (YYYY-MM-DD)",
+            required=True,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="mac_address",
+            description="MAC do dispositivo (XX:XX:XX:XX:XX:XX)",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="detected_class",
+            description="Classe detectada",
+            required=False,
+            type=str,
+        ),
+        OpenApiParameter(
+            name="limit",
+            description=f"Quantidade máxima de eventos (padrão e máximo {ARCHIVE_MAX_RESULTS})",
+            required=False,
+            type=int,
+        ),
+    ],
+    responses={200: ArchivedEventSerializer(many=True), 400: None},
+    description="Consulta somente leitura dos eventos do arquivo frio."
+    )
+    def get(self, request: Request) -> Response:
+        """
+        Retorna eventos arquivados filtrados por intervalo de datas.
+
+        Responsabilidades:
+        - Validar parâmetros informados na querystring
+        - Ler apenas os blocos do arquivo que cobrem o intervalo
+        - Retornar os eventos no formato do dashboard, com a URL da
+          evidência arquivada
+        - Registrar a operação em log
+
+        Query params esperados:
+            - start_date (YYYY-MM-DD)
+            - end_date (YYYY-MM-DD)
+            - mac_address (opcional)
+            - detected_class (opcional)
+            - limit (opcional)
+
+        Returns
+        -------
+        Response
+            - 200 OK: Lista de eventos arquivados, em ordem de arquivamento
+            - 400 Bad Request: Parâmetros ausentes ou inválidos
+        """
+        start_date = request.query_params.get("start_date")
+        end_date = request.query_params.get("end_date")
+
+        if not start_date or not end_date:
+            return Response(
+                {"detail": "Parâmetros start_date e end_date são obrigatórios"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start_date, end_date = parse_date_range(start_date, end_date)
+
+        except ValueError:
+            return Response(
+                {"detail": "Formato de data inválido. Use YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        mac_address = request.query_params.get("mac_address")
+
+        if mac_address:
+            try:
+                mac_address = format_mac(parse_mac(mac_address))
+
+            except ValueError:
+                return Response(
+                    {"detail": "MAC address inválido. Formato esperado XX:XX:XX:XX:XX:XX"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        try:
+            limit = int(request.query_params.get("limit", ARCHIVE_MAX_RESULTS))
+
+        except ValueError:
+            return Response(
+                {"detail": "Parâmetro limit deve ser um número inteiro"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        records = query_archive(
+            start_date,
+            end_date,
+            mac_address=mac_address,
+            detected_class=request.query_params.get("detected_class"),
+            limit=max(1, min(limit, ARCHIVE_MAX_RESULTS))
+        )
+
+        events = [
+            {
+                "mac": record["mac_address"],
+                "class_name": record["detected_class"],
+                "datetime": timezone.localtime(
+                    datetime.fromisoformat(record["detected_at"])
+                ).isoformat(),
+                "image": request.build_absolute_uri(
+                    reverse(
+                        "dashboard-archive-evidence",
+                        args=[record["archive"], record["evidence"]]
+                    )
+                ) if record["evidence"] else None,
+                "archive": record["archive"],
+            }
+            for record in records
+        ]
+
+        report_log(
+            user=request.user,
+            action="Consultar Arquivo de Eventos",
+            status="INFO",
+            message=f"{len(events)} eventos arquivados retornados"
+        )
+
+        return Response(
+            events,
+            status=status.HTTP_200_OK
+        )
+
+
+class ArchiveEvidenceView(APIView):
+    """
+    View responsável por servir as evidências do arquivo frio.
+
+    O acesso é restrito a usuários autenticados.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        responses={(200, "application/octet-stream"): OpenApiTypes.BINARY, 404: None},
+        description="Retorna o conteúdo de uma evidência arquivada."
+    )
+    def get(self, request: Request, archive_id: str, name: str) -> HttpResponse:
+        """
+        Retorna o conteúdo de uma evidência arquivada.
+
+        Returns
+        -------
+        HttpResponse
+            - 200 OK: Conteúdo da evidência
+            - 404 Not Found: Evidência inexistente no arquivo informado
+        """
+        content = read_evidence(archive_id, name)
+
+        if content is None:
+            return Response(
+                {"detail": "Evidência não encontrada no arquivo"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        content_type, _ = mimetypes.guess_type(name)
+
+        return HttpResponse(
+            content,
+            content_type=content_type or "application/octet-stream"
+        )
+
+
+class DerivativeView(APIView):
+    """
+    View responsável por servir os derivados (miniaturas e
+    pré-visualizações) das evidências.
+
+    Redireciona para o arquivo do derivado no storage; caso ainda não
+    tenha sido gerado, os derivados da evidência são gerados antes do
+    redirecionamento. Assim como as evidências (MEDIA_URL), o acesso
+    não exige autenticação, permitindo o uso direto em `<img src>`.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={302: None, 404: None},
+        description="Redireciona para o derivado da evidência, gerando-o se necessário."
+    )
+    def get(self, request: Request, size: str, name: str) -> HttpResponse:
+        """
+        Retorna o redirecionamento para o derivado de uma evidência.
+
+        Returns
+        -------
+        HttpResponse
+            - 302 Found: URL do derivado no storage
+            - 404 Not Found: Tamanho ou evidência inexistente
+        """
+        if size not in settings.MONITORING_EVIDENCE_DERIVATIVES or not is_evidence_name(name):
+            return Response(
+                {"detail": "Derivado não encontrado"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        storage = evidence_storage()
+        target = derivative_name(name, size)
+
+        if not storage.exists(target) and not ensure_derivatives(name):
+            return Response(
+                {"detail": "Evidência não encontrada"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return HttpResponseRedirect(storage.url(target))
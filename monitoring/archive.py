@@ -0,0 +1,364 @@
+"""
+Arquivo frio de eventos de monitoramento e evidências.
+
+Eventos mais antigos que o período de retenção são gravados em
+arquivos compactados fora do banco de dados e então removidos (ver
+comando `archive_events`), mantendo as tabelas de eventos pequenas.
+
+Layout do diretório de arquivo (MONITORING_ARCHIVE_DIR):
+    <id>/manifest.json           Blocos gravados e seus intervalos
+    <id>/events-00001.ndjson.gz  Eventos do bloco, um JSON por linha
+    <id>/evidence-00001.tar      Evidências referenciadas pelo bloco
+
+Cada execução do comando gera um diretório (`<id>`), com um bloco por
+lote de eventos. Os arquivos de um bloco são gravados de forma durável
+(fsync) e registrados no manifest antes da remoção dos eventos do
+banco de dados: uma falha durante a remoção apenas faz com que os
+eventos restantes sejam arquivados novamente na próxima execução
+(a consulta descarta eventos repetidos).
+
+As evidências são gravadas sem compressão adicional no tar (JPEG/PNG
+já são comprimidos), com o mesmo nome do storage, de modo que
+evidências idênticas do bloco ocupam uma única entrada. O manifest
+registra, para cada evidência, o tar, a posição e o tamanho do
+conteúdo (`evidence_index`), permitindo a leitura direta sem percorrer
+os arquivos tar.
+"""
+import gzip
+import json
+import os
+import re
+import tarfile
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import MonitoringEvent
+from .storage import evidence_storage
+
+
+MANIFEST = "manifest.json"
+ARCHIVE_ID_PATTERN = re.compile(r"^\d{8}T\d{6}Z-[0-9a-f]{6}$")
+
+
+def archive_root() -> Path:
+    """
+    Retorna (criando, se necessário) o diretório de arquivo.
+    """
+    path = Path(settings.MONITORING_ARCHIVE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _fsync(path: Path) -> None:
+    """
+    Garante a durabilidade de um arquivo já gravado.
+    """
+    with open(path, "rb") as handle:
+        os.fsync(handle.fileno())
+
+
+def serialize_event(event: MonitoringEvent) -> dict:
+    """
+    Converte um evento para o registro gravado no arquivo.
+
+    Parameters
+    ----------
+    event : MonitoringEvent
+        Evento com o dispositivo carregado (`select_related("device")`).
+
+    Returns
+    -------
+    dict
+        Registro serializável em JSON, com datas em UTC (ISO 8601).
+    """
+    return {
+        "id": event.pk,
+        "mac_address": event.mac_address,
+        "detected_class": event.detected_class,
+        "detected_at": event.detected_at.astimezone(timezone.utc).isoformat(),
+        "created_at": event.created_at.astimezone(timezone.utc).isoformat(),
+        "idempotency_key": event.idempotency_key,
+        "evidence": event.evidence.name or None,
+    }
+
+
+class ArchiveWriter:
+    """
+    Grava os blocos de eventos de uma execução do arquivamento.
+
+    Parameters
+    ----------
+    cutoff : datetime
+        Data/hora limite dos eventos arquivados, registrada no manifest.
+    """
+
+    def __init__(self, cutoff: datetime):
+        now = datetime.now(tz=timezone.utc)
+
+        self.archive_id = f"{now:%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}"
+        self.path = archive_root() / self.archive_id
+        self.path.mkdir()
+        self.storage = evidence_storage()
+        self.manifest = {
+            "id": self.archive_id,
+            "created_at": now.isoformat(),
+            "cutoff": cutoff.astimezone(timezone.utc).isoformat(),
+            "chunks": [],
+            "evidence_index": {},
+        }
+
+    def write_chunk(self, events: list[MonitoringEvent]) -> dict:
+        """
+        Grava um bloco de eventos e suas evidências.
+
+        Parameters
+        ----------
+        events : list[MonitoringEvent]
+            Eventos do bloco, em ordem de `detected_at`.
+
+        Returns
+        -------
+        dict
+            Entrada do bloco no manifest.
+        """
+        number = len(self.manifest["chunks"]) + 1
+        events_name = f"events-{number:05d}.ndjson.gz"
+        evidence_name = f"evidence-{number:05d}.tar"
+
+        records = [serialize_event(event) for event in events]
+
+        with gzip.open(self.path / events_name, "wt", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record, separators=(",", ":")))
+                handle.write("\n")
+
+        packed, missing = self._pack_evidence(evidence_name, records)
+
+        for name in (events_name, evidence_name):
+            _fsync(self.path / name)
+
+        chunk = {
+            "events": events_name,
+            "evidence": evidence_name,
+            "count": len(records),
+            "first_detected_at": records[0]["detected_at"],
+            "last_detected_at": records[-1]["detected_at"],
+            "evidence_files": packed,
+            "missing_evidence": missing,
+        }
+
+        self.manifest["chunks"].append(chunk)
+        self._write_manifest()
+
+        return chunk
+
+    def _pack_evidence(self, tar_name: str, records: list[dict]) -> tuple[int, int]:
+        """
+        Grava no tar as evidências (distintas) referenciadas pelo bloco,
+        registrando a posição de cada uma em `evidence_index`.
+
+        Returns
+        -------
+        tuple[int, int]
+            Quantidade de evidências gravadas e de evidências ausentes
+            no storage.
+        """
+        names = sorted({record["evidence"] for record in records if record["evidence"]})
+        packed = missing = 0
+
+        index = self.manifest["evidence_index"]
+
+        with tarfile.open(self.path / tar_name, "w") as tar:
+            for name in names:
+                try:
+                    source = self.storage.path(name)
+                    info = tar.gettarinfo(source, arcname=name)
+                except FileNotFoundError:
+                    missing += 1
+                    continue
+
+                # Posição do conteúdo: após o(s) cabeçalho(s) do membro
+                offset = tar.offset + len(info.tobuf(tar.format, tar.encoding, tar.errors))
+
+                with open(source, "rb") as handle:
+                    tar.addfile(info, handle)
+                packed += 1
+
+                index[name] = [tar_name, offset, info.size]
+
+        return packed, missing
+
+    def _write_manifest(self) -> None:
+        """
+        Substitui o manifest de forma atômica e durável.
+        """
+        tmp_path = self.path / f"{MANIFEST}.tmp"
+
+        with open(tmp_path, "w") as handle:
+            json.dump(self.manifest, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        os.replace(tmp_path, self.path / MANIFEST)
+
+
+def delete_events(ids: list[int], batch_size: int) -> int:
+    """
+    Remove os eventos arquivados em lotes pequenos.
+
+    Cada lote é removido em uma transação própria, limitando o tempo
+    em que os registros ficam bloqueados. A remoção pelo ORM libera as
+    referências às evidências (sinal post_delete) e desvincula os
+    incidentes que apontam para os eventos removidos.
+
+    Returns
+    -------
+    int
+        Quantidade de eventos removidos.
+    """
+    removed = 0
+
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            _, deleted = MonitoringEvent.objects.filter(
+                pk__in=ids[start:start + batch_size]
+            ).delete()
+
+        removed += deleted.get(MonitoringEvent._meta.label, 0)
+
+    return removed
+
+
+def load_manifests() -> list[dict]:
+    """
+    Lê os manifests do diretório de arquivo, em ordem de criação.
+    """
+    root = Path(settings.MONITORING_ARCHIVE_DIR)
+
+    if not root.is_dir():
+        return []
+
+    manifests = []
+    for path in sorted(root.iterdir()):
+        manifest_path = path / MANIFEST
+        if ARCHIVE_ID_PATTERN.match(path.name) and manifest_path.is_file():
+            with open(manifest_path) as handle:
+                manifests.append(json.load(handle))
+
+    return manifests
+
+
+def query_archive(
+    start: datetime,
+    end: datetime,
+    mac_address: str | None = None,
+    detected_class: str | None = None,
+    limit: int = 1000,
+):
+    """
+    Consulta os eventos arquivados em um intervalo de datas.
+
+    Apenas os blocos cujo intervalo de `detected_at` se sobrepõe ao
+    intervalo informado são lidos, em streaming.
+
+    Parameters
+    ----------
+    start, end : datetime
+        Intervalo de `detected_at` (inclusivo), com fuso horário.
+    mac_address : str | None
+        Filtra pelo MAC do dispositivo (XX:XX:XX:XX:XX:XX).
+    detected_class : str | None
+        Filtra pela classe detectada.
+    limit : int
+        Quantidade máxima de eventos retornados.
+
+    Yields
+    ------
+    dict
+        Registro do evento, acrescido do identificador do arquivo
+        (`archive`), em ordem de arquivamento.
+    """
+    seen = set()
+
+    for manifest in load_manifests():
+        for chunk in manifest["chunks"]:
+            first = datetime.fromisoformat(chunk["first_detected_at"])
+            last = datetime.fromisoformat(chunk["last_detected_at"])
+
+            if last < start or first > end:
+                continue
+
+            events_path = archive_root() / manifest["id"] / chunk["events"]
+            with gzip.open(events_path, "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    record = json.loads(line)
+
+                    if record["id"] in seen:
+                        continue
+                    if not start <= datetime.fromisoformat(record["detected_at"]) <= end:
+                        continue
+                    if mac_address and record["mac_address"] != mac_address:
+                        continue
+                    if detected_class and record["detected_class"] != detected_class:
+                        continue
+
+                    seen.add(record["id"])
+                    record["archive"] = manifest["id"]
+                    yield record
+
+                    if len(seen) >= limit:
+                        return
+
+
+def read_evidence(archive_id: str, name: str) -> bytes | None:
+    """
+    Lê uma evidência arquivada.
+
+    Parameters
+    ----------
+    archive_id : str
+        Identificador do arquivo (diretório da execução).
+    name : str
+        Nome da evidência no storage, conforme o registro do evento.
+
+    Returns
+    -------
+    bytes | None
+        Conteúdo da evidência, ou None caso não esteja no arquivo
+        informado.
+    """
+    if not ARCHIVE_ID_PATTERN.match(archive_id):
+        return None
+
+    path = Path(settings.MONITORING_ARCHIVE_DIR) / archive_id
+    manifest_path = path / MANIFEST
+    if not manifest_path.is_file():
+        return None
+
+    with open(manifest_path) as handle:
+        index = json.load(handle).get("evidence_index")
+
+    if index is not None:
+        if name not in index:
+            return None
+
+        tar_name, offset, size = index[name]
+        with open(path / tar_name, "rb") as handle:
+            handle.seek(offset)
+            return handle.read(size)
+
+    # Arquivos gravados antes do índice de evidências
+    for tar_path in sorted(path.glob("evidence-*.tar")):
+        with tarfile.open(tar_path, "r") as tar:
+            try:
+                info = tar.getmember(name)
+            except KeyError:
+                continue
+
+            return tar.extractfile(info).read()
+
+    return None
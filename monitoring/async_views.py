@@ -0,0 +1,241 @@
+"""
+Views assíncronas de ingestão de eventos de monitoramento.
+
+Equivalentes às views DRF de `monitoring.views`, executadas
+nativamente no event loop quando a aplicação é servida via ASGI
+(`project.asgi`). Sob ASGI, o corpo da requisição é recebido pelo
+event loop antes da view ser chamada, de modo que conexões lentas de
+dispositivos edge não ocupam uma thread enquanto enviam a evidência.
+
+Consultas simples utilizam o ORM assíncrono do Django. As etapas que
+dependem de APIs síncronas (parsing multipart com gravação da
+evidência em disco, validação da imagem e a transação de persistência)
+são delegadas a threads via `sync_to_async`.
+"""
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.http.multipartparser import MultiPartParserError
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from core.utils import areport_log
+from .authentication import DeviceUser, async_device_authenticated, foreign_devices
+from .idempotency import (
+    INVALID_IDEMPOTENCY_KEY,
+    ais_known_key,
+    find_duplicates,
+    is_valid_idempotency_key,
+    recorded_concurrently,
+    remember,
+)
+from .serializers import MonitoringEventSerializer
+from .spool import enqueue_event
+from .throttling import DeviceRateThrottle
+from .uploads import EvidenceUploadHandler, discard_uploads
+
+
+def _parse_multipart(request):
+    """
+    Processa o corpo multipart, gravando as evidências no storage final.
+
+    Returns
+    -------
+    QueryDict
+        Campos do formulário e arquivos recebidos, no formato
+        esperado pelo MonitoringEventSerializer.
+    """
+    request.upload_handlers = [EvidenceUploadHandler(request)]
+
+    data = request.POST.copy()
+    data.update(request.FILES)
+
+    return data
+
+
+def _duplicate_response() -> JsonResponse:
+    """
+    Resposta enviada a reenvios de eventos já registrados.
+    """
+    return JsonResponse({"detail": "Evento já registrado"}, status=200)
+
+
+def _throttled_response(throttle: DeviceRateThrottle) -> JsonResponse:
+    """
+    Resposta enviada quando o limite de taxa do dispositivo é excedido.
+    """
+    response = JsonResponse(
+        {"detail": "Limite de requisições do dispositivo excedido"},
+        status=429
+    )
+    response["Retry-After"] = str(math.ceil(throttle.wait()))
+    return response
+
+
+@csrf_exempt
+@require_POST
+@async_device_authenticated
+async def monitoring_create_async(request) -> JsonResponse:
+    """
+    Processa o registro de um evento de monitoramento.
+
+    Versão assíncrona de MonitoringCreateView.post, com o mesmo
+    contrato de requisição e de resposta.
+
+    Espera uma requisição multipart/form-data contendo:
+        - mac_address
+        - detected_class
+        - detected_at
+        - evidence (arquivo de imagem)
+
+    Cabeçalho opcional:
+        - Idempotency-Key (identificador único do evento no dispositivo)
+
+    Returns
+    -------
+    JsonResponse
+        - 200 OK: Evento já registrado anteriormente (reenvio)
+        - 201 Created: Evento registrado com sucesso
+        - 202 Accepted: Evento aceito para persistência assíncrona
+        - 400 Bad Request: Dados ou Idempotency-Key inválidos
+        - 401 Unauthorized: Usuário ou dispositivo não autenticado
+        - 403 Forbidden: Chave de dispositivo usada para outro MAC
+        - 429 Too Many Requests: Limite de taxa do dispositivo excedido
+        - 500 Internal Server Error: Erro inesperado
+    """
+    throttle = DeviceRateThrottle()
+    if not await sync_to_async(throttle.allow_request)(request, None):
+        return _throttled_response(throttle)
+
+    idempotency_key = request.headers.get("Idempotency-Key")
+
+    if idempotency_key and not is_valid_idempotency_key(idempotency_key):
+        return JsonResponse({"detail": INVALID_IDEMPOTENCY_KEY}, status=400)
+
+    # Reenvio identificado antes da leitura do corpo (apenas para
+    # dispositivos autenticados por chave; ver MonitoringCreateView)
+    if (
+        idempotency_key
+        and isinstance(request.user, DeviceUser)
+        and await ais_known_key(request.user.device.mac, idempotency_key)
+    ):
+        return _duplicate_response()
+
+    try:
+        data = await sync_to_async(_parse_multipart, thread_sensitive=False)(request)
+
+        serializer = MonitoringEventSerializer(data=data)
+        # A validação resolve o dispositivo (banco de dados na primeira
+        # ocorrência do MAC), por isso executa na thread das demais consultas
+        is_valid = await sync_to_async(serializer.is_valid)()
+
+        if not is_valid:
+            discard_uploads(request.FILES)
+            await areport_log(
+                user=request.user,
+                action="Criar Evento de Monitoramento",
+                status="WARNING",
+                message=f"Dados inválidos: {serializer.errors}"
+            )
+            return JsonResponse(serializer.errors, status=400)
+
+        if foreign_devices(request.user, [serializer.validated_data]):
+            discard_uploads(request.FILES)
+            return JsonResponse(
+                {"detail": "Chave não autorizada para o dispositivo informado"},
+                status=403
+            )
+
+        if idempotency_key:
+            serializer.validated_data["idempotency_key"] = idempotency_key
+
+        if await sync_to_async(find_duplicates)([serializer.validated_data]):
+            discard_uploads(request.FILES)
+            return _duplicate_response()
+
+        if not await sync_to_async(throttle.charge)(request, [serializer.validated_data]):
+            discard_uploads(request.FILES)
+            return _throttled_response(throttle)
+
+        if settings.MONITORING_ASYNC_INGESTION:
+            await sync_to_async(enqueue_event, thread_sensitive=False)(
+                serializer.validated_data
+            )
+
+            return JsonResponse(
+                {"detail": "Evento aceito para processamento"},
+                status=202
+            )
+
+        event = await sync_to_async(serializer.save)()
+        remember([serializer.validated_data])
+
+        if event.pk is None:
+            await areport_log(
+                user=request.user,
+                action="Criar Evento de Monitoramento",
+                status="SUCCESS",
+                message=(
+                    f"Evento agrupado no incidente {event.incident.pk} "
+                    f"para MAC {event.mac_address}"
+                )
+            )
+            return JsonResponse(
+                {
+                    "detail": "Evento agrupado em incidente existente",
+                    "incident": event.incident.pk,
+                },
+                status=201
+            )
+
+        await areport_log(
+            user=request.user,
+            action="Criar Evento de Monitoramento",
+            status="SUCCESS",
+            message=f"Evento registrado para MAC {event.mac_address}"
+        )
+        return JsonResponse(
+            {"detail": "Evento registrado com sucesso"},
+            status=201
+        )
+
+    except MultiPartParserError as exc:
+        discard_uploads(request.FILES)
+        return JsonResponse(
+            {"detail": f"Erro ao processar multipart - {str(exc)}"},
+            status=400
+        )
+
+    except IntegrityError as exc:
+        discard_uploads(request.FILES)
+
+        # Reenvio registrado concorrentemente; outras violações são erros
+        if await sync_to_async(recorded_concurrently)([serializer.validated_data]):
+            return _duplicate_response()
+
+        await areport_log(
+            user=request.user,
+            action="Criar Evento de Monitoramento",
+            status="ERROR",
+            message=f"Violação de integridade ao criar evento: {str(exc)}"
+        )
+        return JsonResponse(
+            {"detail": "Erro interno do servidor"},
+            status=500
+        )
+
+    except Exception as exc:
+        discard_uploads(request.FILES)
+        await areport_log(
+            user=request.user,
+            action="Criar Evento de Monitoramento",
+            status="ERROR",
+            message=f"Erro inesperado ao criar evento: {str(exc)}"
+        )
+        return JsonResponse(
+            {"detail": "Erro interno do servidor"},
+            status=500
+        )
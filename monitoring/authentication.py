@@ -0,0 +1,284 @@
+"""
+Autenticação de dispositivos edge por chave de API.
+
+Os dispositivos enviam `Authorization: Device <prefixo>.<segredo>`.
+Diferente do fluxo JWT dos usuários, não há login nem renovação de
+token: a chave é verificada (SHA-256 do segredo) e a credencial fica em
+cache no processo por MONITORING_DEVICE_KEY_CACHE_TTL segundos, de modo
+que as requisições seguintes não consultam o banco de dados.
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from core.authentication import async_authenticated
+from .models import Device, DeviceCredential
+
+
+KEYWORD = "Device"
+
+
+def hash_secret(secret: str) -> str:
+    """
+    Retorna o SHA-256 (hexadecimal) do segredo de uma chave.
+    """
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def generate_key() -> tuple[str, str, str]:
+    """
+    Gera uma nova chave de dispositivo.
+
+    Returns
+    -------
+    tuple[str, str, str]
+        Chave completa (entregue ao dispositivo), prefixo e hash do segredo.
+    """
+    prefix = secrets.token_hex(6)
+    secret = secrets.token_urlsafe(32)
+    return f"{prefix}.{secret}", prefix, hash_secret(secret)
+
+
+@dataclass(frozen=True)
+class DeviceUser:
+    """
+    Principal autenticado por chave de dispositivo.
+
+    Atribuído a `request.user` nas requisições de dispositivos; não é
+    um usuário do Django e não possui permissões administrativas.
+    """
+    device: Device
+    credential_id: int
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+    is_superuser = False
+    pk = None
+
+    def __str__(self) -> str:
+        return f"Dispositivo {self.device.mac_address}"
+
+
+class CredentialCache:
+    """
+    Cache, seguro para threads e com expiração, das chaves verificadas.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, prefix: str):
+        with self._lock:
+            entry = self._entries.get(prefix)
+
+            if entry is None:
+                return None
+
+            if entry[0] < time.monotonic():
+                del self._entries[prefix]
+                return None
+
+            return entry[1]
+
+    def add(self, credential: DeviceCredential) -> None:
+        expires_at = time.monotonic() + settings.MONITORING_DEVICE_KEY_CACHE_TTL
+        with self._lock:
+            self._entries[credential.prefix] = (expires_at, credential)
+
+    def discard(self, prefix: str) -> None:
+        """
+        Remove uma chave do cache (ex.: após revogação).
+        """
+        with self._lock:
+            self._entries.pop(prefix, None)
+
+
+credential_cache = CredentialCache()
+
+
+def _split_key(header: bytes) -> tuple[str, str] | None:
+    """
+    Extrai prefixo e segredo do cabeçalho Authorization.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        Prefixo e segredo, ou None caso o cabeçalho não utilize o
+        esquema `Device`.
+
+    Raises
+    ------
+    AuthenticationFailed
+        Caso o esquema seja `Device` mas a chave esteja malformada.
+    """
+    parts = header.split()
+
+    if not parts or parts[0].decode("latin-1") != KEYWORD:
+        return None
+
+    if len(parts) != 2:
+        raise exceptions.AuthenticationFailed("Chave de dispositivo malformada")
+
+    prefix, _, secret = parts[1].decode("latin-1").partition(".")
+    if not prefix or not secret:
+        raise exceptions.AuthenticationFailed("Chave de dispositivo malformada")
+
+    return prefix, secret
+
+
+def _lookup_credential(prefix: str) -> DeviceCredential | None:
+    """
+    Busca uma credencial ativa pelo prefixo, consultando o cache antes
+    do banco de dados.
+    """
+    credential = credential_cache.get(prefix)
+    if credential is not None:
+        return credential
+
+    credential = (
+        DeviceCredential.objects
+        .select_related("device")
+        .filter(prefix=prefix, revoked_at__isnull=True)
+        .first()
+    )
+
+    if credential is not None:
+        credential_cache.add(credential)
+
+    return credential
+
+
+def _verify(credential: DeviceCredential | None, secret: str) -> DeviceUser:
+    """
+    Confere o segredo informado com o hash da credencial.
+    """
+    if credential is None or not hmac.compare_digest(credential.key_hash, hash_secret(secret)):
+        raise exceptions.AuthenticationFailed("Chave de dispositivo inválida ou revogada")
+
+    return DeviceUser(device=credential.device, credential_id=credential.pk)
+
+
+class DeviceKeyAuthentication(BaseAuthentication):
+    """
+    Autenticação DRF por chave de API de dispositivo.
+
+    Requisições sem o esquema `Device` no cabeçalho Authorization são
+    ignoradas, permitindo combinar esta classe com JWTAuthentication.
+    """
+
+    def authenticate(self, request):
+        key = _split_key(get_authorization_header(request))
+
+        if key is None:
+            return None
+
+        prefix, secret = key
+        return _verify(_lookup_credential(prefix), secret), None
+
+    def authenticate_header(self, request) -> str:
+        return KEYWORD
+
+
+async def aauthenticate_device(request) -> DeviceUser | None:
+    """
+    Versão assíncrona de DeviceKeyAuthentication, para views assíncronas.
+
+    O banco de dados só é consultado (em thread) quando a chave não
+    está no cache.
+
+    Returns
+    -------
+    DeviceUser | None
+        Dispositivo autenticado, ou None caso a requisição não utilize
+        o esquema `Device`.
+
+    Raises
+    ------
+    AuthenticationFailed
+        Caso a chave seja inválida ou esteja revogada.
+    """
+    key = _split_key(get_authorization_header(request))
+
+    if key is None:
+        return None
+
+    prefix, secret = key
+
+    credential = credential_cache.get(prefix)
+    if credential is None:
+        credential = await sync_to_async(_lookup_credential)(prefix)
+
+    return _verify(credential, secret)
+
+
+def foreign_devices(user, items: list[dict]) -> list[int]:
+    """
+    Identifica itens enviados em nome de outro dispositivo.
+
+    Um dispositivo autenticado por chave só pode registrar eventos do
+    próprio MAC; usuários (JWT) podem registrar eventos de qualquer
+    dispositivo.
+
+    Parameters
+    ----------
+    user
+        Usuário ou dispositivo autenticado na requisição.
+    items : list[dict]
+        Dados validados dos eventos.
+
+    Returns
+    -------
+    list[int]
+        Índices dos itens de outros dispositivos.
+    """
+    if not isinstance(user, DeviceUser):
+        return []
+
+    return [
+        index for index, item in enumerate(items)
+        if item["device"].mac != user.device.mac
+    ]
+
+
+def async_device_authenticated(view):
+    """
+    Decorator de views assíncronas que aceita chave de dispositivo ou JWT.
+
+    Requisições com o esquema `Device` são autenticadas pela chave do
+    dispositivo; as demais seguem para `core.authentication.async_authenticated`.
+
+    Returns
+    -------
+    Callable
+        View assíncrona que responde 401 Unauthorized quando a
+        requisição não estiver autenticada.
+    """
+    jwt_view = async_authenticated(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            device = await aauthenticate_device(request)
+        except exceptions.AuthenticationFailed as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=401)
+
+        if device is None:
+            return await jwt_view(request, *args, **kwargs)
+
+        request.user = device
+        return await view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,194 @@
+"""
+Protocolo binário compacto para ingestão de eventos.
+
+Alternativa ao multipart/form-data para links de borda restritos.
+O corpo da requisição é uma sequência de um ou mais frames, cada um
+composto por um cabeçalho de tamanho fixo seguido dos bytes da imagem:
+
+    Offset  Tamanho  Campo
+    0       6        MAC do dispositivo (bytes brutos)
+    6       2        Identificador da classe (uint16)
+    8       8        Data/hora da detecção, epoch em milissegundos (uint64)
+    16      4        Tamanho da imagem em bytes (uint32)
+    20      N        Imagem de evidência
+
+Todos os inteiros são big-endian. O identificador da classe é o índice
+da classe em MONITORING_DETECTION_CLASSES. O corpo é limitado a
+MONITORING_BINARY_MAX_BODY_SIZE bytes e a MONITORING_BATCH_MAX_SIZE frames.
+
+A validação dos frames não utiliza serializers do DRF, reduzindo o
+custo de CPU por evento.
+"""
+import io
+import struct
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from core.metrics import EVIDENCE_BYTES
+from .devices import lookup_device
+from .serializers import MAX_CLOCK_SKEW
+from .uploads import SIGNATURE_LENGTH, image_extension
+
+
+MEDIA_TYPE = "application/vnd.edge-monitor.events"
+
+FRAME_HEADER = struct.Struct(">6sHQI")
+
+
+class FrameValidationError(ValueError):
+    """
+    Erro de validação de um frame do protocolo binário.
+    """
+
+
+@dataclass(frozen=True)
+class EventFrame:
+    """
+    Frame decodificado do protocolo binário, ainda não validado.
+    """
+    mac: bytes
+    class_id: int
+    timestamp_ms: int
+    image: bytes
+
+
+class BinaryEventParser(BaseParser):
+    """
+    Parser do protocolo binário de eventos.
+
+    Decodifica o corpo da requisição em uma lista de EventFrame,
+    verificando apenas a estrutura dos frames (cabeçalho, tamanho da
+    imagem e limites de lote). A validação do conteúdo é feita por
+    `validate_frame`.
+    """
+
+    media_type = MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None) -> list[EventFrame]:
+        """
+        Decodifica os frames presentes no corpo da requisição.
+
+        Returns
+        -------
+        list[EventFrame]
+            Frames decodificados, na ordem recebida.
+
+        Raises
+        ------
+        ParseError
+            Caso o corpo esteja vazio, truncado ou exceda os limites.
+        """
+        if stream is None:
+            raise ParseError("Corpo da requisição vazio")
+
+        max_body_size = settings.MONITORING_BINARY_MAX_BODY_SIZE
+        request = (parser_context or {}).get("request")
+
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0) if request else 0
+        except ValueError:
+            content_length = 0
+
+        if content_length > max_body_size:
+            raise ParseError("Corpo da requisição excede o tamanho máximo permitido")
+
+        frames = []
+        body_size = 0
+        while True:
+            header = stream.read(FRAME_HEADER.size)
+
+            if not header:
+                break
+
+            # Frames além do limite são rejeitados antes da leitura da imagem
+            if len(frames) >= settings.MONITORING_BATCH_MAX_SIZE:
+                raise ParseError(
+                    "Lote excede o limite de "
+                    f"{settings.MONITORING_BATCH_MAX_SIZE} eventos"
+                )
+
+            if len(header) != FRAME_HEADER.size:
+                raise ParseError(f"Cabeçalho do frame {len(frames)} truncado")
+
+            mac, class_id, timestamp_ms, image_length = FRAME_HEADER.unpack(header)
+
+            if image_length > settings.MONITORING_EVIDENCE_MAX_SIZE:
+                raise ParseError(
+                    f"Evidência do frame {len(frames)} excede o tamanho máximo permitido"
+                )
+
+            body_size += FRAME_HEADER.size + image_length
+            if body_size > max_body_size:
+                raise ParseError("Corpo da requisição excede o tamanho máximo permitido")
+
+            image = stream.read(image_length)
+            if len(image) != image_length:
+                raise ParseError(f"Evidência do frame {len(frames)} truncada")
+
+            frames.append(EventFrame(mac, class_id, timestamp_ms, image))
+            EVIDENCE_BYTES.inc(image_length)
+
+        if not frames:
+            raise ParseError("Nenhum frame recebido")
+
+        return frames
+
+
+def validate_frame(frame: EventFrame) -> dict:
+    """
+    Valida um frame e o converte nos dados de um evento de monitoramento.
+
+    Parameters
+    ----------
+    frame : EventFrame
+        Frame decodificado pelo BinaryEventParser.
+
+    Returns
+    -------
+    dict
+        Dados do evento (device, detected_class, detected_at, evidence),
+        no mesmo formato dos dados validados pelo MonitoringEventSerializer.
+
+    Raises
+    ------
+    FrameValidationError
+        Caso a classe, a data/hora ou a imagem sejam inválidas.
+    """
+    classes = settings.MONITORING_DETECTION_CLASSES
+
+    if frame.class_id >= len(classes):
+        raise FrameValidationError(f"Classe {frame.class_id} desconhecida")
+
+    try:
+        detected_at = datetime.fromtimestamp(frame.timestamp_ms / 1000, tz=timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        raise FrameValidationError("Data/hora da detecção inválida")
+
+    if detected_at > datetime.now(tz=timezone.utc) + MAX_CLOCK_SKEW:
+        raise FrameValidationError("Data/hora da detecção no futuro")
+
+    extension = image_extension(frame.image[:SIGNATURE_LENGTH])
+    if extension is None:
+        raise FrameValidationError("Evidência não é uma imagem válida")
+
+    # Mesma verificação do ImageField no envio multipart: a assinatura
+    # não garante que o restante do arquivo seja uma imagem decodificável
+    try:
+        with Image.open(io.BytesIO(frame.image)) as image:
+            image.verify()
+    except Exception:
+        raise FrameValidationError("Evidência não é uma imagem válida")
+
+    return {
+        "device": lookup_device(int.from_bytes(frame.mac, "big")),
+        "detected_class": classes[frame.class_id],
+        "detected_at": detected_at,
+        "evidence": ContentFile(frame.image, name=f"{uuid.uuid4().hex}{extension}"),
+    }
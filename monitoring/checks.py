@@ -0,0 +1,29 @@
+"""
+Verificações de configuração do app de monitoramento
+(`python manage.py check`).
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_detection_classes(app_configs, **kwargs) -> list:
+    """
+    Alerta quando o protocolo binário de ingestão não possui classes
+    de detecção configuradas.
+    """
+    if settings.MONITORING_DETECTION_CLASSES:
+        return []
+
+    return [
+        Warning(
+            "MONITORING_DETECTION_CLASSES está vazio: o endpoint binário de "
+            "ingestão (/api/monitoring/binary/) rejeitará todas as requisições.",
+            hint=(
+                "Defina MONITORING_DETECTION_CLASSES com as classes na ordem "
+                "dos identificadores enviados pelos dispositivos "
+                "(ex.: person,vehicle)."
+            ),
+            id="monitoring.W001",
+        )
+    ]
@@ -0,0 +1,182 @@
+"""
+Agrupamento (coalescing) de detecções em incidentes.
+
+Uma pessoa parada em frente a uma câmera gera um evento por frame
+analisado, transformando um único incidente real em milhares de
+registros. Quando MONITORING_COALESCE_WINDOW é maior que zero, os
+eventos de um mesmo dispositivo e classe ocorridos dentro da janela
+são agrupados em um único Incident: apenas o primeiro evento é
+persistido, e os demais atualizam a contagem e o intervalo do incidente.
+
+A consulta do incidente aberto e a criação de um novo não podem ser
+intercaladas entre ingestões concorrentes do mesmo dispositivo e
+classe: sem incidente aberto, não há linha a bloquear, e ambas criariam
+incidentes paralelos. Por isso, cada par (dispositivo, classe) é
+serializado antes da consulta: no PostgreSQL, por um advisory lock da
+transação; nos demais bancos, pelo bloqueio da linha do dispositivo
+(no SQLite, as transações de escrita já são serializadas pelo banco).
+"""
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Device, Incident, MonitoringEvent
+
+
+def class_lock_id(detected_class: str) -> int:
+    """
+    Identificador (int4) da classe no advisory lock de agrupamento.
+
+    Colisões entre classes apenas serializam ingestões que poderiam
+    ocorrer em paralelo.
+    """
+    checksum = zlib.crc32(detected_class.encode())
+    return checksum - 2 ** 32 if checksum >= 2 ** 31 else checksum
+
+
+class IncidentCoalescer:
+    """
+    Agrupa um conjunto de eventos em incidentes.
+
+    Deve ser utilizado dentro da transação de persistência: cada par
+    (dispositivo, classe) dos eventos é serializado até o commit (ver
+    `_lock`), evitando que ingestões concorrentes criem incidentes
+    paralelos.
+
+    Uso:
+        coalescer = IncidentCoalescer()
+        to_insert = coalescer.split(events)
+        inserted = MonitoringEvent.objects.bulk_create(to_insert)
+        coalescer.commit()
+    """
+
+    def __init__(self):
+        self.window = timedelta(seconds=settings.MONITORING_COALESCE_WINDOW)
+        self.open = {}
+        self.created = []
+        self.updated = {}
+
+    def split(self, events: list[MonitoringEvent]) -> list[MonitoringEvent]:
+        """
+        Separa os eventos que devem ser persistidos dos agrupados.
+
+        Eventos agrupados em um incidente existente recebem o atributo
+        `incident`, referenciando o incidente correspondente, e não
+        devem ser persistidos.
+
+        Parameters
+        ----------
+        events : list[MonitoringEvent]
+            Eventos ainda não persistidos.
+
+        Returns
+        -------
+        list[MonitoringEvent]
+            Eventos que iniciam um novo incidente e devem ser persistidos.
+        """
+        to_insert = []
+
+        self._lock({(event.device_id, event.detected_class) for event in events})
+
+        for event in sorted(events, key=lambda event: event.detected_at):
+            incident = self._open_incident(event)
+
+            if incident is not None and self._within_window(incident, event):
+                incident.event_count += 1
+                incident.first_detected_at = min(incident.first_detected_at, event.detected_at)
+                incident.last_detected_at = max(incident.last_detected_at, event.detected_at)
+
+                if incident.pk is not None:
+                    self.updated[incident.pk] = incident
+
+                event.incident = incident
+                continue
+
+            incident = Incident(
+                device=event.device,
+                detected_class=event.detected_class,
+                first_detected_at=event.detected_at,
+                last_detected_at=event.detected_at,
+                event_count=1,
+            )
+            incident.pending_representative = event
+            event.incident = incident
+
+            self.open[(event.device_id, event.detected_class)] = incident
+            self.created.append(incident)
+            to_insert.append(event)
+
+        return to_insert
+
+    def commit(self) -> None:
+        """
+        Persiste os incidentes criados e atualizados.
+
+        Deve ser chamado após a persistência dos eventos retornados
+        por `split`, para que os incidentes novos referenciem seus
+        eventos representativos.
+        """
+        for incident in self.created:
+            incident.representative = incident.pending_representative
+
+        Incident.objects.bulk_create(self.created)
+        Incident.objects.bulk_update(
+            list(self.updated.values()),
+            ["event_count", "first_detected_at", "last_detected_at"]
+        )
+
+    def _lock(self, keys: set[tuple[int, str]]) -> None:
+        """
+        Serializa as ingestões dos pares (dispositivo, classe) até o
+        fim da transação.
+
+        Os bloqueios são obtidos em ordem, evitando deadlocks entre
+        lotes com vários dispositivos e classes.
+        """
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for device_id, detected_class in sorted(keys):
+                    cursor.execute(
+                        "SELECT pg_advisory_xact_lock(%s, %s)",
+                        [device_id, class_lock_id(detected_class)]
+                    )
+            return
+
+        list(
+            Device.objects
+            .select_for_update()
+            .filter(pk__in={device_id for device_id, _ in keys})
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def _open_incident(self, event: MonitoringEvent) -> Incident | None:
+        """
+        Retorna o incidente aberto do dispositivo e classe do evento.
+        """
+        key = (event.device_id, event.detected_class)
+
+        if key not in self.open:
+            self.open[key] = (
+                Incident.objects
+                .filter(
+                    device_id=event.device_id,
+                    detected_class=event.detected_class,
+                    last_detected_at__gte=event.detected_at - self.window,
+                )
+                .order_by("-last_detected_at")
+                .first()
+            )
+
+        return self.open[key]
+
+    def _within_window(self, incident: Incident, event: MonitoringEvent) -> bool:
+        """
+        Indica se o evento ocorreu dentro da janela do incidente.
+        """
+        return (
+            event.detected_at - incident.last_detected_at <= self.window
+            and incident.first_detected_at - event.detected_at <= self.window
+        )
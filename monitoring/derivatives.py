@@ -0,0 +1,246 @@
+"""
+Geração de derivados (miniaturas e pré-visualizações) das evidências.
+
+O dashboard exibe centenas de eventos por página; carregar a imagem
+original de cada um implica baixar centenas de frames completos de
+câmera. Este módulo gera versões reduzidas de cada evidência, em um
+pool de processos, para que o frontend carregue apenas o tamanho
+necessário.
+
+Os derivados são gravados em `monitoring/derivatives/<tamanho>/`,
+espelhando o nome da evidência de origem. Como as evidências são
+endereçadas por conteúdo, cada imagem distinta gera seus derivados
+uma única vez.
+
+Derivados ausentes (geração na ingestão desabilitada, falha no pool ou
+eventos anteriores) são gerados sob demanda por `ensure_derivatives`,
+utilizada pelo endpoint de derivados do dashboard.
+"""
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from PIL import Image
+
+from .storage import EVIDENCE_DIR, evidence_storage
+
+
+DERIVATIVES_DIR = "monitoring/derivatives"
+EVIDENCE_PREFIX = f"{EVIDENCE_DIR}/"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def derivative_name(evidence_name: str, size: str) -> str:
+    """
+    Retorna o nome do derivado de uma evidência no storage.
+
+    Parameters
+    ----------
+    evidence_name : str
+        Nome da evidência de origem no storage.
+    size : str
+        Nome do tamanho configurado em MONITORING_EVIDENCE_DERIVATIVES.
+
+    Returns
+    -------
+    str
+        Nome relativo do derivado (sempre JPEG).
+    """
+    if (
+        evidence_name.startswith(EVIDENCE_PREFIX)
+        and "//" not in evidence_name
+        and "/." not in evidence_name
+    ):
+        # Nome já normalizado (caso comum, chamado por evento na
+        # serialização do dashboard): evita o custo de os.path.relpath
+        relative = evidence_name[len(EVIDENCE_PREFIX):]
+    else:
+        relative = os.path.relpath(evidence_name, EVIDENCE_DIR).replace(os.sep, "/")
+    stem = os.path.splitext(relative)[0]
+    return f"{DERIVATIVES_DIR}/{size}/{stem}.jpg"
+
+
+def derivative_targets(evidence_name: str) -> list[tuple[str, int]]:
+    """
+    Retorna os caminhos absolutos e dimensões de todos os derivados.
+
+    Parameters
+    ----------
+    evidence_name : str
+        Nome da evidência de origem no storage.
+
+    Returns
+    -------
+    list[tuple[str, int]]
+        Pares (caminho absoluto, maior lado em pixels).
+    """
+    storage = evidence_storage()
+    return [
+        (storage.path(derivative_name(evidence_name, size)), max_side)
+        for size, max_side in settings.MONITORING_EVIDENCE_DERIVATIVES.items()
+    ]
+
+
+def render_derivatives(source_path: str, targets: list[tuple[str, int]]) -> int:
+    """
+    Gera os derivados de uma imagem de evidência.
+
+    Executada nos processos do pool: depende apenas do Pillow e de
+    caminhos absolutos, sem acesso ao banco de dados.
+
+    Parameters
+    ----------
+    source_path : str
+        Caminho absoluto da evidência de origem.
+    targets : list[tuple[str, int]]
+        Pares (caminho absoluto do derivado, maior lado em pixels).
+
+    Returns
+    -------
+    int
+        Quantidade de derivados gerados.
+    """
+    pending = [
+        (path, max_side) for path, max_side in targets
+        if not os.path.exists(path)
+    ]
+
+    if not pending:
+        return 0
+
+    # Gera do maior para o menor, reaproveitando a imagem já reduzida
+    pending.sort(key=lambda target: target[1], reverse=True)
+
+    with Image.open(source_path) as image:
+        largest = pending[0][1]
+
+        # Para JPEG, decodifica diretamente em resolução reduzida
+        image.draft("RGB", (largest, largest))
+        image = image.convert("RGB")
+
+        for path, max_side in pending:
+            image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+            image.save(tmp_path, "JPEG", quality=80, optimize=True)
+            os.replace(tmp_path, path)
+
+    return len(pending)
+
+
+def is_evidence_name(name: str) -> bool:
+    """
+    Verifica se o nome é um caminho normalizado no diretório de evidências.
+
+    Parameters
+    ----------
+    name : str
+        Nome recebido (ex.: na URL do endpoint de derivados).
+
+    Returns
+    -------
+    bool
+        True caso o nome esteja contido em EVIDENCE_DIR.
+    """
+    normalized = os.path.normpath(name).replace(os.sep, "/")
+    return normalized == name and name.startswith(EVIDENCE_PREFIX)
+
+
+def ensure_derivatives(evidence_name: str) -> bool:
+    """
+    Gera, no processo corrente, os derivados ausentes de uma evidência.
+
+    Parameters
+    ----------
+    evidence_name : str
+        Nome da evidência de origem no storage.
+
+    Returns
+    -------
+    bool
+        True caso os derivados existam (ou tenham sido gerados), ou
+        False caso o nome não corresponda a uma evidência existente.
+    """
+    if not is_evidence_name(evidence_name):
+        return False
+
+    storage = evidence_storage()
+
+    if not storage.exists(evidence_name):
+        return False
+
+    render_derivatives(storage.path(evidence_name), derivative_targets(evidence_name))
+    return True
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos compartilhado para geração de derivados.
+
+    O pool é criado sob demanda, com contexto `spawn` para não herdar
+    threads e conexões do processo do servidor.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.MONITORING_DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    return _executor
+
+
+def schedule_derivatives(evidence_names) -> None:
+    """
+    Agenda a geração dos derivados das evidências informadas.
+
+    A geração ocorre em segundo plano no pool de processos; falhas
+    não afetam a ingestão e são registradas em log. Derivados ausentes
+    são gerados sob demanda (`ensure_derivatives`) ou pelo comando
+    `generate_derivatives`.
+
+    Parameters
+    ----------
+    evidence_names : Iterable[str]
+        Nomes das evidências no storage.
+    """
+    executor = get_executor()
+    storage = evidence_storage()
+
+    for name in set(evidence_names):
+        future = executor.submit(render_derivatives, storage.path(name), derivative_targets(name))
+        future.add_done_callback(lambda future, name=name: _report_failure(future, name))
+
+
+def _report_failure(future, evidence_name: str) -> None:
+    """
+    Registra em log a falha da geração dos derivados de uma evidência.
+
+    Executada na thread de gerenciamento do pool, ao término da tarefa.
+    """
+    if future.cancelled() or future.exception() is None:
+        return
+
+    # Importado aqui: os processos do pool importam este módulo sem
+    # inicializar o Django (core.utils depende dos models)
+    from core.utils import report_log
+
+    try:
+        report_log(
+            user=None,
+            action="Gerar Derivados de Evidência",
+            status="ERROR",
+            message=f"Erro ao gerar derivados de {evidence_name}: {future.exception()}"
+        )
+    finally:
+        # Conexão aberta pelo log nesta thread
+        connections.close_all()
@@ -0,0 +1,165 @@
+"""
+Registro de dispositivos edge.
+
+Cada evento referencia seu dispositivo por chave estrangeira. Como a
+ingestão recebe o MAC em todos os eventos, a resolução MAC -> Device
+é mantida em um cache LRU em memória por processo: após o primeiro
+evento de um dispositivo, os seguintes não consultam o banco de dados.
+Alterações do dispositivo (ex.: limite de taxa) removem a entrada do
+cache do processo que as grava; nos demais, valem ao expirar a entrada
+(MONITORING_DEVICE_CACHE_TTL).
+
+Dispositivos desconhecidos são registrados automaticamente, mas apenas
+na transação que persiste seus eventos (`register_devices`, chamada
+por `persist_events`): durante a validação, `lookup_device` não grava
+no banco de dados, de modo que requisições rejeitadas (400/403) não
+registram dispositivos.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .models import Device
+
+
+class DeviceCache:
+    """
+    Cache LRU, seguro para threads e com expiração, dos dispositivos já
+    resolvidos por MAC.
+
+    Parameters
+    ----------
+    maxsize : int
+        Quantidade máxima de dispositivos mantidos em memória.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._devices = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, mac: int) -> Device | None:
+        with self._lock:
+            entry = self._devices.get(mac)
+
+            if entry is None:
+                return None
+
+            if entry[0] < time.monotonic():
+                del self._devices[mac]
+                return None
+
+            self._devices.move_to_end(mac)
+            return entry[1]
+
+    def add(self, device: Device) -> None:
+        """
+        Registra um dispositivo, descartando os menos recentes se necessário.
+        """
+        expires_at = time.monotonic() + settings.MONITORING_DEVICE_CACHE_TTL
+        with self._lock:
+            self._devices[device.mac] = (expires_at, device)
+            self._devices.move_to_end(device.mac)
+
+            while len(self._devices) > self.maxsize:
+                self._devices.popitem(last=False)
+
+    def discard(self, mac: int) -> None:
+        """
+        Remove um dispositivo do cache (ex.: após alteração ou exclusão).
+        """
+        with self._lock:
+            self._devices.pop(mac, None)
+
+
+device_cache = DeviceCache(settings.MONITORING_DEVICE_CACHE_SIZE)
+
+
+def lookup_device(mac: int) -> Device:
+    """
+    Retorna o dispositivo do MAC informado, sem registrá-lo.
+
+    Utilizada na validação dos eventos: para um MAC ainda não
+    registrado, retorna uma instância não persistida (sem `pk`), que é
+    registrada por `register_devices` na transação de persistência.
+
+    Parameters
+    ----------
+    mac : int
+        Endereço MAC como inteiro de 48 bits.
+
+    Returns
+    -------
+    Device
+        Dispositivo correspondente ao MAC, possivelmente não persistido.
+    """
+    device = device_cache.get(mac)
+    if device is not None:
+        return device
+
+    device = Device.objects.filter(mac=mac).first()
+    if device is None:
+        return Device(mac=mac)
+
+    device_cache.add(device)
+    return device
+
+
+def resolve_device(mac: int) -> Device:
+    """
+    Retorna o dispositivo do MAC informado, registrando-o se necessário.
+
+    Dentro de uma transação, o dispositivo só é adicionado ao cache
+    após o commit, evitando que o cache referencie um registro
+    desfeito por rollback.
+
+    Parameters
+    ----------
+    mac : int
+        Endereço MAC como inteiro de 48 bits.
+
+    Returns
+    -------
+    Device
+        Dispositivo correspondente ao MAC.
+    """
+    device = device_cache.get(mac)
+    if device is not None:
+        return device
+
+    try:
+        with transaction.atomic():
+            device, _ = Device.objects.get_or_create(mac=mac)
+
+    except IntegrityError:
+        # Dispositivo registrado por uma requisição concorrente
+        device = Device.objects.get(mac=mac)
+
+    transaction.on_commit(lambda: device_cache.add(device))
+    return device
+
+
+def register_devices(events) -> None:
+    """
+    Registra os dispositivos ainda não persistidos dos eventos.
+
+    Deve ser executada na transação que persiste os eventos.
+
+    Parameters
+    ----------
+    events : Iterable[MonitoringEvent]
+        Eventos com o dispositivo obtido por `lookup_device`.
+    """
+    resolved = {}
+
+    for event in events:
+        if event.device.pk is None:
+            mac = event.device.mac
+
+            if mac not in resolved:
+                resolved[mac] = resolve_device(mac)
+
+            event.device = resolved[mac]
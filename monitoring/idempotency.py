@@ -0,0 +1,277 @@
+"""
+Detecção de eventos duplicados na ingestão.
+
+Quando um dispositivo edge sofre timeout, ele reenvia o mesmo evento.
+Este módulo identifica esses reenvios de duas formas:
+
+- Pelo cabeçalho `Idempotency-Key` (ou campo `idempotency_key` nos
+  itens de um lote), único por dispositivo (constraint
+  (device, idempotency_key) do evento);
+- Pela chave natural (dispositivo, detected_class, detected_at),
+  quando MONITORING_IDEMPOTENCY_NATURAL_KEY estiver habilitado.
+
+As chaves recentes ficam em um cache LRU em memória, que responde à
+maioria dos reenvios sem consulta ao banco de dados; as demais são
+verificadas por consultas indexadas.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import MonitoringEvent
+
+
+# Tamanho máximo da chave de idempotência (campo do evento)
+IDEMPOTENCY_KEY_MAX_LENGTH = MonitoringEvent._meta.get_field("idempotency_key").max_length
+
+INVALID_IDEMPOTENCY_KEY = (
+    f"Idempotency-Key inválida: informe até {IDEMPOTENCY_KEY_MAX_LENGTH} "
+    "caracteres ASCII imprimíveis"
+)
+
+
+class RecentKeys:
+    """
+    Cache LRU, seguro para threads, das chaves de eventos já persistidos.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            if key not in self._keys:
+                return False
+            self._keys.move_to_end(key)
+            return True
+
+    def add(self, key) -> None:
+        """
+        Registra uma chave, descartando as menos recentes se necessário.
+        """
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+
+recent_keys = RecentKeys(settings.MONITORING_IDEMPOTENCY_CACHE_SIZE)
+
+
+def is_valid_idempotency_key(value: str) -> bool:
+    """
+    Verifica se a chave de idempotência pode ser registrada no evento.
+
+    Parameters
+    ----------
+    value : str
+        Cabeçalho Idempotency-Key ou campo `idempotency_key` de um item.
+
+    Returns
+    -------
+    bool
+        True caso a chave tenha até o tamanho do campo
+        `MonitoringEvent.idempotency_key` e apenas caracteres ASCII
+        imprimíveis.
+    """
+    return (
+        len(value) <= IDEMPOTENCY_KEY_MAX_LENGTH
+        and value.isascii()
+        and value.isprintable()
+    )
+
+
+def natural_key(item: dict) -> tuple:
+    """
+    Retorna a chave natural de um evento validado.
+    """
+    return ("natural", item["device"].mac, item["detected_class"], item["detected_at"])
+
+
+def _cache_key(item: dict) -> tuple | None:
+    """
+    Retorna a chave de cache do item, ou None caso não seja deduplicável.
+    """
+    if item.get("idempotency_key"):
+        return ("key", item["device"].mac, item["idempotency_key"])
+
+    if settings.MONITORING_IDEMPOTENCY_NATURAL_KEY:
+        return natural_key(item)
+
+    return None
+
+
+def is_known_key(mac: int, idempotency_key: str) -> bool:
+    """
+    Verifica se o dispositivo já registrou evento com a chave de idempotência.
+
+    Utilizada antes do processamento do corpo da requisição, quando o
+    dispositivo é conhecido pela autenticação, evitando que a evidência
+    de um reenvio seja lida e gravada.
+
+    Parameters
+    ----------
+    mac : int
+        MAC do dispositivo autenticado.
+    idempotency_key : str
+        Valor do cabeçalho Idempotency-Key.
+
+    Returns
+    -------
+    bool
+        True caso o evento já tenha sido registrado.
+    """
+    key = ("key", mac, idempotency_key)
+
+    if key in recent_keys:
+        return True
+
+    if MonitoringEvent.objects.filter(device__mac=mac, idempotency_key=idempotency_key).exists():
+        recent_keys.add(key)
+        return True
+
+    return False
+
+
+def find_duplicates(items: list[dict]) -> set[int]:
+    """
+    Identifica os itens validados que correspondem a eventos já registrados.
+
+    Itens repetidos dentro da própria lista também são considerados
+    duplicados (a partir da segunda ocorrência).
+
+    Parameters
+    ----------
+    items : list[dict]
+        Dados validados pelo MonitoringEventSerializer.
+
+    Returns
+    -------
+    set[int]
+        Índices dos itens duplicados.
+    """
+    keys = [_cache_key(item) for item in items]
+
+    # Apenas chaves ausentes do cache são consultadas no banco de dados
+    cached = {key for key in keys if key is not None and key in recent_keys}
+    pending = [key for key in keys if key is not None and key not in cached]
+
+    idempotency_keys = [key for key in pending if key[0] == "key"]
+    natural_keys = [key for key in pending if key[0] == "natural"]
+
+    known = set(cached)
+
+    if idempotency_keys:
+        # Consulta pela constraint (device, idempotency_key); os pares
+        # são comparados em memória
+        rows = MonitoringEvent.objects.filter(
+            device__mac__in={key[1] for key in idempotency_keys},
+            idempotency_key__in={key[2] for key in idempotency_keys},
+        ).values_list("device__mac", "idempotency_key")
+
+        known.update(("key", *row) for row in rows)
+
+    if natural_keys:
+        # Consulta pelo índice (device, detected_at); a classe é
+        # comparada em memória
+        rows = MonitoringEvent.objects.filter(
+            device__mac__in={key[1] for key in natural_keys},
+            detected_at__in={key[3] for key in natural_keys},
+        ).values_list("device__mac", "detected_class", "detected_at")
+
+        known.update(("natural", *row) for row in rows)
+
+    duplicates = set()
+    seen = set()
+    for index, key in enumerate(keys):
+        if key is None:
+            continue
+
+        if key in seen or key in known:
+            duplicates.add(index)
+
+        seen.add(key)
+
+    return duplicates
+
+
+def remember(items: list[dict]) -> None:
+    """
+    Registra no cache as chaves dos itens persistidos.
+
+    Parameters
+    ----------
+    items : list[dict]
+        Dados dos eventos persistidos.
+    """
+    for item in items:
+        key = _cache_key(item)
+        if key is not None:
+            recent_keys.add(key)
+
+
+async def ais_known_key(mac: int, idempotency_key: str) -> bool:
+    """
+    Versão assíncrona de `is_known_key`, para uso em views assíncronas.
+
+    Parameters
+    ----------
+    mac : int
+        MAC do dispositivo autenticado.
+    idempotency_key : str
+        Valor do cabeçalho Idempotency-Key.
+
+    Returns
+    -------
+    bool
+        True caso o evento já tenha sido registrado.
+    """
+    key = ("key", mac, idempotency_key)
+
+    if key in recent_keys:
+        return True
+
+    if await MonitoringEvent.objects.filter(device__mac=mac, idempotency_key=idempotency_key).aexists():
+        recent_keys.add(key)
+        return True
+
+    return False
+
+
+def recorded_concurrently(items: list[dict]) -> bool:
+    """
+    Verifica se a violação de integridade na persistência dos itens
+    foi causada por reenvios registrados concorrentemente.
+
+    Executada após um IntegrityError: consulta diretamente o banco de
+    dados (sem o cache) pelos pares (dispositivo, idempotency_key) dos
+    itens. Caso nenhum exista, a violação tem outra causa (ex.: chave
+    estrangeira ou campo obrigatório) e não deve ser tratada como
+    reenvio.
+
+    Parameters
+    ----------
+    items : list[dict]
+        Dados validados dos eventos cuja persistência falhou.
+
+    Returns
+    -------
+    bool
+        True caso algum item já esteja registrado.
+    """
+    query = Q()
+
+    for item in items:
+        if item.get("idempotency_key"):
+            query |= Q(device__mac=item["device"].mac, idempotency_key=item["idempotency_key"])
+
+    if not query:
+        return False
+
+    return MonitoringEvent.objects.filter(query).exists()
@@ -0,0 +1,380 @@
+"""
+Gerador de carga HTTP para benchmarks da API.
+
+Cliente HTTP/1.1 mínimo sobre `asyncio`, sem dependências externas,
+capaz de manter milhares de conexões simultâneas em um único processo
+e de simular links lentos de dispositivos edge (envio do corpo em
+blocos espaçados no tempo).
+
+Utilizado pelos comandos de benchmark e de teste de carga.
+"""
+import asyncio
+import io
+import json
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+from PIL import Image
+
+
+@dataclass
+class HttpResponse:
+    """
+    Resposta recebida pelo gerador de carga.
+    """
+    status: int
+    body: bytes
+
+
+@dataclass
+class LoadReport:
+    """
+    Resultado de uma rodada de carga.
+
+    Respostas 429 (limite de taxa por dispositivo) são contabilizadas
+    em `statuses`, mas não entram nas latências: são rejeitadas antes
+    do processamento e distorceriam os percentis.
+    """
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def total(self) -> int:
+        return sum(self.statuses.values()) + sum(self.errors.values())
+
+    @property
+    def throttled(self) -> int:
+        """
+        Requisições rejeitadas pelo limite de taxa (429).
+        """
+        return self.statuses[429]
+
+    @property
+    def throughput(self) -> float:
+        """
+        Requisições concluídas por segundo.
+        """
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        Retorna o percentil `p` (0-100) das latências, em segundos.
+        """
+        if not self.latencies:
+            return 0.0
+
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> str:
+        """
+        Resumo textual da rodada: vazão, latências e status.
+        """
+        statuses = ", ".join(f"{code}: {count}" for code, count in sorted(self.statuses.items()))
+        errors = ", ".join(f"{name}: {count}" for name, count in self.errors.items())
+
+        return (
+            f"{self.total} requisições em {self.elapsed:.2f}s "
+            f"({self.throughput:.1f} req/s) | "
+            f"p50 {self.percentile(50) * 1000:.1f}ms "
+            f"p95 {self.percentile(95) * 1000:.1f}ms "
+            f"p99 {self.percentile(99) * 1000:.1f}ms | "
+            f"status [{statuses}]"
+            + (f" | limitadas (429) {self.throttled}" if self.throttled else "")
+            + (f" | erros [{errors}]" if errors else "")
+        )
+
+
+class HttpTarget:
+    """
+    Servidor HTTP alvo da carga.
+
+    Parameters
+    ----------
+    base_url : str
+        URL base do servidor (ex.: http://127.0.0.1:8000).
+    """
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+
+        if parts.scheme != "http":
+            raise ValueError("Apenas URLs http:// são suportadas")
+
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: dict | None = None,
+        body: bytes = b"",
+        chunk_size: int = 0,
+        chunk_delay: float = 0.0,
+    ) -> HttpResponse:
+        """
+        Envia uma requisição em uma conexão dedicada.
+
+        Parameters
+        ----------
+        method : str
+            Método HTTP.
+        path : str
+            Caminho (com querystring) relativo à URL base.
+        headers : dict | None
+            Cabeçalhos adicionais.
+        body : bytes
+            Corpo da requisição.
+        chunk_size : int
+            Quando maior que zero, envia o corpo em blocos deste tamanho.
+        chunk_delay : float
+            Intervalo (segundos) entre os blocos, simulando um link lento.
+
+        Returns
+        -------
+        HttpResponse
+            Status e corpo da resposta.
+        """
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        try:
+            lines = [
+                f"{method} {self.prefix}{path} HTTP/1.1",
+                f"Host: {self.host}:{self.port}",
+                "Connection: close",
+                f"Content-Length: {len(body)}",
+            ]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+            if chunk_size and chunk_delay:
+                for offset in range(0, len(body), chunk_size):
+                    writer.write(body[offset:offset + chunk_size])
+                    await writer.drain()
+                    await asyncio.sleep(chunk_delay)
+            else:
+                writer.write(body)
+
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Conexão encerrada sem resposta")
+
+            status = int(status_line.split()[1])
+
+            response = await reader.read()
+            _, _, content = response.partition(b"\r\n\r\n")
+
+            return HttpResponse(status=status, body=content)
+
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def run_load(
+    send: Callable[[int], Awaitable[HttpResponse]],
+    total: int,
+    concurrency: int,
+    rate: float = 0.0,
+) -> LoadReport:
+    """
+    Executa `total` requisições com até `concurrency` simultâneas.
+
+    Parameters
+    ----------
+    send : Callable[[int], Awaitable[HttpResponse]]
+        Função que envia a requisição de índice informado.
+    total : int
+        Quantidade de requisições.
+    concurrency : int
+        Quantidade máxima de requisições simultâneas.
+    rate : float
+        Taxa alvo de início de requisições por segundo (0 = sem limite).
+
+    Com taxa alvo, a latência de cada requisição é medida a partir do
+    instante em que ela deveria ter sido enviada, incluindo a espera
+    por uma vaga de concorrência: um servidor lento não reduz a carga
+    medida (coordinated omission).
+
+    Returns
+    -------
+    LoadReport
+        Latências e status de todas as requisições.
+    """
+    report = LoadReport()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int, scheduled: float | None) -> None:
+        async with semaphore:
+            started = time.perf_counter() if scheduled is None else scheduled
+
+            try:
+                response = await send(index)
+            except Exception as exc:
+                report.errors[type(exc).__name__] += 1
+                return
+
+            if response.status != 429:
+                report.latencies.append(time.perf_counter() - started)
+            report.statuses[response.status] += 1
+
+    started = time.perf_counter()
+    tasks = []
+
+    for index in range(total):
+        scheduled = None
+
+        if rate:
+            scheduled = started + index / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        tasks.append(asyncio.create_task(one(index, scheduled)))
+
+    await asyncio.gather(*tasks)
+    report.elapsed = time.perf_counter() - started
+
+    return report
+
+
+def synthetic_jpeg(seed: int, size: tuple[int, int] = (320, 240), quality: int = 85) -> bytes:
+    """
+    Gera uma imagem JPEG sintética, distinta para cada `seed`.
+
+    A imagem combina uma cor de fundo com ruído gaussiano, resultando
+    em arquivos de tamanho próximo ao de frames reais de câmera (uma
+    imagem de cor sólida comprimiria para poucos KB).
+
+    Parameters
+    ----------
+    seed : int
+        Semente que define a cor de fundo.
+    size : tuple[int, int]
+        Largura e altura em pixels.
+    quality : int
+        Qualidade JPEG (1-95).
+
+    Returns
+    -------
+    bytes
+        Conteúdo do arquivo JPEG.
+    """
+    color = ((seed * 67) % 256, (seed * 131) % 256, (seed * 197) % 256)
+
+    background = Image.new("RGB", size, color)
+    noise = Image.effect_noise(size, 48).convert("RGB")
+    image = Image.blend(background, noise, 0.35)
+
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+
+    return buffer.getvalue()
+
+
+def unique_jpeg(jpeg: bytes, tag: str) -> bytes:
+    """
+    Torna o conteúdo de um JPEG único sem alterar a imagem.
+
+    Insere um segmento de comentário (COM) logo após o marcador SOI.
+    Como as evidências são armazenadas por conteúdo, imagens idênticas
+    seriam gravadas uma única vez, o que não representa a carga real.
+
+    Parameters
+    ----------
+    jpeg : bytes
+        Conteúdo JPEG de origem.
+    tag : str
+        Texto único gravado no comentário.
+
+    Returns
+    -------
+    bytes
+        JPEG com o comentário inserido.
+    """
+    comment = tag.encode()
+    segment = b"\xff\xfe" + (len(comment) + 2).to_bytes(2, "big") + comment
+    return jpeg[:2] + segment + jpeg[2:]
+
+
+def multipart_body(fields: dict[str, str], files: dict[str, tuple[str, bytes, str]]) -> tuple[bytes, str]:
+    """
+    Monta um corpo multipart/form-data.
+
+    Parameters
+    ----------
+    fields : dict[str, str]
+        Campos de texto.
+    files : dict[str, tuple[str, bytes, str]]
+        Arquivos: nome do campo -> (nome do arquivo, conteúdo, content type).
+
+    Returns
+    -------
+    tuple[bytes, str]
+        Corpo e valor do cabeçalho Content-Type.
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+
+    for name, value in fields.items():
+        parts.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode()
+        )
+
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode()
+            + content + b"\r\n"
+        )
+
+    parts.append(f"--{boundary}--\r\n".encode())
+
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def synthetic_mac(index: int) -> str:
+    """
+    Retorna um endereço MAC sintético (faixa localmente administrada).
+    """
+    value = 0x020000000000 | (index & 0xFFFFFFFFFF)
+    return ":".join(f"{(value >> shift) & 0xFF:02X}" for shift in range(40, -8, -8))
+
+
+async def obtain_token(target: HttpTarget, username: str, password: str) -> str:
+    """
+    Obtém um access token JWT pelo endpoint de login.
+
+    Raises
+    ------
+    RuntimeError
+        Caso as credenciais sejam recusadas.
+    """
+    response = await target.request(
+        "POST",
+        "/api/authentication/login/",
+        headers={"Content-Type": "application/json"},
+        body=json.dumps({"username": username, "password": password}).encode(),
+    )
+
+    if response.status != 200:
+        raise RuntimeError(f"Falha no login (status {response.status})")
+
+    return json.loads(response.body)["access"]
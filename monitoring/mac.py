@@ -0,0 +1,53 @@
+"""
+Conversão de endereços MAC entre texto e inteiro.
+
+Os dispositivos são identificados no banco de dados pelo MAC como
+inteiro de 48 bits; o formato textual XX:XX:XX:XX:XX:XX é utilizado
+apenas na API.
+"""
+import re
+
+
+MAC_PATTERN = re.compile(r"^[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}$")
+
+
+def parse_mac(value: str) -> int:
+    """
+    Converte um endereço MAC no formato XX:XX:XX:XX:XX:XX em inteiro.
+
+    Parameters
+    ----------
+    value : str
+        Endereço MAC textual (maiúsculas ou minúsculas).
+
+    Returns
+    -------
+    int
+        Endereço MAC como inteiro de 48 bits.
+
+    Raises
+    ------
+    ValueError
+        Caso o valor não esteja no formato esperado.
+    """
+    if not isinstance(value, str) or not MAC_PATTERN.match(value):
+        raise ValueError(f"MAC address inválido: {value!r}")
+
+    return int(value.replace(":", ""), 16)
+
+
+def format_mac(mac: int) -> str:
+    """
+    Converte um endereço MAC inteiro para o formato XX:XX:XX:XX:XX:XX.
+
+    Parameters
+    ----------
+    mac : int
+        Endereço MAC como inteiro de 48 bits.
+
+    Returns
+    -------
+    str
+        Endereço MAC textual em maiúsculas.
+    """
+    return ":".join(f"{(mac >> shift) & 0xFF:02X}" for shift in range(40, -8, -8))
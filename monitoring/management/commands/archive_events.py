@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.utils import report_log
+from monitoring.archive import ArchiveWriter, delete_events
+from monitoring.models import MonitoringEvent
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável pelo arquivamento de eventos antigos.
+
+    Grava os eventos mais antigos que o período de retenção, em blocos,
+    no arquivo frio (NDJSON compactado com gzip e evidências em tar, ver
+    monitoring.archive) e os remove do banco de dados em lotes pequenos.
+    As evidências que deixam de ser referenciadas são removidas do
+    storage pelo comando `purge_evidence_blobs`.
+
+    Com a tabela de eventos particionada, meses inteiros também podem
+    ser removidos por `manage_partitions --retain-months`, sem
+    arquivamento.
+
+    Uso:
+        python manage.py archive_events --days 90 --chunk-size 10000 --batch-size 500
+    """
+
+    help = "Arquiva e remove eventos mais antigos que o período de retenção"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.MONITORING_RETENTION_DAYS,
+            help="Idade mínima (dias) dos eventos arquivados"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Quantidade de eventos por bloco do arquivo"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Quantidade de eventos removidos por transação"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Apenas exibe a quantidade de eventos a arquivar"
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        queryset = (
+            MonitoringEvent.objects
+            .select_related("device")
+            .filter(detected_at__lt=cutoff)
+            .order_by("detected_at", "id")
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(f"{queryset.count()} eventos anteriores a {cutoff:%Y-%m-%d %H:%M} a arquivar")
+            return
+
+        writer = None
+        archived = removed = 0
+
+        while True:
+            # Os eventos de cada bloco são removidos antes da leitura do
+            # próximo, de modo que o início da consulta avança sozinho
+            events = list(queryset[:options["chunk_size"]])
+
+            if not events:
+                break
+
+            if writer is None:
+                writer = ArchiveWriter(cutoff)
+
+            chunk = writer.write_chunk(events)
+            archived += chunk["count"]
+            deleted = delete_events([event.pk for event in events], options["batch_size"])
+            removed += deleted
+
+            if not deleted:
+                raise CommandError("Nenhum evento do bloco foi removido; arquivamento interrompido")
+
+            self.stdout.write(
+                f"{chunk['events']}: {chunk['count']} eventos, "
+                f"{chunk['evidence_files']} evidências"
+                + (f" ({chunk['missing_evidence']} ausentes)" if chunk["missing_evidence"] else "")
+            )
+
+        if writer is None:
+            self.stdout.write("Nenhum evento a arquivar")
+            return
+
+        report_log(
+            user=None,
+            action="Arquivar Eventos",
+            status="SUCCESS",
+            message=(
+                f"{archived} eventos anteriores a {cutoff:%Y-%m-%d %H:%M} "
+                f"arquivados em {writer.archive_id}; {removed} removidos"
+            )
+        )
+
+        self.stdout.write(f"{archived} eventos arquivados em {writer.path}; {removed} removidos")
@@ -0,0 +1,143 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone as django_timezone
+
+from monitoring.loadgen import (
+    HttpTarget,
+    multipart_body,
+    obtain_token,
+    run_load,
+    synthetic_jpeg,
+    synthetic_mac,
+)
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável por comparar as views síncronas e assíncronas.
+
+    Envia a mesma carga concorrente para os endpoints de ingestão e de
+    dashboard nas versões DRF (síncronas) e nativas assíncronas, contra
+    um servidor já em execução, e exibe vazão e latências de cada um.
+
+    A comparação só é significativa com a aplicação servida via ASGI
+    (ex.: `uvicorn project.asgi:application`), em que as views
+    assíncronas são executadas no event loop e as síncronas em threads.
+    A opção --upload-delay simula links lentos de dispositivos edge.
+
+    Uso:
+        python manage.py benchmark_async --base-url http://127.0.0.1:8000 \\
+            --username admin --password senha --requests 1000 --concurrency 200
+    """
+
+    help = "Compara vazão e latência das views síncronas e assíncronas"
+
+    SCENARIOS = (
+        ("Ingestão (sync)", "ingestion", "/api/monitoring/"),
+        ("Ingestão (async)", "ingestion", "/api/monitoring/async/"),
+        ("Dashboard (sync)", "dashboard", "/api/dashboard/"),
+        ("Dashboard (async)", "dashboard", "/api/dashboard/async/"),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://127.0.0.1:8000",
+            help="URL base do servidor em execução"
+        )
+        parser.add_argument(
+            "--token",
+            help="Access token JWT (alternativa a --username/--password)"
+        )
+        parser.add_argument("--username", help="Usuário para obtenção do token")
+        parser.add_argument("--password", help="Senha para obtenção do token")
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Quantidade de requisições por cenário"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=100,
+            help="Quantidade máxima de requisições simultâneas"
+        )
+        parser.add_argument(
+            "--upload-delay",
+            type=float,
+            default=0.0,
+            help="Intervalo (segundos) entre blocos de 4KB do upload, simulando links lentos"
+        )
+        parser.add_argument(
+            "--only",
+            choices=["ingestion", "dashboard"],
+            help="Executa apenas os cenários de ingestão ou de dashboard"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            asyncio.run(self._run(options))
+        except (OSError, RuntimeError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+    async def _run(self, options: dict) -> None:
+        target = HttpTarget(options["base_url"])
+
+        token = options["token"]
+        if not token:
+            if not options["username"] or not options["password"]:
+                raise CommandError("Informe --token ou --username e --password")
+
+            token = await obtain_token(target, options["username"], options["password"])
+
+        authorization = {"Authorization": f"Bearer {token}"}
+        images = [synthetic_jpeg(seed) for seed in range(16)]
+
+        # Instante base distinto por execução, evitando que os eventos
+        # sejam descartados como reenvios de uma execução anterior
+        base_time = datetime.now(tz=timezone.utc) - timedelta(days=1)
+
+        # Os cenários de dashboard consultam o dia (no fuso de TIME_ZONE,
+        # utilizado pelos filtros de data) dos eventos enviados
+        event_date = django_timezone.localdate(base_time).isoformat()
+
+        for name, kind, path in self.SCENARIOS:
+            if options["only"] and options["only"] != kind:
+                continue
+
+            if kind == "ingestion":
+                def send(index, path=path):
+                    body, content_type = multipart_body(
+                        {
+                            "mac_address": synthetic_mac(index),
+                            "detected_class": "benchmark",
+                            "detected_at": (base_time + timedelta(microseconds=index)).isoformat(),
+                        },
+                        {"evidence": ("evidence.jpg", images[index % len(images)], "image/jpeg")},
+                    )
+                    return target.request(
+                        "POST",
+                        path,
+                        headers={
+                            **authorization,
+                            "Content-Type": content_type,
+                            "Idempotency-Key": uuid.uuid4().hex,
+                        },
+                        body=body,
+                        chunk_size=4096,
+                        chunk_delay=options["upload_delay"],
+                    )
+            else:
+                def send(index, path=path):
+                    return target.request(
+                        "GET",
+                        f"{path}?start_date={event_date}&end_date={event_date}",
+                        headers=authorization,
+                    )
+
+            report = await run_load(send, options["requests"], options["concurrency"])
+            self.stdout.write(f"{name:<18} {report.summary()}")
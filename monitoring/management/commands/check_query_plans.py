@@ -0,0 +1,238 @@
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from monitoring.models import Device, Incident, MonitoringEvent
+
+
+SAMPLE_DEVICES = 50
+SAMPLE_CLASSES = ["person", "vehicle", "animal", "bicycle", "fire"]
+SAMPLE_DAYS = 60
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável pela verificação dos planos de execução das
+    consultas principais sobre eventos de monitoramento.
+
+    Executa EXPLAIN nas consultas do dashboard, da listagem paginada, do
+    feed de alterações e das buscas por dispositivo e por classe, e falha
+    caso alguma delas não utilize o índice esperado (ver
+    MonitoringEvent.Meta.indexes).
+    Destina-se a CI/deploy, após `migrate`, em SQLite ou Postgres.
+
+    Em tabelas vazias ou pequenas, a escolha do planejador entre os
+    índices é arbitrária. Por isso, a verificação grava uma amostra
+    sintética de eventos (--sample) e atualiza as estatísticas (ANALYZE)
+    dentro de uma transação desfeita ao final: nenhum registro ou
+    estatística permanece no banco de dados. No Postgres, varreduras
+    sequenciais também são desabilitadas durante a verificação (SET
+    LOCAL enable_seqscan = off). Com a tabela particionada, são aceitos
+    os índices correspondentes de cada partição.
+
+    Uso:
+        python manage.py check_query_plans --sample 20000 --verbose
+    """
+
+    help = "Verifica se as consultas de eventos utilizam os índices esperados"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=20000,
+            help="Quantidade de eventos sintéticos gravados durante a verificação (0 = apenas dados existentes)"
+        )
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Exibe o plano de execução de cada consulta"
+        )
+
+    def handle(self, *args, **options):
+        end = datetime.now(tz=timezone.utc)
+        start = end - timedelta(days=7)
+        failures = []
+
+        with transaction.atomic():
+            device_id = self._load_sample(options["sample"], end) if options["sample"] else 1
+
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, queryset, index in self._checks(start, end, device_id):
+                plan = queryset.explain()
+                used = any(
+                    re.search(rf"\b{re.escape(candidate)}\b", plan)
+                    for candidate in self._index_names(index)
+                )
+
+                if used:
+                    self.stdout.write(self.style.SUCCESS(f"OK    {name}: {index}"))
+                else:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"FALHA {name}: {index} não utilizado"))
+
+                if options["verbose"] or not used:
+                    self.stdout.write(plan)
+
+            # Descarta a amostra e as estatísticas calculadas sobre ela
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} consulta(s) sem o índice esperado: {', '.join(failures)}"
+            )
+
+    def _checks(self, start: datetime, end: datetime, device_id: int) -> list[tuple]:
+        """
+        Consultas verificadas e o índice esperado de cada uma.
+        """
+        return [
+            (
+                "Dashboard (intervalo de datas)",
+                MonitoringEvent.objects.select_related("device").filter(
+                    detected_at__range=(start, end)
+                ).order_by("-detected_at", "-pk")[:101],
+                "monitoring_detected_idx",
+            ),
+            (
+                "Listagem (primeira página)",
+                MonitoringEvent.objects.select_related("device").order_by("-detected_at", "-pk")[:101],
+                "monitoring_detected_idx",
+            ),
+            (
+                "Listagem (página seguinte, cursor)",
+                MonitoringEvent.objects.select_related("device").filter(
+                    Q(detected_at__lte=start),
+                    Q(detected_at__lt=start) | Q(pk__lt=1000)
+                ).order_by("-detected_at", "-pk")[:101],
+                "monitoring_detected_idx",
+            ),
+            (
+                "Feed de alterações (cursor)",
+                MonitoringEvent.objects.filter(
+                    Q(created_at__gte=start),
+                    Q(created_at__gt=start) | Q(pk__gt=1000),
+                    created_at__lte=end
+                ).order_by("created_at", "pk")[:101],
+                "monitoring_created_id_idx",
+            ),
+            (
+                "Eventos por dispositivo",
+                MonitoringEvent.objects.filter(
+                    device_id=device_id,
+                    detected_at__range=(start, end)
+                ).order_by("-detected_at"),
+                "monitoring_device_detected_idx",
+            ),
+            (
+                "Eventos por classe",
+                MonitoringEvent.objects.filter(
+                    detected_class="person",
+                    detected_at__range=(start, end)
+                ).order_by("-detected_at"),
+                "monitoring_class_detected_idx",
+            ),
+            (
+                "Incidente aberto",
+                Incident.objects.filter(
+                    device_id=device_id,
+                    detected_class="person",
+                    last_detected_at__gte=start
+                ).order_by("-last_detected_at"),
+                "incident_open_lookup_idx",
+            ),
+        ]
+
+    def _load_sample(self, size: int, end: datetime) -> int:
+        """
+        Grava a amostra sintética de dispositivos, eventos e incidentes
+        e atualiza as estatísticas do planejador.
+
+        Returns
+        -------
+        int
+            Identificador de um dispositivo da amostra.
+        """
+        random_state = random.Random(0)
+
+        # MACs localmente administrados (bit 0x02), fora da faixa de
+        # dispositivos reais
+        Device.objects.bulk_create(
+            Device(mac=0x02_00_00_00_00_00 | index, name="check_query_plans")
+            for index in range(SAMPLE_DEVICES)
+        )
+        devices = list(Device.objects.filter(name="check_query_plans"))
+
+        def moment() -> datetime:
+            return end - timedelta(seconds=random_state.uniform(0, SAMPLE_DAYS * 86400))
+
+        MonitoringEvent.objects.bulk_create(
+            (
+                MonitoringEvent(
+                    device=random_state.choice(devices),
+                    detected_class=random_state.choice(SAMPLE_CLASSES),
+                    detected_at=moment(),
+                    evidence="check_query_plans.jpg",
+                )
+                for _ in range(size)
+            ),
+            batch_size=1000
+        )
+
+        Incident.objects.bulk_create(
+            (
+                Incident(
+                    device=random_state.choice(devices),
+                    detected_class=random_state.choice(SAMPLE_CLASSES),
+                    first_detected_at=detected_at,
+                    last_detected_at=detected_at,
+                )
+                for detected_at in (moment() for _ in range(size // 10))
+            ),
+            batch_size=1000
+        )
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                tables = ", ".join(
+                    connection.ops.quote_name(model._meta.db_table)
+                    for model in (Device, MonitoringEvent, Incident)
+                )
+                cursor.execute(f"ANALYZE {tables}")
+            else:
+                cursor.execute("ANALYZE")
+
+        return devices[0].pk
+
+    def _index_names(self, index: str) -> list[str]:
+        """
+        Retorna o índice informado e, com a tabela de eventos
+        particionada (ver monitoring.partitions), os índices
+        correspondentes de cada partição, cujos nomes são gerados pelo
+        PostgreSQL.
+        """
+        if connection.vendor != "postgresql":
+            return [index]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH RECURSIVE tree(oid) AS (
+                    SELECT to_regclass(%s)::oid
+                    UNION ALL
+                    SELECT pg_inherits.inhrelid
+                    FROM pg_inherits
+                    JOIN tree ON pg_inherits.inhparent = tree.oid
+                )
+                SELECT relname FROM pg_class JOIN tree USING (oid)
+                """,
+                [index]
+            )
+            return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+
+from monitoring.derivatives import derivative_targets, render_derivatives
+from monitoring.models import MonitoringEvent
+from monitoring.storage import evidence_storage
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável por gerar os derivados das evidências existentes.
+
+    Percorre as evidências referenciadas pelos eventos e gera, em um
+    pool de processos, as miniaturas e pré-visualizações ausentes.
+    Utilizado para preencher derivados de eventos anteriores à geração
+    na ingestão, ou quando MONITORING_DERIVATIVES_AT_INGEST está desabilitado.
+
+    Uso:
+        python manage.py generate_derivatives --workers 8
+    """
+
+    help = "Gera miniaturas e pré-visualizações ausentes das evidências"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Quantidade de processos utilizados na geração"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Quantidade de evidências lidas do banco por vez"
+        )
+
+    def handle(self, *args, **options):
+        storage = evidence_storage()
+        names = (
+            MonitoringEvent.objects
+            .order_by()
+            .values_list("evidence", flat=True)
+            .distinct()
+            .iterator(chunk_size=options["chunk_size"])
+        )
+
+        generated = 0
+        failed = 0
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            pending = set()
+
+            for name in names:
+                pending.add(executor.submit(
+                    render_derivatives, storage.path(name), derivative_targets(name)
+                ))
+
+                # Limita a quantidade de tarefas em memória
+                if len(pending) >= options["chunk_size"]:
+                    done, pending = self._drain(pending, options["chunk_size"] // 2)
+                    generated, failed = self._count(done, generated, failed)
+
+            done, _ = self._drain(pending, 0)
+            generated, failed = self._count(done, generated, failed)
+
+        self.stdout.write(f"{generated} derivados gerados, {failed} evidências com falha")
+
+    def _drain(self, pending: set, keep: int) -> tuple[list, set]:
+        """
+        Aguarda a conclusão das tarefas até restarem no máximo `keep`.
+        """
+        done = []
+        for future in as_completed(pending):
+            done.append(future)
+            if len(pending) - len(done) <= keep:
+                break
+        return done, pending.difference(done)
+
+    def _count(self, done: list, generated: int, failed: int) -> tuple[int, int]:
+        """
+        Contabiliza o resultado das tarefas concluídas.
+        """
+        for future in done:
+            try:
+                generated += future.result()
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Falha ao gerar derivados: {exc}")
+        return generated, failed
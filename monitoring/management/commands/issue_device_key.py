@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils import report_log
+from monitoring.authentication import generate_key
+from monitoring.devices import resolve_device
+from monitoring.mac import parse_mac
+from monitoring.models import DeviceCredential
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável por emitir chaves de API para dispositivos edge.
+
+    A chave completa é exibida uma única vez; apenas seu prefixo e o
+    hash do segredo são armazenados. O dispositivo é registrado caso
+    ainda não exista.
+
+    Uso:
+        python manage.py issue_device_key AA:BB:CC:DD:EE:FF --name "Portaria"
+    """
+
+    help = "Emite uma chave de API para um dispositivo edge"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "mac_address",
+            help="Endereço MAC do dispositivo (XX:XX:XX:XX:XX:XX)"
+        )
+        parser.add_argument(
+            "--name",
+            help="Nome ou localização do dispositivo"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            mac = parse_mac(options["mac_address"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        device = resolve_device(mac)
+
+        if options["name"]:
+            device.name = options["name"]
+            device.save(update_fields=["name"])
+
+        key, prefix, key_hash = generate_key()
+        DeviceCredential.objects.create(device=device, prefix=prefix, key_hash=key_hash)
+
+        report_log(
+            user=None,
+            action="Emitir Chave de Dispositivo",
+            status="SUCCESS",
+            message=f"Chave {prefix} emitida para MAC {device.mac_address}"
+        )
+
+        self.stdout.write(f"Chave emitida para {device.mac_address} (guarde-a, não será exibida novamente):")
+        self.stdout.write(key)
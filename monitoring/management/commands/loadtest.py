@@ -0,0 +1,361 @@
+import asyncio
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from monitoring.authentication import generate_key
+from monitoring.binary import FRAME_HEADER, MEDIA_TYPE
+from monitoring.loadgen import (
+    HttpTarget,
+    multipart_body,
+    obtain_token,
+    run_load,
+    synthetic_jpeg,
+    synthetic_mac,
+    unique_jpeg,
+)
+from monitoring.mac import parse_mac
+from monitoring.models import Device, DeviceCredential
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável pelo teste de carga do endpoint de ingestão.
+
+    Simula uma frota de dispositivos edge enviando eventos com
+    evidências JPEG sintéticas para um servidor já em execução (SQLite
+    ou Postgres, conforme a configuração do servidor), e exibe vazão,
+    latências (p50/p95/p99) e erros.
+
+    Com --auth device (padrão), os dispositivos sintéticos e suas chaves
+    de API são criados no banco de dados configurado neste ambiente,
+    que deve ser o mesmo utilizado pelo servidor. Cada dispositivo
+    envia com a própria chave. Ao final (inclusive em caso de erro), as
+    chaves emitidas são revogadas e os dispositivos criados pelo teste
+    que não registraram eventos são removidos.
+
+    Os eventos estão sujeitos ao limite de taxa por dispositivo
+    (MONITORING_THROTTLE_RATE / MONITORING_THROTTLE_BURST, inclusive com
+    --auth jwt): com o padrão de 5 eventos/s, a vazão aceita fica
+    limitada a cerca de 5 x --devices eventos/s. As respostas 429 são
+    exibidas separadamente e excluídas das latências; para medir a
+    capacidade do servidor, aumente --devices ou desabilite o limite no
+    servidor (MONITORING_THROTTLE_RATE=0).
+
+    --format binary envia cada evento no protocolo binário
+    (`monitoring.binary`), com as classes de --classes mapeadas pelos
+    índices de MONITORING_DETECTION_CLASSES.
+
+    Com --rate, as latências são medidas a partir do instante agendado
+    para o envio, incluindo a espera por concorrência disponível.
+
+    Uso:
+        python manage.py loadtest --devices 50 --rate 200 --duration 60 \\
+            --concurrency 100 --image-size 1280x720 --output resultado.json
+    """
+
+    help = "Executa um teste de carga reprodutível contra o endpoint de ingestão"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://127.0.0.1:8000",
+            help="URL base do servidor em execução"
+        )
+        parser.add_argument(
+            "--endpoint",
+            help=(
+                "Endpoint de ingestão (padrão: /api/monitoring/ ou, com "
+                "--format binary, /api/monitoring/binary/)"
+            )
+        )
+        parser.add_argument(
+            "--format",
+            choices=["multipart", "binary"],
+            default="multipart",
+            help="Formato do corpo, que deve ser aceito por --endpoint"
+        )
+        parser.add_argument(
+            "--auth",
+            choices=["device", "jwt"],
+            default="device",
+            help="Autenticação por chave de dispositivo ou por usuário (JWT)"
+        )
+        parser.add_argument("--token", help="Access token JWT (--auth jwt)")
+        parser.add_argument("--username", help="Usuário para obtenção do token (--auth jwt)")
+        parser.add_argument("--password", help="Senha para obtenção do token (--auth jwt)")
+        parser.add_argument(
+            "--devices",
+            type=int,
+            default=10,
+            help="Quantidade de dispositivos sintéticos"
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Quantidade total de eventos (ignorado com --duration)"
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            help="Duração do teste em segundos (requer --rate)"
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0.0,
+            help="Taxa alvo de eventos por segundo, somando todos os dispositivos (0 = sem limite)"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Quantidade máxima de requisições simultâneas"
+        )
+        parser.add_argument(
+            "--image-size",
+            default="1280x720",
+            help="Dimensões das evidências (LARGURAxALTURA)"
+        )
+        parser.add_argument(
+            "--image-quality",
+            type=int,
+            default=80,
+            help="Qualidade JPEG das evidências (1-95)"
+        )
+        parser.add_argument(
+            "--image-pool",
+            type=int,
+            default=8,
+            help="Quantidade de imagens base geradas (cada evento recebe conteúdo único)"
+        )
+        parser.add_argument(
+            "--classes",
+            default="person,vehicle,animal",
+            help="Classes de detecção sorteadas, separadas por vírgula"
+        )
+        parser.add_argument(
+            "--upload-delay",
+            type=float,
+            default=0.0,
+            help="Intervalo (segundos) entre blocos de 4KB do upload, simulando links lentos"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Semente dos sorteios, para execuções reprodutíveis"
+        )
+        parser.add_argument(
+            "--output",
+            help="Arquivo JSON para gravação do resultado (comparação entre execuções)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            width, height = (int(value) for value in options["image_size"].lower().split("x"))
+        except ValueError:
+            raise CommandError("--image-size deve estar no formato LARGURAxALTURA")
+
+        if options["duration"]:
+            if not options["rate"]:
+                raise CommandError("--duration requer --rate")
+            options["requests"] = int(options["duration"] * options["rate"])
+
+        if not options["endpoint"]:
+            options["endpoint"] = (
+                "/api/monitoring/binary/" if options["format"] == "binary"
+                else "/api/monitoring/"
+            )
+
+        classes = [name.strip() for name in options["classes"].split(",") if name.strip()]
+        if options["format"] == "binary":
+            unknown = set(classes) - set(settings.MONITORING_DETECTION_CLASSES)
+            if unknown:
+                raise CommandError(
+                    "Classes ausentes de MONITORING_DETECTION_CLASSES: "
+                    + ", ".join(sorted(unknown))
+                )
+        options["classes"] = classes
+
+        macs = [synthetic_mac(index) for index in range(options["devices"])]
+
+        self.stdout.write(
+            f"Gerando {options['image_pool']} imagens {width}x{height} "
+            f"(qualidade {options['image_quality']})..."
+        )
+        images = [
+            synthetic_jpeg(seed, (width, height), options["image_quality"])
+            for seed in range(options["image_pool"])
+        ]
+
+        credentials, issued = None, None
+        try:
+            if options["auth"] == "device":
+                credentials, issued = self._issue_keys(macs)
+
+            report = asyncio.run(self._run(options, macs, credentials, images))
+        except (OSError, RuntimeError, ValueError) as exc:
+            raise CommandError(str(exc))
+        finally:
+            if issued:
+                self._revoke_keys(*issued)
+
+        self.stdout.write(report.summary())
+
+        if options["output"]:
+            result = {
+                "endpoint": options["endpoint"],
+                "format": options["format"],
+                "devices": options["devices"],
+                "requests": report.total,
+                "concurrency": options["concurrency"],
+                "rate": options["rate"],
+                "image_size": options["image_size"],
+                "image_bytes": sum(len(image) for image in images) // len(images),
+                "database": settings.DATABASES["default"]["ENGINE"],
+                "elapsed": report.elapsed,
+                "throughput": report.throughput,
+                "p50": report.percentile(50),
+                "p95": report.percentile(95),
+                "p99": report.percentile(99),
+                "statuses": {str(code): count for code, count in report.statuses.items()},
+                "throttled": report.throttled,
+                "errors": dict(report.errors),
+            }
+
+            with open(options["output"], "w") as handle:
+                json.dump(result, handle, indent=2)
+
+            self.stdout.write(f"Resultado gravado em {options['output']}")
+
+    def _issue_keys(self, macs: list[str]) -> tuple[list[str], tuple[list[str], list[int]]]:
+        """
+        Registra os dispositivos sintéticos e emite uma chave para cada um.
+
+        Returns
+        -------
+        tuple[list[str], tuple[list[str], list[int]]]
+            Chaves emitidas, e os prefixos das chaves e ids dos
+            dispositivos criados (para `_revoke_keys`).
+        """
+        keys, prefixes, created_devices = [], [], []
+
+        with transaction.atomic():
+            for mac in macs:
+                device, created = Device.objects.get_or_create(mac=parse_mac(mac))
+                if created:
+                    created_devices.append(device.pk)
+
+                key, prefix, key_hash = generate_key()
+                DeviceCredential.objects.create(device=device, prefix=prefix, key_hash=key_hash)
+                keys.append(key)
+                prefixes.append(prefix)
+
+        self.stdout.write(f"{len(keys)} dispositivos sintéticos com chave emitida")
+        return keys, (prefixes, created_devices)
+
+    def _revoke_keys(self, prefixes: list[str], created_devices: list[int]) -> None:
+        """
+        Revoga as chaves emitidas pelo teste e remove os dispositivos
+        criados que não registraram eventos.
+
+        Processos do servidor que já tenham a chave em cache deixam de
+        aceitá-la após MONITORING_DEVICE_KEY_CACHE_TTL segundos.
+        """
+        revoked = DeviceCredential.objects.filter(
+            prefix__in=prefixes,
+            revoked_at__isnull=True
+        ).update(revoked_at=django_timezone.now())
+
+        _, deleted = Device.objects.filter(
+            pk__in=created_devices,
+            events__isnull=True,
+            incidents__isnull=True
+        ).delete()
+
+        self.stdout.write(
+            f"{revoked} chave(s) revogada(s), "
+            f"{deleted.get('monitoring.Device', 0)} dispositivo(s) sem eventos removido(s)"
+        )
+
+    async def _run(self, options: dict, macs: list[str], credentials: list[str] | None, images: list[bytes]):
+        target = HttpTarget(options["base_url"])
+
+        if credentials is None:
+            token = options["token"]
+            if not token:
+                if not options["username"] or not options["password"]:
+                    raise CommandError("Informe --token ou --username e --password")
+                token = await obtain_token(target, options["username"], options["password"])
+
+            authorizations = [f"Bearer {token}"] * len(macs)
+        else:
+            authorizations = [f"Device {key}" for key in credentials]
+
+        classes = options["classes"]
+        random_state = random.Random(options["seed"])
+        run_id = uuid.uuid4().hex[:8]
+
+        # Sorteios feitos antecipadamente: a sequência de eventos é a
+        # mesma para a mesma semente
+        plan = [
+            (
+                random_state.randrange(len(macs)),
+                random_state.choice(classes),
+                random_state.randrange(len(images)),
+            )
+            for _ in range(options["requests"])
+        ]
+        base_time = datetime.now(tz=timezone.utc)
+
+        def send(index: int):
+            device_index, detected_class, image_index = plan[index]
+            detected_at = base_time + timedelta(milliseconds=index)
+            image = unique_jpeg(images[image_index], f"{run_id}-{index}")
+
+            if options["format"] == "binary":
+                body = FRAME_HEADER.pack(
+                    parse_mac(macs[device_index]).to_bytes(6, "big"),
+                    settings.MONITORING_DETECTION_CLASSES.index(detected_class),
+                    int(detected_at.timestamp() * 1000),
+                    len(image),
+                ) + image
+                content_type = MEDIA_TYPE
+            else:
+                body, content_type = multipart_body(
+                    {
+                        "mac_address": macs[device_index],
+                        "detected_class": detected_class,
+                        "detected_at": detected_at.isoformat(),
+                    },
+                    {"evidence": ("evidence.jpg", image, "image/jpeg")},
+                )
+
+            return target.request(
+                "POST",
+                options["endpoint"],
+                headers={
+                    "Authorization": authorizations[device_index],
+                    "Content-Type": content_type,
+                    "Idempotency-Key": f"loadtest-{run_id}-{index}",
+                },
+                body=body,
+                chunk_size=4096,
+                chunk_delay=options["upload_delay"],
+            )
+
+        self.stdout.write(
+            f"Enviando {len(plan)} eventos para {options['endpoint']} "
+            f"(concorrência {options['concurrency']}"
+            + (f", {options['rate']} eventos/s" if options["rate"] else "")
+            + ")..."
+        )
+        return await run_load(send, len(plan), options["concurrency"], options["rate"])
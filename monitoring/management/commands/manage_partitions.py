@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils import report_log
+from monitoring import partitions
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável pela manutenção das partições mensais da
+    tabela de eventos no PostgreSQL (ver monitoring.partitions).
+
+    Sem opções, cria as partições do mês corrente e dos próximos meses.
+    Deve ser executado periodicamente (ex.: cron diário), garantindo que
+    a partição de cada mês exista antes de seus eventos chegarem.
+
+    Com --retain-months, remove as partições de meses encerrados fora do
+    período de retenção, liberando as referências às evidências dos
+    eventos removidos (os arquivos são removidos por
+    `purge_evidence_blobs`). Com --detach, as partições são apenas
+    destacadas e mantidas como tabelas avulsas.
+
+    Uso:
+        python manage.py manage_partitions --convert --horizon-months 12
+        python manage.py manage_partitions --months-ahead 3 --retain-months 12
+    """
+
+    help = "Cria e remove as partições mensais da tabela de eventos (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Converte a tabela de eventos em tabela particionada (janela de manutenção)"
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Quantidade de meses futuros com partição criada antecipadamente"
+        )
+        parser.add_argument(
+            "--horizon-months",
+            type=int,
+            default=settings.MONITORING_PARTITION_HORIZON_MONTHS,
+            help=(
+                "Na conversão, meses anteriores ao corrente com partição criada; "
+                "eventos mais antigos ficam na partição padrão"
+            )
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            help="Quantidade de meses encerrados mantidos, além do mês corrente"
+        )
+        parser.add_argument(
+            "--detach",
+            action="store_true",
+            help="Destaca as partições fora da retenção em vez de excluí-las"
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_supported():
+            raise CommandError("O particionamento de eventos requer PostgreSQL")
+
+        if options["convert"]:
+            if partitions.is_partitioned():
+                raise CommandError("A tabela de eventos já está particionada")
+
+            created = partitions.convert_to_partitioned(
+                options["months_ahead"], options["horizon_months"]
+            )
+
+            report_log(
+                user=None,
+                action="Particionar Eventos",
+                status="SUCCESS",
+                message=f"Tabela de eventos convertida com {len(created)} partições"
+            )
+            self.stdout.write(f"Tabela de eventos convertida com {len(created)} partições mensais")
+
+        elif not partitions.is_partitioned():
+            raise CommandError("A tabela de eventos não está particionada (use --convert)")
+
+        else:
+            now = datetime.now(tz=timezone.utc)
+            created = partitions.ensure_partitions(now, options["months_ahead"])
+            self.stdout.write(f"{len(created)} partições criadas")
+
+        if options["retain_months"] is not None:
+            now = datetime.now(tz=timezone.utc)
+            before = partitions.month_start(now.year, now.month - options["retain_months"])
+            removed = partitions.drop_partitions(before, detach=options["detach"])
+
+            if removed:
+                report_log(
+                    user=None,
+                    action="Remover Partições de Eventos",
+                    status="INFO",
+                    message=(
+                        f"{len(removed)} partições anteriores a {before:%Y-%m} "
+                        f"{'destacadas' if options['detach'] else 'excluídas'}: {', '.join(removed)}"
+                    )
+                )
+
+            self.stdout.write(
+                f"{len(removed)} partições {'destacadas' if options['detach'] else 'excluídas'}"
+            )
@@ -0,0 +1,230 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import InterfaceError, OperationalError, close_old_connections
+
+from core.utils import report_log
+from monitoring import spool
+from monitoring.idempotency import find_duplicates, remember
+from monitoring.services import persist_events
+
+
+# Erros do banco de dados que não dependem do evento (indisponibilidade,
+# conexão perdida, timeout de bloqueio): os eventos voltam para a fila
+TRANSIENT_ERRORS = (InterfaceError, OperationalError)
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável por consumir a fila durável de ingestão.
+
+    Inicia um pool de workers que reivindicam eventos do diretório
+    de spool e os persistem no banco de dados em lotes, utilizando
+    o mesmo caminho de escrita do endpoint de lote.
+
+    Quando um lote falha, seus eventos são persistidos individualmente,
+    de modo que apenas os eventos inválidos sejam movidos para
+    `failed/`. Erros transitórios do banco de dados (TRANSIENT_ERRORS)
+    não movem eventos para `failed/`: os eventos são devolvidos à fila
+    e o worker aguarda antes de tentar novamente, dobrando a espera a
+    cada falha consecutiva (até MONITORING_SPOOL_RETRY_MAX_DELAY
+    segundos). Eventos abandonados por workers encerrados (concessão
+    expirada, ver MONITORING_SPOOL_LEASE_TIMEOUT) são devolvidos à fila
+    na inicialização e periodicamente, sem afetar os eventos em
+    processamento por outras instâncias do comando.
+
+    Uso:
+        python manage.py process_monitoring_queue --workers 4 --batch-size 200
+    """
+
+    help = "Persiste no banco de dados os eventos aceitos de forma assíncrona"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Quantidade de workers concorrentes"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Quantidade máxima de eventos persistidos por transação"
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Intervalo (segundos) entre consultas quando a fila está vazia"
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Processa a fila até esvaziar e encerra"
+        )
+
+    def handle(self, *args, **options):
+        self._recover()
+        recovered_at = time.monotonic()
+
+        stop = threading.Event()
+        workers = [
+            threading.Thread(
+                target=self._work,
+                args=(stop, options["batch_size"], options["poll_interval"], options["once"]),
+                name=f"monitoring-queue-{index}",
+                daemon=True,
+            )
+            for index in range(options["workers"])
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        try:
+            while any(worker.is_alive() for worker in workers):
+                time.sleep(0.5)
+
+                if time.monotonic() - recovered_at >= settings.MONITORING_SPOOL_LEASE_TIMEOUT:
+                    self._recover()
+                    recovered_at = time.monotonic()
+        except KeyboardInterrupt:
+            self.stdout.write("Encerrando workers...")
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def _recover(self) -> None:
+        """
+        Devolve à fila os eventos com concessão expirada.
+        """
+        recovered = spool.recover()
+        if recovered:
+            self.stdout.write(f"{recovered} eventos recuperados de processamento abandonado")
+
+    def _work(self, stop: threading.Event, batch_size: int, poll_interval: float, once: bool) -> None:
+        """
+        Laço principal de um worker da fila.
+        """
+        retry_delay = poll_interval
+
+        try:
+            while not stop.is_set():
+                entry_ids = spool.claim_batch(batch_size)
+
+                if not entry_ids:
+                    if once:
+                        return
+                    stop.wait(poll_interval)
+                    continue
+
+                close_old_connections()
+
+                if self._persist(entry_ids):
+                    retry_delay = poll_interval
+                    continue
+
+                # Erro transitório: os eventos permanecem na fila
+                if once:
+                    return
+                stop.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, settings.MONITORING_SPOOL_RETRY_MAX_DELAY)
+        finally:
+            close_old_connections()
+
+    def _persist(self, entry_ids: list[str]) -> bool:
+        """
+        Persiste um lote reivindicado e registra o resultado em log.
+
+        Caso o lote falhe, cada evento é persistido individualmente e
+        apenas os que falharem são movidos para `failed/`. Em erros
+        transitórios, os eventos ainda não persistidos são devolvidos
+        à fila.
+
+        Returns
+        -------
+        bool
+            False caso a persistência tenha sido interrompida por um
+            erro transitório.
+        """
+        try:
+            self._persist_batch(entry_ids)
+
+        except TRANSIENT_ERRORS as exc:
+            spool.release(entry_ids)
+            # O log no banco de dados provavelmente também falharia
+            self.stderr.write(
+                f"Erro transitório ao persistir {len(entry_ids)} eventos: {exc}. "
+                "Eventos devolvidos à fila"
+            )
+            return False
+
+        except Exception as exc:
+            if len(entry_ids) > 1:
+                report_log(
+                    user=None,
+                    action="Processar Fila de Eventos de Monitoramento",
+                    status="WARNING",
+                    message=(
+                        f"Erro ao persistir lote com {len(entry_ids)} eventos: {str(exc)}. "
+                        "Persistindo eventos individualmente"
+                    )
+                )
+
+                for index, entry_id in enumerate(entry_ids):
+                    if not self._persist([entry_id]):
+                        spool.release(entry_ids[index + 1:])
+                        return False
+                return True
+
+            spool.fail(entry_ids)
+            report_log(
+                user=None,
+                action="Processar Fila de Eventos de Monitoramento",
+                status="ERROR",
+                message=f"Erro ao persistir evento {entry_ids[0]}: {str(exc)}"
+            )
+            self.stderr.write(f"Falha ao persistir evento {entry_ids[0]}: {exc}")
+            return True
+
+        spool.complete(entry_ids)
+        report_log(
+            user=None,
+            action="Processar Fila de Eventos de Monitoramento",
+            status="SUCCESS",
+            message=f"Lote com {len(entry_ids)} eventos persistido"
+        )
+        return True
+
+    def _persist_batch(self, entry_ids: list[str]) -> None:
+        """
+        Carrega e persiste as entradas em uma única transação.
+        """
+        handles = []
+        try:
+            events, handles = spool.load_events(entry_ids)
+
+            # Descarta reenvios aceitos mais de uma vez antes da persistência
+            items = [
+                {
+                    "device": event.device,
+                    "detected_class": event.detected_class,
+                    "detected_at": event.detected_at,
+                    "idempotency_key": event.idempotency_key,
+                }
+                for event in events
+            ]
+            duplicates = find_duplicates(items)
+
+            persist_events([
+                event for index, event in enumerate(events)
+                if index not in duplicates
+            ])
+            remember(items)
+
+        finally:
+            for handle in handles:
+                handle.close()
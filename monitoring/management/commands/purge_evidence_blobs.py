@@ -0,0 +1,176 @@
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from monitoring.derivatives import derivative_name
+from monitoring.models import EvidenceBlob
+from monitoring.storage import EVIDENCE_DIR, evidence_storage
+from monitoring.uploads import staging_dir
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável por remover evidências sem referências.
+
+    Remove do storage e do banco de dados os blobs de evidência cuja
+    contagem de referências chegou a zero, além de arquivos órfãos
+    (evidências de transações desfeitas ou uploads interrompidos) que
+    não possuem blob associado e de arquivos abandonados no diretório
+    de preparação de uploads (ex.: processo encerrado durante a
+    requisição).
+
+    Apenas itens mais antigos que o período de carência são removidos,
+    evitando disputas com uploads concorrentes do mesmo conteúdo.
+
+    Uso:
+        python manage.py purge_evidence_blobs --grace-hours 24
+    """
+
+    help = "Remove evidências que não são referenciadas por nenhum evento"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Idade mínima (horas) de um item sem referências para remoção"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Quantidade de blobs removidos por transação"
+        )
+
+    def handle(self, *args, **options):
+        grace = timedelta(hours=options["grace_hours"])
+        storage = evidence_storage()
+
+        blobs = self._purge_blobs(storage, timezone.now() - grace, options["batch_size"])
+        orphans = self._purge_orphans(storage, time.time() - grace.total_seconds())
+        orphans += self._purge_staged(time.time() - grace.total_seconds())
+
+        self.stdout.write(
+            f"{blobs} blobs sem referências e {orphans} arquivos órfãos removidos"
+        )
+
+    def _purge_blobs(self, storage, cutoff, batch_size: int) -> int:
+        """
+        Remove os blobs sem referências atualizados antes de `cutoff`.
+
+        Blobs cujo arquivo foi reaproveitado recentemente por um upload
+        (mtime dentro do período de carência) são preservados.
+        """
+        removed = 0
+        last_name = ""
+
+        while True:
+            with transaction.atomic():
+                names = list(
+                    EvidenceBlob.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(ref_count=0, updated_at__lt=cutoff, name__gt=last_name)
+                    .order_by("name")
+                    .values_list("name", flat=True)[:batch_size]
+                )
+
+                if not names:
+                    return removed
+
+                last_name = names[-1]
+                stale = [
+                    name for name in names
+                    if not self._recently_touched(storage, name, cutoff.timestamp())
+                ]
+
+                EvidenceBlob.objects.filter(name__in=stale).delete()
+
+                # Remove os arquivos somente após o commit da transação
+                transaction.on_commit(
+                    lambda stale=stale: self._delete_files(storage, stale)
+                )
+
+            removed += len(stale)
+
+    def _delete_files(self, storage, names: list[str]) -> None:
+        """
+        Remove do storage as evidências e seus derivados.
+        """
+        for name in names:
+            storage.delete(name)
+            for size in settings.MONITORING_EVIDENCE_DERIVATIVES:
+                storage.delete(derivative_name(name, size))
+
+    def _recently_touched(self, storage, name: str, cutoff: float) -> bool:
+        """
+        Indica se o arquivo do blob foi gravado ou reaproveitado após `cutoff`.
+        """
+        try:
+            return os.path.getmtime(storage.path(name)) >= cutoff
+        except FileNotFoundError:
+            return False
+
+    def _purge_orphans(self, storage, cutoff: float) -> int:
+        """
+        Remove arquivos do diretório de evidências sem blob associado.
+
+        Arquivos gravados na raiz do diretório antes do armazenamento por
+        conteúdo não possuem blob e são preservados; na raiz, apenas
+        uploads interrompidos (`.part`) são considerados órfãos.
+        """
+        root = storage.path(EVIDENCE_DIR)
+        removed = 0
+
+        for directory, _, files in os.walk(root):
+            candidates = {}
+            for file_name in files:
+                if directory == root and not file_name.endswith(".part"):
+                    continue
+
+                path = os.path.join(directory, file_name)
+
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+
+                name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+                candidates[name] = path
+
+            if not candidates:
+                continue
+
+            referenced = set(
+                EvidenceBlob.objects
+                .filter(name__in=candidates)
+                .values_list("name", flat=True)
+            )
+
+            for name, path in candidates.items():
+                if name not in referenced:
+                    os.remove(path)
+                    removed += 1
+
+        return removed
+
+    def _purge_staged(self, cutoff: float) -> int:
+        """
+        Remove os uploads preparados e não concluídos antes de `cutoff`.
+        """
+        removed = 0
+
+        for path in staging_dir().iterdir():
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                # Upload concluído ou descartado concorrentemente
+                continue
+
+            removed += 1
+
+        return removed
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.utils import report_log
+from monitoring.mac import parse_mac
+from monitoring.models import DeviceCredential
+
+
+class Command(BaseCommand):
+    """
+    Comando responsável por revogar chaves de API de dispositivos edge.
+
+    Revoga uma chave pelo prefixo, ou todas as chaves ativas de um
+    dispositivo pelo MAC. A revogação vale imediatamente no banco de
+    dados; processos que já tenham a chave em cache deixam de aceitá-la
+    após MONITORING_DEVICE_KEY_CACHE_TTL segundos.
+
+    Uso:
+        python manage.py revoke_device_key --prefix 3f9a1c2b7d4e
+        python manage.py revoke_device_key --mac AA:BB:CC:DD:EE:FF
+    """
+
+    help = "Revoga chaves de API de dispositivos edge"
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument("--prefix", help="Prefixo da chave a revogar")
+        group.add_argument("--mac", help="MAC do dispositivo cujas chaves serão revogadas")
+
+    def handle(self, *args, **options):
+        credentials = DeviceCredential.objects.filter(revoked_at__isnull=True)
+
+        if options["prefix"]:
+            credentials = credentials.filter(prefix=options["prefix"])
+        else:
+            try:
+                credentials = credentials.filter(device__mac=parse_mac(options["mac"]))
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+        now = timezone.now()
+        revoked = []
+
+        # save() individual para disparar a invalidação do cache local
+        for credential in credentials:
+            credential.revoked_at = now
+            credential.save(update_fields=["revoked_at"])
+            revoked.append(credential.prefix)
+
+        if not revoked:
+            raise CommandError("Nenhuma chave ativa encontrada")
+
+        report_log(
+            user=None,
+            action="Revogar Chave de Dispositivo",
+            status="SUCCESS",
+            message=f"Chaves revogadas: {', '.join(revoked)}"
+        )
+
+        self.stdout.write(f"{len(revoked)} chave(s) revogada(s)")
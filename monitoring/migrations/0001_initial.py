@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonitoringEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mac_address', models.CharField(help_text='Identificador lógico do dispositivo edge (XX:XX:XX:XX:XX:XX)', max_length=17, verbose_name='MAC do Dispositivo')),
+                ('detected_class', models.CharField(help_text='Nome do objeto de risco identificado pelo modelo', max_length=100, verbose_name='Classe Detectada')),
+                ('detected_at', models.DateTimeField(help_text='Momento em que o objeto foi detectado no dispositivo edge', verbose_name='Data/Hora da Detecção')),
+                ('evidence', models.ImageField(help_text='Imagem capturada no momento da detecção', upload_to='monitoring/evidence/', verbose_name='Evidência Visual')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Momento em que o evento foi registrado no backend', verbose_name='Data de Registro')),
+            ],
+            options={
+                'verbose_name': 'Evento de Monitoramento',
+                'verbose_name_plural': 'Eventos de Monitoramento',
+                'ordering': ['-detected_at'],
+            },
+        ),
+    ]
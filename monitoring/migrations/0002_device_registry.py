@@ -0,0 +1,70 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Registro de dispositivos (etapa 1 de 3).
+
+    Cria os models Device, EvidenceBlob e DeviceCredential e a chave
+    estrangeira `device` dos eventos, inicialmente opcional: os
+    dispositivos dos eventos existentes são registrados a partir de
+    `mac_address` na migração seguinte.
+    """
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Device',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('mac', models.PositiveBigIntegerField(help_text='Endereço MAC do dispositivo edge como inteiro de 48 bits', unique=True, verbose_name='MAC')),
+                ('name', models.CharField(blank=True, help_text='Nome ou localização do dispositivo', max_length=100, verbose_name='Nome')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Momento em que o dispositivo enviou o primeiro evento', verbose_name='Data de Registro')),
+                ('throttle_rate', models.FloatField(blank=True, help_text='Requisições de ingestão por segundo (vazio utiliza MONITORING_THROTTLE_RATE)', null=True, verbose_name='Limite de Taxa')),
+                ('throttle_burst', models.PositiveIntegerField(blank=True, help_text='Requisições acumuláveis acima da taxa (vazio utiliza MONITORING_THROTTLE_BURST)', null=True, verbose_name='Rajada Máxima')),
+            ],
+            options={
+                'verbose_name': 'Dispositivo',
+                'verbose_name_plural': 'Dispositivos',
+            },
+        ),
+        migrations.CreateModel(
+            name='EvidenceBlob',
+            fields=[
+                ('name', models.CharField(help_text='Nome da evidência no storage (derivado do SHA-256)', max_length=255, primary_key=True, serialize=False, verbose_name='Arquivo')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Quantidade de eventos que referenciam a evidência', verbose_name='Referências')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de Registro')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Atualização')),
+            ],
+            options={
+                'verbose_name': 'Blob de Evidência',
+                'verbose_name_plural': 'Blobs de Evidência',
+            },
+        ),
+        migrations.CreateModel(
+            name='DeviceCredential',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(help_text='Identificador público da chave', max_length=16, unique=True, verbose_name='Prefixo')),
+                ('key_hash', models.CharField(help_text='SHA-256 (hexadecimal) do segredo da chave', max_length=64, verbose_name='Hash da Chave')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de Emissão')),
+                ('revoked_at', models.DateTimeField(blank=True, null=True, verbose_name='Data de Revogação')),
+                ('device', models.ForeignKey(help_text='Dispositivo autorizado pela chave', on_delete=django.db.models.deletion.CASCADE, related_name='credentials', to='monitoring.device', verbose_name='Dispositivo')),
+            ],
+            options={
+                'verbose_name': 'Chave de Dispositivo',
+                'verbose_name_plural': 'Chaves de Dispositivos',
+            },
+        ),
+        migrations.AddField(
+            model_name='monitoringevent',
+            name='device',
+            field=models.ForeignKey(db_index=False, help_text='Dispositivo edge que gerou o evento', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='events', to='monitoring.device', verbose_name='Dispositivo'),
+        ),
+    ]
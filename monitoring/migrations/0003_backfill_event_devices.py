@@ -0,0 +1,79 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:10
+
+import re
+
+from django.db import migrations
+
+
+# Formatos aceitos pela versão anterior da API (17 caracteres,
+# separados por ":" ou "-")
+LEGACY_MAC_PATTERN = re.compile(r"^[0-9A-Fa-f]{2}([:-][0-9A-Fa-f]{2}){5}$")
+
+
+def legacy_mac(value: str) -> int | None:
+    """
+    Converte o MAC textual de um evento existente em inteiro, ou
+    retorna None caso o valor não seja um endereço MAC.
+    """
+    value = (value or "").strip()
+
+    if not LEGACY_MAC_PATTERN.match(value):
+        return None
+
+    return int(re.sub("[:-]", "", value), 16)
+
+
+def backfill_devices(apps, schema_editor):
+    """
+    Registra um dispositivo para cada `mac_address` distinto dos
+    eventos existentes e preenche a chave estrangeira `device`.
+
+    A migração é interrompida, sem alterar os eventos, caso algum
+    `mac_address` não seja um endereço MAC válido: esses eventos
+    devem ser corrigidos (ou removidos) antes de repetir `migrate`.
+    """
+    Device = apps.get_model("monitoring", "Device")
+    MonitoringEvent = apps.get_model("monitoring", "MonitoringEvent")
+
+    values = list(
+        MonitoringEvent.objects
+        .filter(device__isnull=True)
+        .values_list("mac_address", flat=True)
+        .distinct()
+    )
+    macs = {value: legacy_mac(value) for value in values}
+    invalid = sorted(value for value, mac in macs.items() if mac is None)
+
+    if invalid:
+        raise RuntimeError(
+            f"{len(invalid)} valor(es) de mac_address inválido(s) em eventos existentes "
+            f"(ex.: {', '.join(repr(value) for value in invalid[:10])}). "
+            "Corrija ou remova esses eventos e execute migrate novamente."
+        )
+
+    for mac in set(macs.values()):
+        Device.objects.get_or_create(mac=mac)
+
+    devices = dict(Device.objects.values_list("mac", "id"))
+
+    # Um UPDATE por valor distinto de mac_address (e não por evento)
+    for value, mac in macs.items():
+        MonitoringEvent.objects.filter(
+            device__isnull=True,
+            mac_address=value
+        ).update(device_id=devices[mac])
+
+
+class Migration(migrations.Migration):
+    """
+    Registro de dispositivos (etapa 2 de 3): preenche `device` dos
+    eventos existentes a partir de `mac_address`.
+    """
+
+    dependencies = [
+        ('monitoring', '0002_device_registry'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_devices, migrations.RunPython.noop),
+    ]
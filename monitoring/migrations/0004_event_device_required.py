@@ -0,0 +1,83 @@
+# Generated by Django 5.2.10 on 2026-10-17 02:06
+
+import django.db.models.deletion
+import monitoring.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Registro de dispositivos (etapa 3 de 3): torna `device` obrigatório,
+    remove `mac_address` e adiciona incidentes, idempotência e índices.
+    """
+
+    dependencies = [
+        ('monitoring', '0003_backfill_event_devices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Incident',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detected_class', models.CharField(help_text='Nome do objeto de risco identificado pelo modelo', max_length=100, verbose_name='Classe Detectada')),
+                ('first_detected_at', models.DateTimeField(help_text='Momento da primeira detecção agrupada no incidente', verbose_name='Primeira Detecção')),
+                ('last_detected_at', models.DateTimeField(help_text='Momento da última detecção agrupada no incidente', verbose_name='Última Detecção')),
+                ('event_count', models.PositiveIntegerField(default=1, help_text='Quantidade de detecções agrupadas no incidente', verbose_name='Quantidade de Detecções')),
+            ],
+            options={
+                'verbose_name': 'Incidente',
+                'verbose_name_plural': 'Incidentes',
+                'ordering': ['-last_detected_at'],
+            },
+        ),
+        migrations.RemoveField(
+            model_name='monitoringevent',
+            name='mac_address',
+        ),
+        migrations.AddField(
+            model_name='monitoringevent',
+            name='idempotency_key',
+            field=models.CharField(blank=True, help_text='Identificador enviado pelo dispositivo para deduplicar reenvios (único por dispositivo)', max_length=255, null=True, verbose_name='Chave de Idempotência'),
+        ),
+        migrations.AlterField(
+            model_name='monitoringevent',
+            name='device',
+            field=models.ForeignKey(db_index=False, help_text='Dispositivo edge que gerou o evento', on_delete=django.db.models.deletion.PROTECT, related_name='events', to='monitoring.device', verbose_name='Dispositivo'),
+        ),
+        migrations.AlterField(
+            model_name='monitoringevent',
+            name='evidence',
+            field=models.ImageField(help_text='Imagem capturada no momento da detecção', storage=monitoring.storage.evidence_storage, upload_to='monitoring/evidence/', verbose_name='Evidência Visual'),
+        ),
+        migrations.AddIndex(
+            model_name='monitoringevent',
+            index=models.Index(fields=['detected_at'], name='monitoring_detected_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitoringevent',
+            index=models.Index(fields=['device', 'detected_at'], name='monitoring_device_detected_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monitoringevent',
+            index=models.Index(fields=['detected_class', 'detected_at'], name='monitoring_class_detected_idx'),
+        ),
+        migrations.AddField(
+            model_name='incident',
+            name='device',
+            field=models.ForeignKey(db_index=False, help_text='Dispositivo edge que gerou as detecções', on_delete=django.db.models.deletion.PROTECT, related_name='incidents', to='monitoring.device', verbose_name='Dispositivo'),
+        ),
+        migrations.AddField(
+            model_name='incident',
+            name='representative',
+            field=models.ForeignKey(blank=True, help_text='Evento persistido (com evidência) que representa o incidente', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='incidents', to='monitoring.monitoringevent', verbose_name='Evento Representativo'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['device', 'detected_class', 'last_detected_at'], name='incident_open_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='monitoringevent',
+            constraint=models.UniqueConstraint(fields=('device', 'idempotency_key'), name='monitoring_device_idempotency_uniq'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-17 01:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0004_event_device_required'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='incident',
+            name='representative',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Evento persistido (com evidência) que representa o incidente', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='incidents', to='monitoring.monitoringevent', verbose_name='Evento Representativo'),
+        ),
+    ]
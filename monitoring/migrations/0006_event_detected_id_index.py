@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0005_incident_representative_no_constraint'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='monitoringevent',
+            name='monitoring_detected_idx',
+        ),
+        migrations.AddIndex(
+            model_name='monitoringevent',
+            index=models.Index(fields=['detected_at', 'id'], name='monitoring_detected_idx'),
+        ),
+    ]
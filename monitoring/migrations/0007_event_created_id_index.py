@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-17 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0006_event_detected_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='monitoringevent',
+            index=models.Index(fields=['created_at', 'id'], name='monitoring_created_id_idx'),
+        ),
+    ]
@@ -1,5 +1,146 @@
 from django.db import models
 
+from .mac import format_mac
+from .storage import evidence_storage
+
+
+class Device(models.Model):
+    """
+    Model responsável por representar um dispositivo edge.
+
+    O dispositivo é identificado pelo endereço MAC, armazenado como
+    inteiro de 48 bits, e referenciado pelos eventos por uma chave
+    estrangeira compacta, em vez de repetir o MAC textual em cada
+    registro. Dispositivos são registrados automaticamente no primeiro
+    evento recebido (ver `monitoring.devices`).
+    """
+    # Chave de 4 bytes: referenciada por todos os eventos e índices
+    id = models.AutoField(primary_key=True)
+
+    mac = models.PositiveBigIntegerField(
+        unique=True,
+        verbose_name="MAC",
+        help_text="Endereço MAC do dispositivo edge como inteiro de 48 bits"
+    )
+
+    name = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Nome",
+        help_text="Nome ou localização do dispositivo"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Data de Registro",
+        help_text="Momento em que o dispositivo enviou o primeiro evento"
+    )
+
+    throttle_rate = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Limite de Taxa",
+        help_text="Requisições de ingestão por segundo (vazio utiliza MONITORING_THROTTLE_RATE)"
+    )
+
+    throttle_burst = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Rajada Máxima",
+        help_text="Requisições acumuláveis acima da taxa (vazio utiliza MONITORING_THROTTLE_BURST)"
+    )
+
+    @property
+    def mac_address(self) -> str:
+        """
+        Endereço MAC no formato XX:XX:XX:XX:XX:XX.
+        """
+        return format_mac(self.mac)
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação legível do dispositivo.
+
+        Returns
+        -------
+        str
+            Representação textual do dispositivo.
+        """
+        if self.name:
+            return f"{self.mac_address} ({self.name})"
+        return self.mac_address
+
+    class Meta:
+        """
+        Metadados do model Device.
+        """
+        verbose_name = "Dispositivo"
+        verbose_name_plural = "Dispositivos"
+
+
+class DeviceCredential(models.Model):
+    """
+    Model responsável pelas chaves de API de longa duração dos dispositivos.
+
+    A chave entregue ao dispositivo tem o formato `<prefixo>.<segredo>`.
+    Apenas o prefixo (utilizado na busca) e o SHA-256 do segredo são
+    armazenados; o segredo é aleatório e de alta entropia, dispensando
+    um hash lento como o PBKDF2 das senhas de usuários.
+
+    Chaves revogadas permanecem registradas para auditoria.
+    """
+    device = models.ForeignKey(
+        Device,
+        on_delete=models.CASCADE,
+        related_name="credentials",
+        verbose_name="Dispositivo",
+        help_text="Dispositivo autorizado pela chave"
+    )
+
+    prefix = models.CharField(
+        max_length=16,
+        unique=True,
+        verbose_name="Prefixo",
+        help_text="Identificador público da chave"
+    )
+
+    key_hash = models.CharField(
+        max_length=64,
+        verbose_name="Hash da Chave",
+        help_text="SHA-256 (hexadecimal) do segredo da chave"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Data de Emissão"
+    )
+
+    revoked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Data de Revogação"
+    )
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação legível da chave.
+
+        Returns
+        -------
+        str
+            Representação textual da chave.
+        """
+        status = "revogada" if self.revoked_at else "ativa"
+        return f"{self.prefix} | {self.device} | {status}"
+
+    class Meta:
+        """
+        Metadados do model DeviceCredential.
+        """
+        verbose_name = "Chave de Dispositivo"
+        verbose_name_plural = "Chaves de Dispositivos"
+
+
 class MonitoringEvent(models.Model):
     """
     Model responsável por representar um evento de monitoramento
@@ -10,10 +151,14 @@ class MonitoringEvent(models.Model):
     para auditoria, rastreabilidade e posterior análise em
     dashboards e relatórios.
     """
-    mac_address = models.CharField(
-        max_length=17,
-        verbose_name="MAC do Dispositivo",
-        help_text="Identificador lógico do dispositivo edge (XX:XX:XX:XX:XX:XX)"
+    # Sem índice próprio: coberto pelo índice (device, detected_at)
+    device = models.ForeignKey(
+        Device,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name="events",
+        verbose_name="Dispositivo",
+        help_text="Dispositivo edge que gerou o evento"
     )
     
     detected_class = models.CharField(
@@ -29,6 +174,7 @@ class MonitoringEvent(models.Model):
     
     evidence = models.ImageField(
         upload_to="monitoring/evidence/",
+        storage=evidence_storage,
         verbose_name="Evidência Visual",
         help_text="Imagem capturada no momento da detecção"
     )
@@ -38,6 +184,24 @@ class MonitoringEvent(models.Model):
         verbose_name="Data de Registro",
         help_text="Momento em que o evento foi registrado no backend"
     )
+
+    idempotency_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name="Chave de Idempotência",
+        help_text="Identificador enviado pelo dispositivo para deduplicar reenvios (único por dispositivo)"
+    )
+
+    @property
+    def mac_address(self) -> str:
+        """
+        Endereço MAC do dispositivo no formato XX:XX:XX:XX:XX:XX.
+
+        Consultas que exibem o MAC de vários eventos devem utilizar
+        `select_related("device")`.
+        """
+        return self.device.mac_address
     
     def __str__(self) -> str:
         """
@@ -57,12 +221,185 @@ class MonitoringEvent(models.Model):
         """
         Metadados do model MonitoringEvent.
 
-        Define nomes legíveis para a interface administrativa
-        e a ordenação padrão dos registros (mais recentes primeiro).
+        Define nomes legíveis para a interface administrativa,
+        a ordenação padrão dos registros (mais recentes primeiro),
+        os índices utilizados nas consultas de ingestão e a unicidade
+        da chave de idempotência por dispositivo.
         """
         verbose_name = "Evento de Monitoramento"
         verbose_name_plural = "Eventos de Monitoramento"
         ordering = ["-detected_at"]
-    
-    
-    
+        indexes = [
+            # Filtro por intervalo e paginação por cursor (detected_at, id)
+            # do dashboard e da listagem
+            models.Index(
+                fields=["detected_at", "id"],
+                name="monitoring_detected_idx"
+            ),
+            # Chave natural utilizada na detecção de reenvios e
+            # consultas por dispositivo
+            models.Index(
+                fields=["device", "detected_at"],
+                name="monitoring_device_detected_idx"
+            ),
+            # Consultas por classe detectada em um intervalo
+            models.Index(
+                fields=["detected_class", "detected_at"],
+                name="monitoring_class_detected_idx"
+            ),
+            # Feed de alterações do dashboard (eventos registrados após
+            # o cursor (created_at, id))
+            models.Index(
+                fields=["created_at", "id"],
+                name="monitoring_created_id_idx"
+            ),
+        ]
+        constraints = [
+            # Chaves geradas por dispositivos distintos podem coincidir
+            models.UniqueConstraint(
+                fields=["device", "idempotency_key"],
+                name="monitoring_device_idempotency_uniq"
+            ),
+        ]
+
+
+class EvidenceBlob(models.Model):
+    """
+    Model responsável pela contagem de referências das evidências.
+
+    As evidências são armazenadas por conteúdo (ver EvidenceStorage):
+    eventos com imagens idênticas apontam para o mesmo arquivo. Cada
+    instância deste model representa um arquivo armazenado e a
+    quantidade de eventos que o referenciam.
+
+    Blobs sem referências não são removidos imediatamente, mas pelo
+    comando `purge_evidence_blobs`, após um período de carência.
+    """
+    name = models.CharField(
+        max_length=255,
+        primary_key=True,
+        verbose_name="Arquivo",
+        help_text="Nome da evidência no storage (derivado do SHA-256)"
+    )
+
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Referências",
+        help_text="Quantidade de eventos que referenciam a evidência"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Data de Registro"
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Última Atualização"
+    )
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação legível do blob de evidência.
+
+        Returns
+        -------
+        str
+            Representação textual do blob.
+        """
+        return f"{self.name} ({self.ref_count} referências)"
+
+    class Meta:
+        """
+        Metadados do model EvidenceBlob.
+        """
+        verbose_name = "Blob de Evidência"
+        verbose_name_plural = "Blobs de Evidência"
+
+
+class Incident(models.Model):
+    """
+    Model responsável por representar um incidente de monitoramento.
+
+    Um incidente agrupa as detecções de uma mesma classe, em um mesmo
+    dispositivo, ocorridas dentro da janela configurada em
+    MONITORING_COALESCE_WINDOW. Apenas o primeiro evento do incidente é
+    persistido (evento representativo, com sua evidência); os demais
+    apenas atualizam a contagem e o intervalo de tempo do incidente.
+    """
+    # Sem índice próprio: coberto pelo índice de busca do incidente aberto
+    device = models.ForeignKey(
+        Device,
+        on_delete=models.PROTECT,
+        db_index=False,
+        related_name="incidents",
+        verbose_name="Dispositivo",
+        help_text="Dispositivo edge que gerou as detecções"
+    )
+
+    detected_class = models.CharField(
+        max_length=100,
+        verbose_name="Classe Detectada",
+        help_text="Nome do objeto de risco identificado pelo modelo"
+    )
+
+    first_detected_at = models.DateTimeField(
+        verbose_name="Primeira Detecção",
+        help_text="Momento da primeira detecção agrupada no incidente"
+    )
+
+    last_detected_at = models.DateTimeField(
+        verbose_name="Última Detecção",
+        help_text="Momento da última detecção agrupada no incidente"
+    )
+
+    event_count = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Quantidade de Detecções",
+        help_text="Quantidade de detecções agrupadas no incidente"
+    )
+
+    # Sem constraint no banco: chaves estrangeiras não podem referenciar
+    # a tabela de eventos particionada (ver monitoring.partitions). O
+    # SET_NULL é aplicado pelo ORM, e a remoção de partições limpa as
+    # referências aos eventos removidos
+    representative = models.ForeignKey(
+        MonitoringEvent,
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="incidents",
+        verbose_name="Evento Representativo",
+        help_text="Evento persistido (com evidência) que representa o incidente"
+    )
+
+    def __str__(self) -> str:
+        """
+        Retorna uma representação legível do incidente.
+
+        Returns
+        -------
+        str
+            Representação textual do incidente.
+        """
+        return (
+            f"{self.device.mac_address} | {self.detected_class} | "
+            f"{self.first_detected_at} - {self.last_detected_at} "
+            f"({self.event_count})"
+        )
+
+    class Meta:
+        """
+        Metadados do model Incident.
+        """
+        verbose_name = "Incidente"
+        verbose_name_plural = "Incidentes"
+        ordering = ["-last_detected_at"]
+        indexes = [
+            # Busca do incidente aberto de um dispositivo/classe
+            models.Index(
+                fields=["device", "detected_class", "last_detected_at"],
+                name="incident_open_lookup_idx"
+            ),
+        ]
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.http.multipartparser import MultiPartParser as DjangoMultiPartParser
+from django.http.multipartparser import MultiPartParserError
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+from .uploads import EvidenceUploadHandler
+
+
+class EvidenceMultiPartParser(MultiPartParser):
+    """
+    Parser multipart que grava as evidências diretamente no storage final.
+
+    Substitui os upload handlers padrão do Django (memória / arquivo
+    temporário) pelo EvidenceUploadHandler, evitando que os bytes de
+    cada imagem sejam copiados novamente ao salvar o evento.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Processa o corpo multipart utilizando o EvidenceUploadHandler.
+
+        Returns
+        -------
+        DataAndFiles
+            Campos do formulário e evidências já gravadas no storage.
+        """
+        parser_context = parser_context or {}
+        request = parser_context["request"]
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta["CONTENT_TYPE"] = media_type
+        upload_handlers = [EvidenceUploadHandler(request._request)]
+
+        try:
+            parser = DjangoMultiPartParser(meta, stream, upload_handlers, encoding)
+            data, files = parser.parse()
+            return DataAndFiles(data, files)
+        except MultiPartParserError as exc:
+            raise ParseError(f"Erro ao processar multipart - {str(exc)}")
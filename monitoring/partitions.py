@@ -0,0 +1,327 @@
+"""
+Particionamento mensal da tabela de eventos no PostgreSQL.
+
+Opcional: a tabela de MonitoringEvent criada pelas migrações é uma
+tabela comum em qualquer banco de dados. No PostgreSQL, o comando
+`manage_partitions --convert` a converte em uma tabela particionada
+por intervalo de `detected_at`, com uma partição por mês (UTC) e uma
+partição padrão que recebe eventos fora das partições existentes
+(ex.: relógio incorreto no dispositivo).
+
+Com a tabela particionada:
+- Consultas por intervalo de datas (dashboard) leem apenas as
+  partições do intervalo (partition pruning)
+- Os índices de cada partição têm tamanho limitado a um mês de eventos
+- Meses antigos são removidos destacando ou excluindo a partição
+  inteira, sem DELETE linha a linha
+
+Restrições do particionamento no PostgreSQL:
+- A chave primária passa a ser (id, detected_at), e a unicidade de
+  (device, idempotency_key) passa a ser (device, idempotency_key,
+  detected_at). Reenvios de um mesmo evento possuem a mesma data/hora
+  de detecção e continuam sendo rejeitados; a detecção de reenvios da
+  aplicação (monitoring.idempotency) não depende da constraint
+- Outras tabelas não podem declarar chaves estrangeiras para a tabela
+  de eventos (ver Incident.representative)
+
+As partições futuras devem ser criadas periodicamente (ex.: cron
+diário executando `manage_partitions`); eventos sem partição mensal são
+gravados na partição padrão e movidos ao criar a partição do mês.
+"""
+import re
+from collections import Counter
+from datetime import datetime, timezone
+
+from django.db import connection, transaction
+
+from .models import Device, Incident, MonitoringEvent
+from .services import release_evidence
+
+
+TABLE = MonitoringEvent._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_PATTERN = re.compile(rf"^{re.escape(TABLE)}_y(\d{{4}})m(\d{{2}})$")
+
+
+def quote(name: str) -> str:
+    """
+    Delimita um identificador SQL.
+    """
+    return connection.ops.quote_name(name)
+
+
+def month_start(year: int, month: int) -> datetime:
+    """
+    Início do mês informado, em UTC.
+
+    Aceita meses fora do intervalo 1-12, normalizando o ano
+    (ex.: mês 13 corresponde a janeiro do ano seguinte).
+    """
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(year: int, month: int) -> str:
+    """
+    Nome da partição do mês informado.
+    """
+    return f"{TABLE}_y{year:04d}m{month:02d}"
+
+
+def is_supported() -> bool:
+    """
+    Indica se o banco de dados configurado suporta o particionamento.
+    """
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned() -> bool:
+    """
+    Indica se a tabela de eventos já está particionada.
+    """
+    if not is_supported():
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> list[tuple[str, datetime]]:
+    """
+    Lista as partições mensais da tabela de eventos.
+
+    Returns
+    -------
+    list[tuple[str, datetime]]
+        Nome e início do mês de cada partição, em ordem cronológica.
+        A partição padrão não é incluída.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, month_start(int(match[1]), int(match[2]))))
+
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(year: int, month: int) -> bool:
+    """
+    Cria a partição do mês informado, caso ainda não exista.
+
+    Eventos do mês gravados na partição padrão são movidos para a nova
+    partição na mesma transação.
+
+    Returns
+    -------
+    bool
+        True caso a partição tenha sido criada.
+    """
+    name = partition_name(year, month)
+    lower, upper = month_start(year, month), month_start(year, month + 1)
+
+    if name in dict(list_partitions()):
+        return False
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {quote(DEFAULT_PARTITION)} "
+            "WHERE detected_at >= %s AND detected_at < %s)",
+            [lower, upper]
+        )
+        pending = cursor.fetchone()[0]
+
+        if not pending:
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} PARTITION OF {quote(TABLE)} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [lower, upper]
+            )
+            return True
+
+        # A partição padrão não pode conter eventos do intervalo da nova
+        # partição: os eventos são movidos para uma tabela avulsa, que
+        # então é anexada como partição
+        cursor.execute(
+            f"CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} INCLUDING DEFAULTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} "
+            "WHERE detected_at >= %s AND detected_at < %s RETURNING *) "
+            f"INSERT INTO {quote(name)} SELECT * FROM moved",
+            [lower, upper]
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [lower, upper]
+        )
+
+    return True
+
+
+def ensure_partitions(start: datetime, months_ahead: int) -> list[str]:
+    """
+    Cria as partições mensais do mês de `start` até `months_ahead`
+    meses após o mês corrente.
+
+    Returns
+    -------
+    list[str]
+        Nomes das partições criadas.
+    """
+    now = datetime.now(tz=timezone.utc)
+    last = month_start(now.year, now.month + months_ahead)
+    current = month_start(start.year, start.month)
+
+    created = []
+    while current <= last:
+        if create_partition(current.year, current.month):
+            created.append(partition_name(current.year, current.month))
+
+        current = month_start(current.year, current.month + 1)
+
+    return created
+
+
+def convert_to_partitioned(months_ahead: int, horizon_months: int) -> list[str]:
+    """
+    Converte a tabela de eventos em uma tabela particionada por mês.
+
+    Os eventos existentes são copiados para as partições mensais em
+    uma única transação, que mantém a tabela bloqueada durante a
+    conversão: deve ser executada em janela de manutenção.
+
+    As partições mensais são criadas a partir do evento mais antigo,
+    limitado a `horizon_months` meses antes do mês corrente: eventos
+    anteriores (ex.: relógio do dispositivo zerado) são gravados na
+    partição padrão, em vez de criarem uma partição por mês desde a
+    data incorreta. São removidos da partição padrão pela retenção
+    (`archive_events`).
+
+    Returns
+    -------
+    list[str]
+        Nomes das partições criadas.
+    """
+    legacy = f"{TABLE}_legacy"
+    sequence = f"{TABLE}_id_seq"
+
+    with connection.schema_editor(atomic=True) as editor:
+        editor.execute(f"LOCK TABLE {quote(TABLE)} IN ACCESS EXCLUSIVE MODE")
+        editor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(legacy)}")
+
+        editor.execute(
+            f"CREATE TABLE {quote(TABLE)} (LIKE {quote(legacy)} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (detected_at)"
+        )
+        editor.execute(f"CREATE TABLE {quote(DEFAULT_PARTITION)} PARTITION OF {quote(TABLE)} DEFAULT")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT MIN(detected_at) FROM {quote(legacy)}")
+            oldest = cursor.fetchone()[0]
+
+        now = datetime.now(tz=timezone.utc)
+        horizon = month_start(now.year, now.month - horizon_months)
+        start = max(oldest, horizon) if oldest else now
+
+        created = ensure_partitions(start, months_ahead)
+
+        editor.execute(f"INSERT INTO {quote(TABLE)} SELECT * FROM {quote(legacy)}")
+        editor.execute(f"DROP TABLE {quote(legacy)}")
+
+        # A coluna de identidade da tabela original é removida com ela;
+        # os identificadores passam a ser gerados por uma sequência comum
+        editor.execute(f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(TABLE)}.id")
+        editor.execute(
+            f"SELECT setval(%s, COALESCE((SELECT MAX(id) FROM {quote(TABLE)}), 0) + 1, false)",
+            [sequence]
+        )
+        editor.execute(
+            f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)",
+            [sequence]
+        )
+
+        editor.execute(
+            f"ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(f'{TABLE}_pkey')} "
+            "PRIMARY KEY (id, detected_at)"
+        )
+        editor.execute(
+            f"ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote('monitoring_device_idempotency_uniq')} "
+            "UNIQUE (device_id, idempotency_key, detected_at)"
+        )
+        editor.execute(
+            f"ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(f'{TABLE}_device_id_fk')} "
+            f"FOREIGN KEY (device_id) REFERENCES {quote(Device._meta.db_table)} (id) "
+            "DEFERRABLE INITIALLY DEFERRED"
+        )
+
+        for index in MonitoringEvent._meta.indexes:
+            editor.add_index(MonitoringEvent, index)
+
+    return created
+
+
+def drop_partitions(before: datetime, detach: bool = False) -> list[str]:
+    """
+    Remove as partições mensais encerradas antes de `before`.
+
+    Parameters
+    ----------
+    before : datetime
+        Partições cujo mês termina até este instante são removidas.
+    detach : bool
+        Apenas destaca as partições, mantendo-as como tabelas avulsas
+        (ex.: para arquivamento). As evidências dos eventos destacados
+        continuam referenciadas.
+
+    Returns
+    -------
+    list[str]
+        Nomes das partições removidas ou destacadas.
+    """
+    removed = []
+
+    for name, start in list_partitions():
+        if month_start(start.year, start.month + 1) > before:
+            break
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Equivalente ao SET_NULL aplicado pelo ORM na exclusão de eventos
+            cursor.execute(
+                f"UPDATE {quote(Incident._meta.db_table)} SET representative_id = NULL "
+                f"WHERE representative_id IN (SELECT id FROM {quote(name)})"
+            )
+            cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+
+            if not detach:
+                cursor.execute(
+                    f"SELECT evidence, COUNT(*) FROM {quote(name)} "
+                    "WHERE evidence <> '' GROUP BY evidence"
+                )
+                references = Counter(dict(cursor.fetchall()))
+
+                cursor.execute(f"DROP TABLE {quote(name)}")
+                release_evidence(references)
+
+        removed.append(name)
+
+    return removed
@@ -1,5 +1,20 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
+from .devices import lookup_device
+from .idempotency import INVALID_IDEMPOTENCY_KEY, is_valid_idempotency_key
+from .mac import parse_mac
 from .models import MonitoringEvent
+from .services import persist_events
+
+
+# Tolerância para relógios de dispositivos adiantados (mesma regra do
+# protocolo binário)
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
 
 class MonitoringEventSerializer(serializers.ModelSerializer):
     """
@@ -9,6 +24,12 @@ class MonitoringEventSerializer(serializers.ModelSerializer):
     dos dispositivos edge, garantindo a integridade e o formato correto
     das informações antes da persistência no banco de dados.
     """
+    # Campo da API; internamente o evento referencia o dispositivo
+    mac_address = serializers.CharField(
+        max_length=17,
+        help_text="Endereço MAC do dispositivo edge (XX:XX:XX:XX:XX:XX)"
+    )
+
     class Meta:
         """
         Metadados do serializer MonitoringEventSerializer.
@@ -22,15 +43,68 @@ class MonitoringEventSerializer(serializers.ModelSerializer):
             "detected_class",
             "detected_at",
             "evidence",
+            "idempotency_key",
         ]
+        extra_kwargs = {
+            # A unicidade é tratada pela detecção de reenvios, que
+            # responde ao dispositivo sem erro de validação
+            "idempotency_key": {
+                "write_only": True,
+                "required": False,
+                "validators": [],
+            },
+        }
+
+    def create(self, validated_data: dict) -> MonitoringEvent:
+        """
+        Cria o evento utilizando o caminho central de persistência.
+
+        Parameters
+        ----------
+        validated_data : dict
+            Dados validados do evento.
+
+        Returns
+        -------
+        MonitoringEvent
+            Evento persistido.
+        """
+        return persist_events([MonitoringEvent(**validated_data)])[0]
 
-    def validate_mac_address(self, value: str) -> str:
+    def validate_detected_at(self, value):
+        """
+        Rejeita detecções com data/hora no futuro, além da tolerância
+        de MAX_CLOCK_SKEW para relógios adiantados.
+
+        Raises
+        ------
+        serializers.ValidationError
+            Caso a data/hora esteja no futuro.
+        """
+        if value > timezone.now() + MAX_CLOCK_SKEW:
+            raise serializers.ValidationError("Data/hora da detecção no futuro")
+        return value
+
+    def validate_idempotency_key(self, value: str | None) -> str | None:
+        """
+        Valida a chave de idempotência informada no item.
+
+        Raises
+        ------
+        serializers.ValidationError
+            Caso a chave contenha caracteres não imprimíveis.
+        """
+        if value and not is_valid_idempotency_key(value):
+            raise serializers.ValidationError(INVALID_IDEMPOTENCY_KEY)
+        return value
+
+    def validate_mac_address(self, value: str) -> int:
         """
         Valida o formato do endereço MAC informado.
 
-        Este método garante que o valor informado possua o tamanho
-        esperado de um endereço MAC e normaliza o conteúdo para
-        letras maiúsculas.
+        Este método garante que o valor informado esteja no formato
+        XX:XX:XX:XX:XX:XX (dígitos hexadecimais) e o converte para o
+        inteiro de 48 bits que identifica o dispositivo.
 
         Parameters
         ----------
@@ -39,16 +113,108 @@ class MonitoringEventSerializer(serializers.ModelSerializer):
 
         Returns
         -------
-        str
-            Endereço MAC validado e normalizado.
+        int
+            Endereço MAC como inteiro.
 
         Raises
         ------
         serializers.ValidationError
             Caso o formato do endereço MAC seja inválido.
         """
-        if len(value) != 17:
+        try:
+            return parse_mac(value)
+        except ValueError:
             raise serializers.ValidationError(
                 "MAC address inválido. Formato esperado XX:XX:XX:XX:XX:XX"
             )
-        return value.upper()
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Substitui o MAC recebido pelo dispositivo correspondente.
+
+        O dispositivo é resolvido pelo cache em memória de
+        `monitoring.devices`, sem registrá-lo: dispositivos ainda não
+        registrados são gravados por `persist_events`.
+
+        Parameters
+        ----------
+        attrs : dict
+            Dados validados campo a campo.
+
+        Returns
+        -------
+        dict
+            Dados do evento, com `device` no lugar de `mac_address`.
+        """
+        attrs["device"] = lookup_device(attrs.pop("mac_address"))
+        return attrs
+
+
+def build_batch_items(data) -> list[dict]:
+    """
+    Monta a lista de itens de um lote de eventos recebido via multipart.
+
+    O lote é composto pelo campo `events`, contendo uma lista JSON com
+    os metadados de cada evento (incluindo, opcionalmente, sua
+    `idempotency_key`), e por um arquivo de evidência para cada item,
+    enviado na parte `evidence_<índice>`.
+
+    Parameters
+    ----------
+    data : QueryDict
+        Dados da requisição multipart (campos e arquivos).
+
+    Returns
+    -------
+    list[dict]
+        Itens prontos para validação pelo MonitoringEventSerializer.
+
+    Raises
+    ------
+    serializers.ValidationError
+        Caso o campo `events` esteja ausente, malformado ou exceda
+        o tamanho máximo de lote permitido.
+    """
+    raw_events = data.get("events")
+
+    if not raw_events:
+        raise serializers.ValidationError(
+            {"events": "Campo events é obrigatório"}
+        )
+
+    try:
+        events = json.loads(raw_events)
+    except (TypeError, ValueError):
+        raise serializers.ValidationError(
+            {"events": "Campo events deve conter uma lista JSON"}
+        )
+
+    if not isinstance(events, list) or not events:
+        raise serializers.ValidationError(
+            {"events": "Campo events deve conter uma lista JSON não vazia"}
+        )
+
+    if len(events) > settings.MONITORING_BATCH_MAX_SIZE:
+        raise serializers.ValidationError(
+            {
+                "events": (
+                    "Lote excede o limite de "
+                    f"{settings.MONITORING_BATCH_MAX_SIZE} eventos"
+                )
+            }
+        )
+
+    items = []
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            event = {}
+
+        items.append({
+            "mac_address": event.get("mac_address"),
+            "detected_class": event.get("detected_class"),
+            "detected_at": event.get("detected_at"),
+            "evidence": data.get(f"evidence_{index}"),
+            "idempotency_key": event.get("idempotency_key"),
+        })
+
+    return items
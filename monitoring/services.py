@@ -0,0 +1,159 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils import timezone
+
+from core.metrics import INGESTED_EVENTS, class_label
+from .coalescing import IncidentCoalescer
+from .derivatives import schedule_derivatives
+from .devices import register_devices
+from .models import EvidenceBlob, MonitoringEvent
+
+
+# Enviado por `persist_events`, dentro da transação de persistência,
+# com os eventos efetivamente gravados (argumento `events`). Receivers
+# que gravam no banco de dados participam da mesma transação; os que
+# apenas notificam devem usar `transaction.on_commit`.
+events_persisted = Signal()
+
+
+def persist_events(events: list[MonitoringEvent]) -> list[MonitoringEvent]:
+    """
+    Persiste um conjunto de eventos de monitoramento em uma única transação.
+
+    Esta função centraliza a escrita de eventos no banco de dados,
+    utilizando `bulk_create` para reduzir o número de round trips
+    quando vários eventos são recebidos de uma só vez. Dispositivos
+    ainda não registrados (resolvidos na validação por
+    `lookup_device`) são registrados na mesma transação.
+
+    As evidências associadas são gravadas no storage durante o
+    `pre_save` de cada campo de arquivo, antes do INSERT em lote, e
+    suas referências são contabilizadas na mesma transação, assim como
+    são executados os receivers do sinal `events_persisted`. Após o
+    commit, a geração dos derivados (miniaturas) é agendada quando
+    MONITORING_DERIVATIVES_AT_INGEST estiver habilitado, e os eventos
+    aceitos são contabilizados nas métricas de ingestão.
+
+    Quando MONITORING_COALESCE_WINDOW for maior que zero, os eventos
+    são agrupados em incidentes: eventos agrupados em um incidente
+    existente não são persistidos (permanecem sem `pk`) e recebem o
+    atributo `incident`.
+
+    Parameters
+    ----------
+    events : list[MonitoringEvent]
+        Instâncias ainda não persistidas de eventos de monitoramento.
+
+    Returns
+    -------
+    list[MonitoringEvent]
+        Eventos recebidos, na mesma ordem, com `pk` preenchido para
+        os eventos persistidos.
+    """
+    if not events:
+        return []
+
+    with transaction.atomic():
+        register_devices(events)
+
+        coalescer = None
+        to_insert = events
+
+        if settings.MONITORING_COALESCE_WINDOW:
+            coalescer = IncidentCoalescer()
+            to_insert = coalescer.split(events)
+
+        MonitoringEvent.objects.bulk_create(to_insert)
+
+        if coalescer is not None:
+            coalescer.commit()
+
+        references = Counter(event.evidence.name for event in to_insert)
+        acquire_evidence(references)
+
+        if to_insert:
+            events_persisted.send(sender=MonitoringEvent, events=to_insert)
+
+        if settings.MONITORING_DERIVATIVES_AT_INGEST:
+            transaction.on_commit(lambda: schedule_derivatives(references))
+
+        transaction.on_commit(lambda: record_ingestion(events))
+
+    return events
+
+
+def record_ingestion(events: list[MonitoringEvent]) -> None:
+    """
+    Contabiliza nas métricas os eventos aceitos, por classe e resultado.
+
+    Parameters
+    ----------
+    events : list[MonitoringEvent]
+        Eventos retornados por `persist_events`.
+    """
+    outcomes = Counter(
+        (class_label(event.detected_class), "created" if event.pk else "coalesced")
+        for event in events
+    )
+
+    for (detected_class, outcome), count in outcomes.items():
+        INGESTED_EVENTS.labels(detected_class, outcome).inc(count)
+
+
+def acquire_evidence(references: Counter) -> None:
+    """
+    Incrementa a contagem de referências das evidências informadas.
+
+    Parameters
+    ----------
+    references : Counter
+        Quantidade de novas referências por nome de evidência.
+    """
+    now = timezone.now()
+
+    for name, count in references.items():
+        updated = EvidenceBlob.objects.filter(name=name).update(
+            ref_count=F("ref_count") + count,
+            updated_at=now
+        )
+
+        if updated:
+            continue
+
+        try:
+            with transaction.atomic():
+                EvidenceBlob.objects.create(name=name, ref_count=count)
+
+        except IntegrityError:
+            # Blob criado por uma requisição concorrente
+            EvidenceBlob.objects.filter(name=name).update(
+                ref_count=F("ref_count") + count,
+                updated_at=now
+            )
+
+
+def release_evidence(references: Counter) -> None:
+    """
+    Decrementa a contagem de referências das evidências informadas.
+
+    Os arquivos não são removidos aqui: blobs sem referências são
+    removidos pelo comando `purge_evidence_blobs`, após um período de
+    carência que evita disputas com uploads concorrentes do mesmo
+    conteúdo.
+
+    Parameters
+    ----------
+    references : Counter
+        Quantidade de referências removidas por nome de evidência.
+    """
+    now = timezone.now()
+
+    for name, count in references.items():
+        EvidenceBlob.objects.filter(name=name, ref_count__gte=count).update(
+            ref_count=F("ref_count") - count,
+            updated_at=now
+        )
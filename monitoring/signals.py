@@ -0,0 +1,42 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import credential_cache
+from .devices import device_cache
+from .models import Device, DeviceCredential, MonitoringEvent
+from .services import release_evidence
+
+
+@receiver(post_delete, sender=MonitoringEvent)
+def release_event_evidence(sender, instance: MonitoringEvent, **kwargs) -> None:
+    """
+    Libera a referência à evidência quando um evento é removido.
+    """
+    if instance.evidence:
+        release_evidence(Counter({instance.evidence.name: 1}))
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_delete, sender=Device)
+def forget_changed_device(sender, instance: Device, **kwargs) -> None:
+    """
+    Remove do cache do processo um dispositivo alterado ou excluído.
+
+    Nos demais processos, a alteração (ex.: limite de taxa) passa a
+    valer ao expirar o cache (MONITORING_DEVICE_CACHE_TTL).
+    """
+    device_cache.discard(instance.mac)
+
+
+@receiver(post_save, sender=DeviceCredential)
+@receiver(post_delete, sender=DeviceCredential)
+def forget_changed_credential(sender, instance: DeviceCredential, **kwargs) -> None:
+    """
+    Remove do cache do processo uma chave revogada ou excluída.
+
+    Nos demais processos, a chave deixa de ser aceita ao expirar o
+    cache (MONITORING_DEVICE_KEY_CACHE_TTL).
+    """
+    credential_cache.discard(instance.prefix)
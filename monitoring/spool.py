@@ -0,0 +1,272 @@
+"""
+Fila durável de ingestão baseada em diretório (spool).
+
+Este módulo permite que o endpoint de ingestão apenas valide o
+payload, grave o evento em disco local e responda imediatamente,
+deixando a persistência no banco de dados para workers em segundo
+plano (ver comando `process_monitoring_queue`).
+
+Layout do diretório de spool:
+    pending/     Metadados de eventos aguardando processamento
+    processing/  Metadados de eventos reivindicados por um worker
+    failed/      Metadados de eventos que não podem ser persistidos
+                 (ex.: dados inválidos); não são reprocessados
+    evidence/    Evidências que ainda não estão no storage definitivo
+
+Cada evento é representado por um arquivo de metadados (`<id>.json`),
+gravado por último e via rename atômico, que atua como marcador de que
+o evento está completo. Ao ser reivindicado, o mtime dos metadados
+marca o início da concessão (lease) do worker: eventos em
+`processing/` com concessão mais antiga que
+MONITORING_SPOOL_LEASE_TIMEOUT são considerados abandonados. Evidências recebidas pelo EvidenceUploadHandler
+já estão no storage definitivo e são apenas referenciadas pelo nome;
+as demais são copiadas para `evidence/<id>`.
+"""
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+from .devices import lookup_device
+from .models import MonitoringEvent
+
+
+PENDING = "pending"
+PROCESSING = "processing"
+FAILED = "failed"
+EVIDENCE = "evidence"
+
+
+def _spool_dir(state: str) -> Path:
+    """
+    Retorna (criando, se necessário) o subdiretório de spool do estado.
+    """
+    path = Path(settings.MONITORING_SPOOL_DIR) / state
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _write_durable(path: Path, chunks) -> None:
+    """
+    Grava o conteúdo em disco garantindo a durabilidade (fsync).
+    """
+    with open(path, "wb") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def enqueue_event(validated_data: dict) -> str:
+    """
+    Grava um evento validado na fila durável de ingestão.
+
+    Parameters
+    ----------
+    validated_data : dict
+        Dados validados pelo MonitoringEventSerializer.
+
+    Returns
+    -------
+    str
+        Identificador do evento na fila.
+    """
+    entry_id = uuid.uuid4().hex
+    pending = _spool_dir(PENDING)
+    evidence = validated_data["evidence"]
+
+    metadata = {
+        "mac": validated_data["device"].mac,
+        "detected_class": validated_data["detected_class"],
+        "detected_at": validated_data["detected_at"].isoformat(),
+        "idempotency_key": validated_data.get("idempotency_key"),
+    }
+
+    if isinstance(evidence, str):
+        # Evidência já gravada no storage definitivo
+        metadata["evidence"] = evidence
+    else:
+        _write_durable(_spool_dir(EVIDENCE) / entry_id, evidence.chunks())
+        metadata["evidence_name"] = os.path.basename(evidence.name)
+
+    tmp_path = pending / f"{entry_id}.json.tmp"
+    _write_durable(tmp_path, [json.dumps(metadata).encode()])
+    os.replace(tmp_path, pending / f"{entry_id}.json")
+
+    return entry_id
+
+
+def claim_batch(limit: int) -> list[str]:
+    """
+    Reivindica até `limit` eventos pendentes para processamento.
+
+    A reivindicação é feita por rename atômico dos metadados para o
+    diretório `processing/`, o que permite que vários workers (threads
+    ou processos) consumam a mesma fila sem processar um evento duas vezes.
+    O mtime é atualizado antes do rename, de modo que o evento nunca
+    aparece em `processing/` com uma concessão antiga.
+
+    Parameters
+    ----------
+    limit : int
+        Quantidade máxima de eventos reivindicados.
+
+    Returns
+    -------
+    list[str]
+        Identificadores dos eventos reivindicados.
+    """
+    pending = _spool_dir(PENDING)
+    processing = _spool_dir(PROCESSING)
+
+    claimed = []
+    for metadata_path in sorted(pending.glob("*.json")):
+        entry_id = metadata_path.stem
+
+        try:
+            os.utime(metadata_path)
+            os.replace(metadata_path, processing / metadata_path.name)
+        except FileNotFoundError:
+            # Outro worker reivindicou o evento primeiro
+            continue
+
+        claimed.append(entry_id)
+
+        if len(claimed) >= limit:
+            break
+
+    return claimed
+
+
+def load_events(entry_ids: list[str]) -> tuple[list[MonitoringEvent], list]:
+    """
+    Constrói os eventos de monitoramento a partir das entradas reivindicadas.
+
+    Parameters
+    ----------
+    entry_ids : list[str]
+        Identificadores retornados por `claim_batch`.
+
+    Returns
+    -------
+    tuple[list[MonitoringEvent], list]
+        Eventos ainda não persistidos e os arquivos de evidência abertos,
+        que devem ser fechados pelo chamador após a persistência.
+    """
+    processing = _spool_dir(PROCESSING)
+    spooled_evidence = _spool_dir(EVIDENCE)
+
+    events = []
+    handles = []
+    try:
+        for entry_id in entry_ids:
+            with open(processing / f"{entry_id}.json") as handle:
+                metadata = json.load(handle)
+
+            if "evidence" in metadata:
+                evidence = metadata["evidence"]
+            else:
+                handle = open(spooled_evidence / entry_id, "rb")
+                handles.append(handle)
+                evidence = File(handle, name=metadata["evidence_name"])
+
+            events.append(MonitoringEvent(
+                device=lookup_device(metadata["mac"]),
+                detected_class=metadata["detected_class"],
+                detected_at=datetime.fromisoformat(metadata["detected_at"]),
+                evidence=evidence,
+                idempotency_key=metadata.get("idempotency_key"),
+            ))
+
+    except Exception:
+        for handle in handles:
+            handle.close()
+        raise
+
+    return events, handles
+
+
+def complete(entry_ids: list[str]) -> None:
+    """
+    Remove da fila os eventos persistidos com sucesso.
+    """
+    processing = _spool_dir(PROCESSING)
+    spooled_evidence = _spool_dir(EVIDENCE)
+
+    for entry_id in entry_ids:
+        (spooled_evidence / entry_id).unlink(missing_ok=True)
+        (processing / f"{entry_id}.json").unlink(missing_ok=True)
+
+
+def release(entry_ids: list[str]) -> None:
+    """
+    Devolve para `pending/` os eventos reivindicados que devem ser
+    processados novamente (ex.: após um erro transitório do banco de
+    dados).
+    """
+    pending = _spool_dir(PENDING)
+    processing = _spool_dir(PROCESSING)
+
+    for entry_id in entry_ids:
+        source = processing / f"{entry_id}.json"
+        if source.exists():
+            os.replace(source, pending / source.name)
+
+
+def fail(entry_ids: list[str]) -> None:
+    """
+    Move para `failed/` os eventos que não puderam ser persistidos.
+    """
+    processing = _spool_dir(PROCESSING)
+    failed = _spool_dir(FAILED)
+
+    for entry_id in entry_ids:
+        source = processing / f"{entry_id}.json"
+        if source.exists():
+            os.replace(source, failed / source.name)
+
+
+def recover(lease_timeout: float | None = None) -> int:
+    """
+    Devolve para `pending/` os eventos abandonados em `processing/`.
+
+    Apenas eventos reivindicados há mais de `lease_timeout` segundos
+    são recuperados, de modo que a recuperação pode ser executada com
+    outros workers (inclusive de outros processos) em atividade.
+
+    Parameters
+    ----------
+    lease_timeout : float | None
+        Idade mínima da concessão; padrão MONITORING_SPOOL_LEASE_TIMEOUT.
+
+    Returns
+    -------
+    int
+        Quantidade de eventos recuperados.
+    """
+    if lease_timeout is None:
+        lease_timeout = settings.MONITORING_SPOOL_LEASE_TIMEOUT
+
+    pending = _spool_dir(PENDING)
+    processing = _spool_dir(PROCESSING)
+    expired_before = time.time() - lease_timeout
+
+    recovered = 0
+    for metadata_path in processing.glob("*.json"):
+        try:
+            if metadata_path.stat().st_mtime > expired_before:
+                continue
+
+            os.replace(metadata_path, pending / metadata_path.name)
+        except FileNotFoundError:
+            # Evento concluído (ou recuperado) concorrentemente
+            continue
+
+        recovered += 1
+
+    return recovered
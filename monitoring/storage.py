@@ -0,0 +1,162 @@
+"""
+Storage de evidências endereçado por conteúdo.
+
+Cada evidência é armazenada em um caminho derivado do SHA-256 do seu
+conteúdo. Evidências idênticas (frames repetidos de uma mesma cena)
+passam a ocupar um único arquivo, compartilhado pelos eventos que as
+referenciam. A contagem de referências é mantida no model EvidenceBlob.
+"""
+import errno
+import hashlib
+import os
+import shutil
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+EVIDENCE_DIR = "monitoring/evidence"
+
+
+@deconstructible
+class EvidenceStorage(FileSystemStorage):
+    """
+    FileSystemStorage que nomeia cada arquivo pelo hash do seu conteúdo.
+
+    Layout:
+        monitoring/evidence/<2 primeiros dígitos>/<sha256><extensão>
+
+    Como nomes iguais implicam conteúdos iguais, gravar um arquivo já
+    existente não gera nova escrita em disco nem sufixos aleatórios.
+    """
+
+    def content_name(self, digest: str, extension: str) -> str:
+        """
+        Retorna o nome da evidência no storage a partir do seu hash.
+
+        Parameters
+        ----------
+        digest : str
+            SHA-256 (hexadecimal) do conteúdo.
+        extension : str
+            Extensão original do arquivo (ex.: ".jpg").
+
+        Returns
+        -------
+        str
+            Nome relativo da evidência no storage.
+        """
+        return f"{EVIDENCE_DIR}/{digest[:2]}/{digest}{extension.lower()}"
+
+    def get_available_name(self, name, max_length=None):
+        # O nome final é definido pelo conteúdo em _save
+        return name
+
+    def adopt(self, path: str, digest: str, extension: str) -> str:
+        """
+        Move para o caminho definitivo um arquivo já gravado em disco.
+
+        Utilizado para as evidências recebidas pelo
+        EvidenceUploadHandler: o arquivo preparado é apenas renomeado
+        (sem cópia) ou, caso o conteúdo já exista, descartado em favor
+        do arquivo existente. Caso o diretório de preparação esteja em
+        outro sistema de arquivos, o conteúdo é copiado para um arquivo
+        temporário e renomeado, sem expor uma evidência parcial.
+
+        Parameters
+        ----------
+        path : str
+            Caminho absoluto do arquivo recebido.
+        digest : str
+            SHA-256 (hexadecimal) do conteúdo.
+        extension : str
+            Extensão original do arquivo.
+
+        Returns
+        -------
+        str
+            Nome relativo da evidência no storage.
+        """
+        name = self.content_name(digest, extension)
+        full_path = self.path(name)
+
+        if self._reuse(full_path):
+            os.remove(path)
+            return name
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        try:
+            os.replace(path, full_path)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+
+            tmp_path = f"{full_path}.{uuid.uuid4().hex}.part"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, full_path)
+            os.remove(path)
+
+        return name
+
+    def _reuse(self, full_path: str) -> bool:
+        """
+        Reaproveita um arquivo existente com o mesmo conteúdo.
+
+        Atualiza o mtime do arquivo reaproveitado, sinalizando ao comando
+        `purge_evidence_blobs` que ele voltou a ser referenciado.
+
+        Returns
+        -------
+        bool
+            True caso o arquivo exista e tenha sido reaproveitado.
+        """
+        try:
+            os.utime(full_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1]
+
+        # Evidência preparada pelo EvidenceUploadHandler, com o hash
+        # calculado durante o recebimento
+        staged_path = getattr(content, "staged_path", None)
+        if staged_path is not None:
+            return self.adopt(staged_path, content.sha256, extension)
+
+        hasher = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            hasher.update(chunk)
+
+        name = self.content_name(hasher.hexdigest(), extension)
+        full_path = self.path(name)
+
+        if self._reuse(full_path):
+            return name
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        # Grava em arquivo temporário e renomeia, para que leitores
+        # concorrentes nunca encontrem uma evidência parcial
+        tmp_path = f"{full_path}.{uuid.uuid4().hex}.part"
+        content.seek(0)
+        with open(tmp_path, "wb") as handle:
+            for chunk in content.chunks():
+                handle.write(chunk)
+
+        if self.file_permissions_mode is not None:
+            os.chmod(tmp_path, self.file_permissions_mode)
+
+        os.replace(tmp_path, full_path)
+        return name
+
+
+def evidence_storage() -> EvidenceStorage:
+    """
+    Retorna o storage utilizado pelo campo de evidência dos eventos.
+    """
+    return EvidenceStorage()
@@ -1,3 +1,854 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection
+from django.test import TestCase, override_settings
+from django.utils.timezone import localtime
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import LogSystem
+from . import partitions, spool
+from .authentication import generate_key
+from .binary import FRAME_HEADER, MEDIA_TYPE as BINARY_MEDIA_TYPE
+from .derivatives import derivative_name
+from .devices import DeviceCache
+from .idempotency import RecentKeys
+from .mac import format_mac, parse_mac
+from .management.commands.process_monitoring_queue import Command as ProcessQueueCommand
+from .models import Device, DeviceCredential, EvidenceBlob, Incident, MonitoringEvent
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+STAGING_DIR = tempfile.mkdtemp()
+MAC = "AA:BB:CC:DD:EE:01"
+DETECTED_AT = "2026-01-01T10:00:00Z"
+
+
+def jpeg(color: tuple = (255, 0, 0)) -> bytes:
+    """
+    Bytes de uma imagem JPEG válida.
+    """
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 24), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def evidence(name: str = "evidence.jpg") -> SimpleUploadedFile:
+    """
+    Imagem JPEG válida para os envios de teste.
+    """
+    return SimpleUploadedFile(name, jpeg(), content_type="image/jpeg")
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    MONITORING_UPLOAD_STAGING_DIR=STAGING_DIR,
+    MONITORING_ASYNC_INGESTION=False,
+    MONITORING_COALESCE_WINDOW=0,
+    MONITORING_DERIVATIVES_AT_INGEST=False,
+    MONITORING_IDEMPOTENCY_NATURAL_KEY=False,
+)
+class IngestionTestCase(TestCase):
+    """
+    Base dos testes de ingestão, com envio autenticado por JWT.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+
+    def setUp(self):
+        # Caches em memória isolados por teste (os registros de cada
+        # teste são desfeitos ao final)
+        device_cache = DeviceCache(100)
+        for target, cache in (
+            ("monitoring.idempotency.recent_keys", RecentKeys(100)),
+            ("monitoring.devices.device_cache", device_cache),
+            ("monitoring.signals.device_cache", device_cache),
+        ):
+            patcher = mock.patch(target, cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Buckets do limite de taxa
+        django_cache.clear()
+
+        self.user = User.objects.create_user("operator", password="secret", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def use_device_key(self, mac: str = MAC) -> str:
+        """
+        Passa a autenticar o cliente por uma nova chave do dispositivo.
+        """
+        device, _ = Device.objects.get_or_create(mac=parse_mac(mac))
+        key, prefix, key_hash = generate_key()
+        DeviceCredential.objects.create(device=device, prefix=prefix, key_hash=key_hash)
+
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Device {key}")
+        return prefix
+
+    def post_event(
+        self,
+        idempotency_key: str,
+        mac: str = MAC,
+        evidence_file=None,
+        detected_at: str = DETECTED_AT,
+    ):
+        return self.client.post(
+            "/api/monitoring/",
+            {
+                "mac_address": mac,
+                "detected_class": "person",
+                "detected_at": detected_at,
+                "evidence": evidence_file or evidence(),
+            },
+            format="multipart",
+            HTTP_IDEMPOTENCY_KEY=idempotency_key,
+        )
+
+    def post_batch(self, *idempotency_keys: str):
+        data = {
+            "events": json.dumps([
+                {
+                    "mac_address": MAC,
+                    "detected_class": "person",
+                    "detected_at": DETECTED_AT,
+                    "idempotency_key": idempotency_key,
+                }
+                for idempotency_key in idempotency_keys
+            ]),
+        }
+        for index in range(len(idempotency_keys)):
+            data[f"evidence_{index}"] = evidence()
+
+        return self.client.post("/api/monitoring/batch/", data, format="multipart")
+
+
+class AsyncIngestionTests(IngestionTestCase):
+    """
+    Ingestão pela view assíncrona (/api/monitoring/async/).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    async def post_async(self, idempotency_key: str, headers: dict | None = None):
+        headers = self.headers if headers is None else headers
+        return await self.async_client.post(
+            "/api/monitoring/async/",
+            {
+                "mac_address": MAC,
+                "detected_class": "person",
+                "detected_at": DETECTED_AT,
+                "evidence": evidence(),
+            },
+            headers={"Idempotency-Key": idempotency_key, **headers},
+        )
+
+    async def test_event_is_persisted(self):
+        response = await self.post_async("key-1")
+        resend = await self.post_async("key-1")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(resend.status_code, 200)
+        self.assertEqual(await MonitoringEvent.objects.acount(), 1)
+
+    async def test_unauthenticated_request_is_rejected(self):
+        response = await self.post_async("key-1", headers={})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(await MonitoringEvent.objects.aexists())
+
+
+class BatchIngestionTests(IngestionTestCase):
+    """
+    Ingestão de eventos em lote (/api/monitoring/batch/).
+    """
+
+    def test_batch_is_persisted(self):
+        response = self.post_batch("key-1", "key-2")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [(result["index"], result["status"]) for result in response.json()["results"]],
+            [(0, "created"), (1, "created")],
+        )
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
+
+    def test_resent_items_are_reported(self):
+        self.post_batch("key-1")
+
+        response = self.post_batch("key-1", "key-2")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]],
+            ["duplicate", "created"],
+        )
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
+
+    def test_invalid_item_rejects_batch(self):
+        response = self.client.post(
+            "/api/monitoring/batch/",
+            {
+                "events": json.dumps([
+                    {"mac_address": MAC, "detected_class": "person", "detected_at": DETECTED_AT},
+                    {"mac_address": "invalid", "detected_class": "person", "detected_at": DETECTED_AT},
+                ]),
+                "evidence_0": evidence(),
+                "evidence_1": evidence(),
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]],
+            ["valid", "invalid"],
+        )
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+    @override_settings(MONITORING_BATCH_MAX_SIZE=2)
+    def test_batch_size_is_limited(self):
+        response = self.post_batch("key-1", "key-2", "key-3")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("events", response.json())
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+
+class DeviceRegistryTests(IngestionTestCase):
+    """
+    Registro automático dos dispositivos pelo MAC dos eventos.
+    """
+
+    def test_device_is_registered_on_first_event(self):
+        self.post_event("key-1", mac="aa:bb:cc:dd:ee:01")
+        self.post_event("key-2")
+
+        device = Device.objects.get()
+        event = MonitoringEvent.objects.first()
+
+        self.assertEqual(device.mac, 0xAABBCCDDEE01)
+        self.assertEqual(event.device, device)
+        self.assertEqual(event.mac_address, "AA:BB:CC:DD:EE:01")
+        self.assertEqual(parse_mac(format_mac(device.mac)), device.mac)
+
+    def test_rejected_event_does_not_register_device(self):
+        response = self.post_event("key-1", detected_at="invalid")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Device.objects.exists())
+
+    def test_invalid_mac_is_rejected(self):
+        response = self.post_event("key-1", mac="AA-BB-CC-DD-EE-01")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("mac_address", response.json())
+
+
+class DeviceKeyTests(IngestionTestCase):
+    """
+    Autenticação da ingestão por chave de API do dispositivo.
+    """
+
+    def test_device_key_is_accepted(self):
+        self.use_device_key()
+
+        response = self.post_event("key-1")
+        batch = self.post_batch("key-2")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(batch.status_code, 201)
+
+    def test_key_is_scoped_to_device(self):
+        self.use_device_key()
+
+        response = self.post_event("key-1", mac="AA:BB:CC:DD:EE:02")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+    def test_revoked_key_is_rejected(self):
+        prefix = self.use_device_key()
+        self.post_event("key-1")
+
+        call_command("revoke_device_key", prefix=prefix, stdout=io.StringIO())
+        response = self.post_event("key-2")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(MonitoringEvent.objects.count(), 1)
+
+    def test_wrong_secret_is_rejected(self):
+        prefix = self.use_device_key()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Device {prefix}.wrong")
+
+        self.assertEqual(self.post_event("key-1").status_code, 401)
+
+
+class IdempotencyIntegrityTests(IngestionTestCase):
+    """
+    Tratamento de IntegrityError na ingestão: apenas reenvios registrados
+    concorrentemente (mesma Idempotency-Key do mesmo dispositivo) são
+    respondidos como duplicados.
+    """
+
+    def record_event(self, idempotency_key: str) -> MonitoringEvent:
+        device, _ = Device.objects.get_or_create(mac=0xAABBCCDDEE01)
+        return MonitoringEvent.objects.create(
+            device=device,
+            detected_class="person",
+            detected_at=datetime(2026, 1, 1, 10, tzinfo=timezone.utc),
+            evidence="monitoring/evidence/recorded.jpg",
+            idempotency_key=idempotency_key,
+        )
+
+    def test_concurrent_resend_is_duplicate(self):
+        self.record_event("key-1")
+
+        # Simula o reenvio gravado entre a verificação e a persistência
+        with mock.patch("monitoring.views.find_duplicates", return_value=set()):
+            response = self.post_event("key-1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"detail": "Evento já registrado"})
+        self.assertEqual(MonitoringEvent.objects.count(), 1)
+
+    def test_other_integrity_error_is_server_error(self):
+        with mock.patch(
+            "monitoring.serializers.persist_events",
+            side_effect=IntegrityError("NOT NULL constraint failed"),
+        ):
+            response = self.post_event("key-2")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(MonitoringEvent.objects.exists())
+        self.assertTrue(
+            LogSystem.objects.filter(
+                status="ERROR",
+                message__contains="NOT NULL constraint failed"
+            ).exists()
+        )
+
+    def test_concurrent_batch_resend_is_conflict(self):
+        self.record_event("key-3")
+
+        with mock.patch("monitoring.views.find_duplicates", return_value=set()):
+            response = self.post_batch("key-3")
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_other_batch_integrity_error_is_server_error(self):
+        with mock.patch(
+            "monitoring.views.persist_events",
+            side_effect=IntegrityError("FOREIGN KEY constraint failed"),
+        ):
+            response = self.post_batch("key-4")
+
+        self.assertEqual(response.status_code, 500)
+
+    def test_long_idempotency_key_is_bad_request(self):
+        response = self.post_event("k" * 256)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+    def test_unprintable_idempotency_key_is_bad_request(self):
+        response = self.post_event("key\x7f")
+        batch = self.post_batch("ke\ty")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(batch.status_code, 400)
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+    def test_idempotency_key_is_scoped_to_device(self):
+        first = self.post_event("shared-key", mac="AA:BB:CC:DD:EE:01")
+        second = self.post_event("shared-key", mac="AA:BB:CC:DD:EE:02")
+        resend = self.post_event("shared-key", mac="AA:BB:CC:DD:EE:02")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(resend.status_code, 200)
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
+
+
+@override_settings(MONITORING_COALESCE_WINDOW=60)
+class IncidentCoalescingTests(IngestionTestCase):
+    """
+    Agrupamento de detecções de um mesmo dispositivo e classe em incidentes.
+    """
+
+    def test_detections_within_window_are_coalesced(self):
+        first = self.post_event("key-1", detected_at="2026-01-01T10:00:00Z")
+        second = self.post_event("key-2", detected_at="2026-01-01T10:00:30Z")
+
+        incident = Incident.objects.get()
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json()["incident"], incident.pk)
+        self.assertEqual(MonitoringEvent.objects.count(), 1)
+        self.assertEqual(incident.event_count, 2)
+        self.assertEqual(incident.last_detected_at, datetime(2026, 1, 1, 10, 0, 30, tzinfo=timezone.utc))
+
+    def test_detection_after_window_opens_incident(self):
+        self.post_event("key-1", detected_at="2026-01-01T10:00:00Z")
+        self.post_event("key-2", detected_at="2026-01-01T10:05:00Z")
+
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
+        self.assertEqual(Incident.objects.count(), 2)
+
+    def test_batch_items_are_coalesced(self):
+        response = self.post_batch("key-1", "key-2")
+
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]],
+            ["created", "coalesced"],
+        )
+        self.assertEqual(Incident.objects.get().event_count, 2)
+
+
+@override_settings(MONITORING_THROTTLE_RATE=0.01, MONITORING_THROTTLE_BURST=2)
+class DeviceThrottleTests(IngestionTestCase):
+    """
+    Limite de taxa por dispositivo em requisições JWT, cobrado por evento.
+    """
+
+    def test_batch_is_charged_per_event(self):
+        batch = self.post_batch("key-1", "key-2", "key-3")
+        throttled = self.post_event("key-4")
+
+        self.assertEqual(batch.status_code, 201)
+        self.assertEqual(throttled.status_code, 429)
+        self.assertIn("Retry-After", throttled)
+        self.assertEqual(MonitoringEvent.objects.count(), 3)
+
+    def test_buckets_are_scoped_to_device(self):
+        self.post_batch("key-1", "key-2")
+
+        response = self.post_event("key-3", mac="AA:BB:CC:DD:EE:02")
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_batch_above_available_tokens_is_rejected(self):
+        self.post_event("key-1")
+
+        response = self.post_batch("key-2", "key-3")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(MonitoringEvent.objects.count(), 1)
+
+    def test_batch_above_available_tokens_is_rejected_for_device_key(self):
+        self.use_device_key()
+
+        self.post_event("key-1")
+        response = self.post_batch("key-2", "key-3")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(MonitoringEvent.objects.count(), 1)
+
+    def test_resends_are_not_charged(self):
+        self.post_batch("key-1", "key-2")
+
+        response = self.post_batch("key-1", "key-2")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
+
+    def test_device_rate_change_applies_to_cached_device(self):
+        # O segundo envio adiciona ao cache o dispositivo registrado no primeiro
+        self.post_event("key-1")
+        self.post_event("key-2")
+
+        device = Device.objects.get()
+        device.throttle_rate = 0
+        device.save()
+
+        self.assertEqual(self.post_event("key-3").status_code, 201)
+
+
+class SpoolProcessingTests(IngestionTestCase):
+    """
+    Tratamento de falhas pelo consumidor da fila durável
+    (`process_monitoring_queue`).
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        patcher = override_settings(MONITORING_SPOOL_DIR=spool_dir)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+        self.spool_dir = Path(spool_dir)
+        self.command = ProcessQueueCommand(stdout=io.StringIO(), stderr=io.StringIO())
+
+    def claim(self, count: int) -> list[str]:
+        for _ in range(count):
+            spool.enqueue_event({
+                "device": Device(mac=0xAABBCCDDEE01),
+                "detected_class": "person",
+                "detected_at": datetime(2026, 1, 1, 10, tzinfo=timezone.utc),
+                "evidence": "monitoring/evidence/recorded.jpg",
+            })
+        return spool.claim_batch(count)
+
+    def entries(self, state: str) -> int:
+        return len(list((self.spool_dir / state).glob("*.json")))
+
+    def test_transient_error_keeps_events_queued(self):
+        entry_ids = self.claim(3)
+
+        with mock.patch(
+            "monitoring.management.commands.process_monitoring_queue.persist_events",
+            side_effect=OperationalError("database is locked"),
+        ):
+            persisted = self.command._persist(entry_ids)
+
+        self.assertFalse(persisted)
+        self.assertEqual(self.entries(spool.PENDING), 3)
+        self.assertEqual(self.entries(spool.FAILED), 0)
+
+    def test_permanent_error_moves_events_to_failed(self):
+        entry_ids = self.claim(2)
+
+        with mock.patch(
+            "monitoring.management.commands.process_monitoring_queue.persist_events",
+            side_effect=ValueError("invalid event"),
+        ):
+            persisted = self.command._persist(entry_ids)
+
+        self.assertTrue(persisted)
+        self.assertEqual(self.entries(spool.PENDING), 0)
+        self.assertEqual(self.entries(spool.FAILED), 2)
+
+    def test_events_are_persisted(self):
+        entry_ids = self.claim(2)
+
+        self.assertTrue(self.command._persist(entry_ids))
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
+        self.assertEqual(self.entries(spool.PROCESSING), 0)
+
+    @override_settings(MONITORING_ASYNC_INGESTION=True)
+    def test_accepted_event_is_persisted_by_consumer(self):
+        response = self.post_event("key-1")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(MonitoringEvent.objects.exists())
+        self.assertEqual(self.entries(spool.PENDING), 1)
+
+        self.assertTrue(self.command._persist(spool.claim_batch(10)))
+        self.assertEqual(MonitoringEvent.objects.get().mac_address, MAC)
+
+
+class EvidenceUploadTests(IngestionTestCase):
+    """
+    Evidências recebidas em streaming pelo EvidenceUploadHandler.
+    """
+
+    def stored_files(self) -> list[str]:
+        root = Path(MEDIA_ROOT) / "monitoring" / "evidence"
+        return sorted(path.name for path in root.rglob("*") if path.is_file())
+
+    def test_extension_comes_from_content(self):
+        response = self.post_event("key-1", evidence_file=evidence("evidence.html"))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(MonitoringEvent.objects.get().evidence.name.endswith(".jpg"))
+        self.assertEqual(list(Path(STAGING_DIR).iterdir()), [])
+
+    def test_rejected_upload_is_not_stored(self):
+        corrupted = SimpleUploadedFile(
+            "evidence.jpg",
+            b"\xff\xd8\xff\xe0" + b"\x00" * 64,
+            content_type="image/jpeg",
+        )
+        before = self.stored_files()
+
+        response = self.post_event("key-2", evidence_file=corrupted)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.stored_files(), before)
+        self.assertEqual(list(Path(STAGING_DIR).iterdir()), [])
+
+    def test_duplicate_upload_is_discarded(self):
+        self.post_event("key-3")
+        before = self.stored_files()
+
+        response = self.post_event("key-3", evidence_file=evidence("other.png"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stored_files(), before)
+        self.assertEqual(list(Path(STAGING_DIR).iterdir()), [])
+
+
+class EvidenceStorageTests(IngestionTestCase):
+    """
+    Armazenamento de evidências por conteúdo, com contagem de referências.
+    """
+
+    def test_identical_evidence_is_shared(self):
+        self.post_event("key-1")
+        self.post_event("key-2")
+
+        names = set(MonitoringEvent.objects.values_list("evidence", flat=True))
+
+        self.assertEqual(len(names), 1)
+        self.assertEqual(EvidenceBlob.objects.get(name=names.pop()).ref_count, 2)
+
+    def test_removed_event_releases_evidence(self):
+        self.post_event("key-1")
+        self.post_event("key-2")
+
+        MonitoringEvent.objects.first().delete()
+
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 1)
+
+    def test_unreferenced_evidence_is_purged(self):
+        self.post_event("key-1")
+        name = MonitoringEvent.objects.get().evidence.name
+
+        MonitoringEvent.objects.all().delete()
+        call_command("purge_evidence_blobs", grace_hours=0, stdout=io.StringIO())
+
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertFalse((Path(MEDIA_ROOT) / name).exists())
+
+
+@override_settings(MONITORING_EVIDENCE_DERIVATIVES={"thumbnail": 16, "preview": 24})
+class DerivativeTests(IngestionTestCase):
+    """
+    Derivados das evidências gerados sob demanda (DerivativeView).
+    """
+
+    def get_derivative(self, size: str, name: str):
+        return self.client.get(f"/api/dashboard/derivatives/{size}/{name}")
+
+    def test_derivatives_are_generated_on_demand(self):
+        self.post_event("key-1")
+        name = MonitoringEvent.objects.get().evidence.name
+
+        response = self.get_derivative("thumbnail", name)
+
+        self.assertEqual(response.status_code, 302)
+        for size, max_side in (("thumbnail", 16), ("preview", 24)):
+            with Image.open(Path(MEDIA_ROOT) / derivative_name(name, size)) as image:
+                self.assertEqual(max(image.size), max_side)
+
+    def test_unknown_derivative_is_not_found(self):
+        self.post_event("key-1")
+        name = MonitoringEvent.objects.get().evidence.name
+
+        self.assertEqual(self.get_derivative("original", name).status_code, 404)
+        self.assertEqual(self.get_derivative("thumbnail", "monitoring/evidence/../x.jpg").status_code, 404)
+        self.assertEqual(self.get_derivative("thumbnail", "monitoring/evidence/ab/missing.jpg").status_code, 404)
+
+
+@override_settings(MONITORING_DETECTION_CLASSES=["person", "vehicle"])
+class BinaryIngestionTests(IngestionTestCase):
+    """
+    Ingestão pelo protocolo binário compacto.
+    """
+
+    def frame(self, class_id: int = 0, detected_at: datetime | None = None, image: bytes | None = None) -> bytes:
+        detected_at = detected_at or datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+        image = jpeg() if image is None else image
+        return FRAME_HEADER.pack(
+            bytes.fromhex(MAC.replace(":", "")),
+            class_id,
+            int(detected_at.timestamp() * 1000),
+            len(image),
+        ) + image
+
+    def post_frames(self, *frames: bytes):
+        return self.client.generic(
+            "POST",
+            "/api/monitoring/binary/",
+            b"".join(frames),
+            content_type=BINARY_MEDIA_TYPE,
+        )
+
+    def test_frames_are_persisted(self):
+        response = self.post_frames(self.frame(0), self.frame(1, image=jpeg((0, 0, 255))))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(MonitoringEvent.objects.values_list("detected_class", flat=True)),
+            ["person", "vehicle"],
+        )
+
+    def test_invalid_frames_reject_request(self):
+        response = self.post_frames(
+            self.frame(0),
+            self.frame(5),
+            self.frame(0, detected_at=datetime.now(timezone.utc) + timedelta(hours=1)),
+            self.frame(0, image=b"\xff\xd8\xff" + b"\x00" * 32),
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result["index"] for result in response.json()["results"]], [1, 2, 3])
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+    def test_truncated_frame_is_bad_request(self):
+        response = self.post_frames(self.frame(0)[:-10])
+
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(MONITORING_BATCH_MAX_SIZE=2)
+    def test_frame_count_is_limited(self):
+        response = self.post_frames(*[self.frame(0) for _ in range(3)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+    @override_settings(MONITORING_DETECTION_CLASSES=[])
+    def test_missing_detection_classes_is_unavailable(self):
+        response = self.post_frames(self.frame(0))
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_future_timestamp_is_rejected_by_multipart(self):
+        response = self.client.post(
+            "/api/monitoring/",
+            {
+                "mac_address": MAC,
+                "detected_class": "person",
+                "detected_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+                "evidence": evidence(),
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("detected_at", response.json())
+
+
+class QueryPlanTests(TestCase):
+    """
+    Índices utilizados pelas consultas principais de eventos.
+    """
+
+    def test_queries_use_expected_indexes(self):
+        output = io.StringIO()
+
+        call_command("check_query_plans", sample=5000, stdout=output)
+
+        self.assertNotIn("FALHA", output.getvalue())
+        self.assertFalse(MonitoringEvent.objects.exists())
+
+
+@skipUnless(connection.vendor == "postgresql", "Particionamento requer PostgreSQL")
+class PartitionConversionTests(TestCase):
+    """
+    Conversão da tabela de eventos em tabela particionada por mês.
+    """
+
+    def setUp(self):
+        device = Device.objects.create(mac=int(MAC.replace(":", ""), 16))
+        now = datetime.now(timezone.utc)
+
+        for detected_at in (now, now - timedelta(days=60), datetime(1970, 1, 1, tzinfo=timezone.utc)):
+            MonitoringEvent.objects.create(
+                device=device,
+                detected_class="person",
+                detected_at=detected_at,
+                evidence="monitoring/evidence/a.jpg",
+            )
+
+        # Verifica as chaves estrangeiras adiadas da transação do teste,
+        # que impediriam a remoção da tabela original na conversão
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    def test_conversion_is_clamped_to_horizon(self):
+        created = partitions.convert_to_partitioned(months_ahead=1, horizon_months=3)
+
+        now = datetime.now(timezone.utc)
+        self.assertEqual(len(created), 5)
+        self.assertEqual(
+            partitions.list_partitions()[0][1],
+            partitions.month_start(now.year, now.month - 3),
+        )
+
+        # O evento anterior ao horizonte fica na partição padrão
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT EXTRACT(YEAR FROM detected_at) FROM {partitions.quote(partitions.DEFAULT_PARTITION)}"
+            )
+            self.assertEqual([int(row[0]) for row in cursor.fetchall()], [1970])
+
+        self.assertEqual(MonitoringEvent.objects.count(), 3)
+
+
+class ArchiveTests(IngestionTestCase):
+    """
+    Arquivamento frio dos eventos fora do período de retenção.
+    """
+
+    def setUp(self):
+        super().setUp()
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir, ignore_errors=True)
+        patcher = override_settings(MONITORING_ARCHIVE_DIR=archive_dir, MONITORING_RETENTION_DAYS=90)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+        now = datetime.now(timezone.utc)
+        self.archived_at = (now - timedelta(days=200)).replace(microsecond=0)
+        self.post_event("key-1", detected_at=self.archived_at.isoformat())
+        self.post_event(
+            "key-2",
+            detected_at=(now - timedelta(days=1)).isoformat(),
+            evidence_file=SimpleUploadedFile("recent.jpg", jpeg((0, 255, 0)), content_type="image/jpeg"),
+        )
+
+    def test_old_events_are_archived_and_removed(self):
+        call_command("archive_events", stdout=io.StringIO())
+
+        self.assertEqual(MonitoringEvent.objects.count(), 1)
+        self.assertGreater(MonitoringEvent.objects.get().detected_at, self.archived_at)
+        # A evidência do evento arquivado deixa de ser referenciada
+        self.assertEqual(
+            sorted(EvidenceBlob.objects.values_list("ref_count", flat=True)),
+            [0, 1],
+        )
+
+    def test_archived_events_are_queryable(self):
+        call_command("archive_events", stdout=io.StringIO())
+        day = localtime(self.archived_at).date().isoformat()
+
+        response = self.client.get("/api/dashboard/archive/", {"start_date": day, "end_date": day})
+
+        self.assertEqual(response.status_code, 200)
+        (event,) = response.json()
+        self.assertEqual(event["mac"], MAC)
+
+        image = self.client.get(event["image"])
+        self.assertEqual(image.status_code, 200)
+        self.assertEqual(image.content, jpeg())
+
+    def test_dry_run_keeps_events(self):
+        output = io.StringIO()
+
+        call_command("archive_events", dry_run=True, stdout=output)
+
+        self.assertIn("1 eventos", output.getvalue())
+        self.assertEqual(MonitoringEvent.objects.count(), 2)
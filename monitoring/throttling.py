@@ -0,0 +1,191 @@
+"""
+Limite de taxa de ingestão por dispositivo.
+
+Um dispositivo com defeito pode inundar os endpoints de ingestão e
+consumir a capacidade do banco de dados de todos os demais. Este módulo
+aplica um token bucket por dispositivo: cada evento recebido consome um
+token, e os tokens são repostos à taxa configurada até o limite da
+rajada. Requisições sem token disponível recebem 429 Too Many Requests
+com o cabeçalho Retry-After.
+
+A cobrança ocorre em duas etapas:
+
+- Requisições autenticadas por chave de dispositivo consomem um token
+  antes da leitura do corpo (`allow_request`, throttle do DRF), de modo
+  que um dispositivo acima do limite é rejeitado sem custo de upload.
+- Após a validação e a deduplicação, os eventos novos são cobrados do
+  bucket do dispositivo de cada item (`charge`), inclusive em
+  requisições autenticadas por JWT, cujo dispositivo só é conhecido
+  pelo MAC informado no corpo. Reenvios não são cobrados. O lote só é
+  admitido se o bucket cobrir todos os seus eventos; caso contrário, a
+  requisição inteira recebe 429. Lotes maiores que a rajada exigem o
+  bucket cheio e deixam o excedente em débito.
+
+As taxas são definidas por dispositivo, com padrão global; não há
+agrupamento de dispositivos por classe neste projeto.
+
+O estado dos buckets fica no cache padrão do Django (CACHES), que deve
+ser compartilhado entre os processos em produção. Assim como os
+throttles nativos do DRF, a leitura e a gravação do bucket não são
+atômicas: sob concorrência do mesmo dispositivo, o limite pode ser
+excedido em poucas requisições.
+"""
+import math
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from .authentication import DeviceUser
+
+
+class DeviceRateThrottle(BaseThrottle):
+    """
+    Throttle DRF de token bucket por dispositivo.
+
+    Aplica-se apenas a requisições POST de ingestão; a taxa e a rajada
+    podem ser definidas por dispositivo (Device.throttle_rate /
+    Device.throttle_burst), com MONITORING_THROTTLE_RATE e
+    MONITORING_THROTTLE_BURST como padrão.
+    """
+
+    cache = cache
+    cache_format = "throttle:device:%s"
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_rate(self, device) -> tuple[float, int]:
+        """
+        Retorna a taxa (tokens por segundo) e a rajada do dispositivo.
+        """
+        rate = device.throttle_rate
+        if rate is None:
+            rate = settings.MONITORING_THROTTLE_RATE
+
+        burst = device.throttle_burst
+        if burst is None:
+            burst = settings.MONITORING_THROTTLE_BURST
+
+        return rate, max(burst, 1)
+
+    def get_tokens(self, device, now: float) -> float:
+        """
+        Retorna os tokens disponíveis no bucket do dispositivo.
+
+        O bucket é identificado pelo MAC, disponível também para
+        dispositivos ainda não registrados (requisições JWT).
+        """
+        rate, burst = self.get_rate(device)
+        tokens, updated_at = self.cache.get(self.cache_format % device.mac, (burst, now))
+        return min(burst, tokens + (now - updated_at) * rate)
+
+    def debit(self, device, tokens: float, cost: int, now: float) -> None:
+        """
+        Grava o bucket do dispositivo após o consumo de `cost` tokens.
+        """
+        rate, burst = self.get_rate(device)
+        tokens -= cost
+
+        # Após o tempo de reposição completa, o bucket volta a estar cheio
+        self.cache.set(
+            self.cache_format % device.mac,
+            (tokens, now),
+            math.ceil((burst - tokens) / rate) + 1
+        )
+
+    def allow_request(self, request, view) -> bool:
+        """
+        Consome o token da requisição de um dispositivo autenticado por
+        chave, antes da leitura do corpo.
+
+        Returns
+        -------
+        bool
+            True caso a requisição seja permitida.
+        """
+        if request.method != "POST" or not isinstance(request.user, DeviceUser):
+            return True
+
+        return self._consume({request.user.device.mac: (request.user.device, 1)})
+
+    def charge(self, request, items: list[dict]) -> bool:
+        """
+        Cobra um token por evento do bucket do dispositivo de cada item.
+
+        Para dispositivos autenticados por chave, o token já consumido
+        por `allow_request` é descontado do custo. Cada dispositivo do
+        lote deve possuir tokens para todos os seus eventos; caso algum
+        não possua, nenhum bucket é debitado.
+
+        Parameters
+        ----------
+        items : list[dict]
+            Dados validados dos eventos novos (sem reenvios), com o
+            dispositivo atribuído.
+
+        Returns
+        -------
+        bool
+            True caso os eventos sejam permitidos.
+        """
+        devices = {item["device"].mac: item["device"] for item in items}
+        counts = Counter(item["device"].mac for item in items)
+
+        if isinstance(request.user, DeviceUser):
+            # Itens de outros dispositivos são rejeitados antes da cobrança
+            mac = request.user.device.mac
+            if counts[mac] <= 1:
+                return True
+            return self._consume({mac: (devices[mac], counts[mac] - 1)}, prepaid=1)
+
+        return self._consume({mac: (devices[mac], count) for mac, count in counts.items()})
+
+    def _consume(self, costs: dict, prepaid: int = 0) -> bool:
+        """
+        Debita os custos informados dos buckets dos dispositivos.
+
+        Parameters
+        ----------
+        costs : dict
+            Dispositivo e quantidade de tokens, por MAC. Cada bucket
+            deve cobrir o custo (limitado à rajada); caso algum não
+            cubra, nenhum bucket é debitado.
+        prepaid : int
+            Tokens do mesmo lote já debitados por `allow_request`,
+            considerados no limite da rajada.
+
+        Returns
+        -------
+        bool
+            True caso os tokens tenham sido debitados.
+        """
+        now = time.time()
+        buckets = []
+
+        for device, cost in costs.values():
+            rate, burst = self.get_rate(device)
+
+            if rate <= 0:
+                continue
+
+            tokens = self.get_tokens(device, now)
+            required = min(cost, burst - prepaid)
+            if tokens < required:
+                self.retry_after = max(self.retry_after or 0, (required - tokens) / rate)
+                return False
+
+            buckets.append((device, tokens, cost))
+
+        for device, tokens, cost in buckets:
+            self.debit(device, tokens, cost, now)
+
+        return True
+
+    def wait(self) -> float | None:
+        """
+        Segundos até o próximo token disponível (cabeçalho Retry-After).
+        """
+        return self.retry_after
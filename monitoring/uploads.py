@@ -0,0 +1,279 @@
+"""
+Recebimento de evidências em streaming, sem cópias intermediárias.
+
+O fluxo padrão do Django grava cada upload em memória ou em um arquivo
+temporário e, ao salvar o ImageField, copia novamente os bytes para
+`MEDIA_ROOT/monitoring/evidence/`. O handler deste módulo grava cada
+chunk recebido em um diretório de preparação fora de MEDIA_ROOT
+(MONITORING_UPLOAD_STAGING_DIR), calculando o hash e validando a
+assinatura do conteúdo durante o próprio upload.
+
+O arquivo só é movido para o seu caminho endereçado por conteúdo (ver
+EvidenceStorage.adopt) ao salvar o evento, após a validação completa
+da requisição. Uploads rejeitados (imagem inválida, dispositivo não
+autorizado, limite de taxa, reenvio) nunca chegam ao diretório público
+de evidências: o arquivo preparado é removido ao ser fechado, o que
+ocorre no descarte explícito (`discard_uploads`) ou, no mais tardar,
+ao término da requisição.
+"""
+import hashlib
+import os
+import re
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from core.metrics import EVIDENCE_BYTES
+
+
+# Assinaturas (magic bytes) dos formatos de imagem aceitos como evidência
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+SIGNATURE_LENGTH = 12
+
+# Campos de arquivo aceitos: `evidence` (evento único) e
+# `evidence_<índice>` (itens de um lote)
+EVIDENCE_FIELD_PATTERN = re.compile(r"evidence(?:_(\d+))?")
+
+
+def is_evidence_field(field_name: str) -> bool:
+    """
+    Verifica se o campo de arquivo corresponde a uma evidência aceita.
+
+    Parameters
+    ----------
+    field_name : str
+        Nome do campo multipart do arquivo.
+
+    Returns
+    -------
+    bool
+        True para `evidence` e para `evidence_<índice>` dentro do
+        tamanho máximo de lote (MONITORING_BATCH_MAX_SIZE).
+    """
+    match = EVIDENCE_FIELD_PATTERN.fullmatch(field_name)
+
+    if match is None:
+        return False
+
+    index = match.group(1)
+    return index is None or int(index) < settings.MONITORING_BATCH_MAX_SIZE
+
+
+def image_extension(header: bytes) -> str | None:
+    """
+    Identifica o formato de imagem a partir dos primeiros bytes.
+
+    Parameters
+    ----------
+    header : bytes
+        Primeiros bytes do arquivo recebido.
+
+    Returns
+    -------
+    str | None
+        Extensão correspondente ao formato, ou None caso a assinatura
+        não corresponda a um formato aceito.
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+
+    for signature, extension in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+
+    return None
+
+
+def is_image_signature(header: bytes) -> bool:
+    """
+    Verifica se os primeiros bytes correspondem a um formato de imagem aceito.
+
+    Parameters
+    ----------
+    header : bytes
+        Primeiros bytes do arquivo recebido.
+
+    Returns
+    -------
+    bool
+        True caso a assinatura corresponda a um formato aceito.
+    """
+    return image_extension(header) is not None
+
+
+def staging_dir() -> Path:
+    """
+    Retorna (criando, se necessário) o diretório de preparação dos uploads.
+    """
+    path = Path(settings.MONITORING_UPLOAD_STAGING_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class StagedEvidenceFile(UploadedFile):
+    """
+    Arquivo de evidência recebido e preparado fora do storage público.
+
+    Expõe `temporary_file_path()` para que a validação de imagem do
+    Django/DRF leia o arquivo diretamente do disco, sem nova cópia. Ao
+    salvar o evento, EvidenceStorage move o arquivo (`staged_path`)
+    para o caminho endereçado por conteúdo; o nome do arquivo é o hash
+    com a extensão identificada pela assinatura, nunca o nome enviado
+    pelo cliente.
+    """
+
+    def __init__(self, path: str, sha256: str, extension: str, size: int,
+                 content_type: str, charset=None, content_type_extra=None):
+        super().__init__(
+            open(path, "rb"),
+            f"{sha256}{extension}",
+            content_type,
+            size,
+            charset,
+            content_type_extra
+        )
+        self.staged_path = path
+        self.sha256 = sha256
+
+    def temporary_file_path(self) -> str:
+        """
+        Retorna o caminho absoluto do arquivo preparado.
+        """
+        return self.staged_path
+
+    def close(self) -> None:
+        """
+        Fecha e remove o arquivo preparado.
+
+        Após o salvamento do evento, o arquivo já foi movido para o
+        storage e não há o que remover. Chamado pelo Django ao término
+        da requisição para todos os arquivos recebidos.
+        """
+        super().close()
+
+        try:
+            os.remove(self.staged_path)
+        except FileNotFoundError:
+            pass
+
+    def discard(self) -> None:
+        """
+        Descarta a evidência de um upload rejeitado.
+        """
+        self.close()
+
+
+class EvidenceUploadHandler(FileUploadHandler):
+    """
+    Upload handler que grava a evidência no diretório de preparação.
+
+    Responsabilidades:
+    - Gravar cada chunk recebido diretamente em disco, fora de MEDIA_ROOT
+    - Calcular o SHA-256 do conteúdo durante o recebimento
+    - Rejeitar arquivos que não sejam imagens ou excedam o tamanho máximo
+    - Rejeitar arquivos enviados em campos que não sejam de evidência,
+      que nunca chegam a ser gravados
+    - Definir a extensão pela assinatura do conteúdo
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length,
+                 charset=None, content_type_extra=None):
+        if not is_evidence_field(field_name):
+            raise SkipFile(f"Campo de arquivo desconhecido: {field_name}")
+
+        super().new_file(
+            field_name, file_name, content_type, content_length,
+            charset, content_type_extra
+        )
+
+        self.path = str(staging_dir() / f"{uuid.uuid4().hex}.part")
+        self.destination = open(self.path, "xb")
+        self.hasher = hashlib.sha256()
+        self.header = b""
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if len(self.header) < SIGNATURE_LENGTH:
+            self.header += raw_data[:SIGNATURE_LENGTH - len(self.header)]
+
+            if (
+                len(self.header) >= SIGNATURE_LENGTH
+                and not is_image_signature(self.header)
+            ):
+                self._abort()
+                raise SkipFile("Evidência não é uma imagem válida")
+
+        self.size += len(raw_data)
+        if self.size > settings.MONITORING_EVIDENCE_MAX_SIZE:
+            self._abort()
+            raise SkipFile("Evidência excede o tamanho máximo permitido")
+
+        self.destination.write(raw_data)
+        self.hasher.update(raw_data)
+
+        # O chunk foi consumido: nenhum outro handler deve recebê-lo
+        return None
+
+    def file_complete(self, file_size):
+        self.destination.close()
+
+        extension = image_extension(self.header)
+        if extension is None:
+            self._abort()
+            return None
+
+        EVIDENCE_BYTES.inc(file_size)
+
+        return StagedEvidenceFile(
+            path=self.path,
+            sha256=self.hasher.hexdigest(),
+            extension=extension,
+            size=file_size,
+            content_type=self.content_type,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+
+    def upload_interrupted(self):
+        self._abort()
+
+    def _abort(self) -> None:
+        """
+        Descarta o arquivo parcialmente gravado.
+        """
+        if not hasattr(self, "destination"):
+            return
+
+        self.destination.close()
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def discard_uploads(files) -> None:
+    """
+    Descarta as evidências de uma requisição rejeitada.
+
+    Remove os arquivos preparados imediatamente, sem aguardar o término
+    da requisição.
+
+    Parameters
+    ----------
+    files : MultiValueDict
+        Arquivos recebidos na requisição (request.FILES).
+    """
+    for uploaded in files.values():
+        if isinstance(uploaded, StagedEvidenceFile):
+            uploaded.discard()
@@ -6,11 +6,28 @@ ao registro de eventos de detecção, delegando toda a lógica
 de validação e persistência para a view correspondente.
 """
 from django.urls import path
-from monitoring.views import MonitoringCreateView
+from monitoring.async_views import monitoring_create_async
+from monitoring.views import (
+    MonitoringBatchCreateView,
+    MonitoringBinaryCreateView,
+    MonitoringCreateView,
+)
 
 urlpatterns = [
     
     # REGISTRO DE EVENTOS DE MONITORAMENTO
     # POST /api/monitoring/
-    path("", MonitoringCreateView.as_view(), name="monitoring-create")        
+    path("", MonitoringCreateView.as_view(), name="monitoring-create"),
+
+    # REGISTRO DE EVENTOS EM LOTE
+    # POST /api/monitoring/batch/
+    path("batch/", MonitoringBatchCreateView.as_view(), name="monitoring-batch-create"),
+
+    # REGISTRO DE EVENTOS NO PROTOCOLO BINÁRIO
+    # POST /api/monitoring/binary/
+    path("binary/", MonitoringBinaryCreateView.as_view(), name="monitoring-binary-create"),
+
+    # REGISTRO DE EVENTOS (VIEW ASSÍNCRONA, ASGI)
+    # POST /api/monitoring/async/
+    path("async/", monitoring_create_async, name="monitoring-async-create"),
 ]
\ No newline at end of file
@@ -1,16 +1,87 @@
+import math
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser
+from rest_framework.exceptions import ParseError, UnsupportedMediaType, ValidationError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.db import IntegrityError
 
 from drf_spectacular.utils import extend_schema
 
+from core.pagination import KeysetPagination
 from core.utils import report_log
-from .serializers import MonitoringEventSerializer
+from .authentication import DeviceKeyAuthentication, DeviceUser, foreign_devices
+from .serializers import MonitoringEventSerializer, build_batch_items
+from .idempotency import (
+    INVALID_IDEMPOTENCY_KEY,
+    find_duplicates,
+    is_known_key,
+    is_valid_idempotency_key,
+    recorded_concurrently,
+    remember,
+)
 from .models import MonitoringEvent
+from .binary import BinaryEventParser, FrameValidationError, validate_frame
+from .parsers import EvidenceMultiPartParser
+from .services import persist_events
+from .throttling import DeviceRateThrottle
+from .spool import enqueue_event
+from .uploads import discard_uploads
+
+
+def batch_results(count: int, accepted: list[int], events: list[MonitoringEvent]) -> list[dict]:
+    """
+    Monta o resultado de cada item de um lote após a persistência.
+
+    Parameters
+    ----------
+    count : int
+        Quantidade de itens recebidos no lote.
+    accepted : list[int]
+        Índices dos itens encaminhados para persistência (não duplicados).
+    events : list[MonitoringEvent]
+        Eventos retornados por `persist_events`, na ordem de `accepted`.
+
+    Returns
+    -------
+    list[dict]
+        Resultado (created, coalesced ou duplicate) de cada item.
+    """
+    created = dict(zip(accepted, events))
+    results = []
+    for index in range(count):
+        event = created.get(index)
+
+        if event is None:
+            results.append({"index": index, "status": "duplicate"})
+        elif event.pk is None:
+            results.append({
+                "index": index,
+                "status": "coalesced",
+                "incident": event.incident.pk,
+            })
+        else:
+            results.append({"index": index, "status": "created", "id": event.pk})
+
+    return results
+
+
+def throttled_response(throttle: DeviceRateThrottle) -> Response:
+    """
+    Resposta enviada quando os eventos excedem o limite de taxa do
+    dispositivo (ver DeviceRateThrottle.charge).
+    """
+    return Response(
+        {"detail": "Limite de requisições do dispositivo excedido"},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(math.ceil(throttle.wait()))}
+    )
+
 
 class MonitoringCreateView(APIView):
     """
@@ -21,28 +92,47 @@ class MonitoringCreateView(APIView):
     no banco de dados e registra a operação em log.
     """
     
+    authentication_classes = [DeviceKeyAuthentication, JWTAuthentication]
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser]
+    throttle_classes = [DeviceRateThrottle]
+    parser_classes = [EvidenceMultiPartParser, FormParser]
+    pagination_class = KeysetPagination
     
     @extend_schema(
-        responses={200: MonitoringEventSerializer(many=True)},
+        responses={200: MonitoringEventSerializer(many=True), 403: None, 404: None},
         description="Lista eventos de monitoramento (uso interno / dashboard)."
     )
     def get(self, request: Request) -> Response:
         """
-        Retorna a lista de eventos de monitoramento registrados.
+        Retorna os eventos de monitoramento registrados, paginados por
+        cursor (mais recentes primeiro; ver core.pagination).
+
+        Utilizado pelo dashboard para visualização dos eventos;
+        indisponível para dispositivos autenticados por chave.
 
-        Utilizado pelo dashboard para visualização dos eventos.
+        Query params opcionais:
+            - cursor (retornado em `next`)
+            - page_size
         """
-        events = MonitoringEvent.objects.all().order_by("-detected_at")
+        if isinstance(request.user, DeviceUser):
+            return Response(
+                {"detail": "Dispositivos não podem listar eventos"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        paginator = self.pagination_class()
+        events = paginator.paginate_queryset(
+            MonitoringEvent.objects.select_related("device"),
+            request
+        )
         serializer = MonitoringEventSerializer(events, many=True)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
     
     
     @extend_schema(
         request=MonitoringEventSerializer,
-        responses={201: None, 400: None, 401: None, 500: None},
+        responses={200: None, 201: None, 202: None, 400: None, 401: None, 403: None, 429: None, 500: None},
         description="Recebe eventos de monitoramento enviados por dispositivos edge."
     )
     def post(self, request: Request) -> Response:
@@ -50,8 +140,11 @@ class MonitoringCreateView(APIView):
         Processa o registro de um evento de monitoramento.
 
         Responsabilidades:
+        - Responder a reenvios (Idempotency-Key ou chave natural) sem
+          persistir o evento novamente
         - Validar os dados recebidos do dispositivo edge
-        - Persistir o evento de monitoramento
+        - Persistir o evento de monitoramento, ou enfileirá-lo quando
+          MONITORING_ASYNC_INGESTION estiver habilitado
         - Registrar logs de sucesso ou falha
 
         Espera uma requisição multipart/form-data contendo:
@@ -60,19 +153,92 @@ class MonitoringCreateView(APIView):
             - detected_at
             - evidence (arquivo de imagem)
 
+        Cabeçalho opcional:
+            - Idempotency-Key (identificador único do evento no dispositivo)
+
         Returns
         -------
         Response
+            - 200 OK: Evento já registrado anteriormente (reenvio)
             - 201 Created: Evento registrado com sucesso
-            - 400 Bad Request: Dados inválidos
-            - 401 Unauthorized: Usuário não autenticado
+            - 202 Accepted: Evento aceito para persistência assíncrona
+            - 400 Bad Request: Dados ou Idempotency-Key inválidos
+            - 401 Unauthorized: Usuário ou dispositivo não autenticado
+            - 403 Forbidden: Chave de dispositivo usada para outro MAC
+            - 429 Too Many Requests: Limite de taxa do dispositivo excedido
             - 500 Internal Server Error: Erro inesperado
         """
+        idempotency_key = request.headers.get("Idempotency-Key")
+
+        if idempotency_key and not is_valid_idempotency_key(idempotency_key):
+            return Response(
+                {"detail": INVALID_IDEMPOTENCY_KEY},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Reenvio de dispositivo autenticado por chave identificado antes
+        # do processamento do corpo: a evidência não chega a ser lida nem
+        # gravada. Com JWT, o dispositivo só é conhecido após a validação
+        if (
+            idempotency_key
+            and isinstance(request.user, DeviceUser)
+            and is_known_key(request.user.device.mac, idempotency_key)
+        ):
+            return self._duplicate_response()
+
         try:
             serializer = MonitoringEventSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            
+
+            if foreign_devices(request.user, [serializer.validated_data]):
+                discard_uploads(request.FILES)
+                return self._forbidden_device_response()
+
+            if idempotency_key:
+                serializer.validated_data["idempotency_key"] = idempotency_key
+
+            # Reenvios não são cobrados do limite de taxa
+            if find_duplicates([serializer.validated_data]):
+                discard_uploads(request.FILES)
+                return self._duplicate_response()
+
+            throttle = DeviceRateThrottle()
+            if not throttle.charge(request, [serializer.validated_data]):
+                discard_uploads(request.FILES)
+                return throttled_response(throttle)
+
+            # Modo assíncrono: a persistência (e a deduplicação de
+            # reenvios ainda na fila) fica a cargo dos workers do
+            # comando process_monitoring_queue
+            if settings.MONITORING_ASYNC_INGESTION:
+                enqueue_event(serializer.validated_data)
+
+                return Response(
+                    {"detail": "Evento aceito para processamento"},
+                    status=status.HTTP_202_ACCEPTED
+                )
+
             event = serializer.save()
+            remember([serializer.validated_data])
+
+            if event.pk is None:
+                # Evento agrupado em um incidente já registrado
+                report_log(
+                    user=request.user,
+                    action="Criar Evento de Monitoramento",
+                    status="SUCCESS",
+                    message=(
+                        f"Evento agrupado no incidente {event.incident.pk} "
+                        f"para MAC {event.mac_address}"
+                    )
+                )
+                return Response(
+                    {
+                        "detail": "Evento agrupado em incidente existente",
+                        "incident": event.incident.pk,
+                    },
+                    status=status.HTTP_201_CREATED
+                )
             
             report_log(
                 user=request.user,
@@ -86,6 +252,7 @@ class MonitoringCreateView(APIView):
             )
             
         except ValidationError as exc:
+            discard_uploads(request.FILES)
             report_log(
                 user=request.user,
                 action="Criar Evento de Monitoramento",
@@ -96,8 +263,28 @@ class MonitoringCreateView(APIView):
                 exc.detail,
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+        except IntegrityError as exc:
+            discard_uploads(request.FILES)
+
+            # Reenvio registrado concorrentemente (Idempotency-Key única
+            # por dispositivo); outras violações são erros
+            if recorded_concurrently([serializer.validated_data]):
+                return self._duplicate_response()
+
+            report_log(
+                user=request.user,
+                action="Criar Evento de Monitoramento",
+                status="ERROR",
+                message=f"Violação de integridade ao criar evento: {str(exc)}"
+            )
+            return Response(
+                {"detail": "Erro interno do servidor"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
         
         except Exception as exc:
+            discard_uploads(request.FILES)
             report_log(
                 user=request.user,
                 action="Criar Evento de Monitoramento",
@@ -108,3 +295,396 @@ class MonitoringCreateView(APIView):
                 {"detail": "Erro interno do servidor"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    def _duplicate_response(self) -> Response:
+        """
+        Resposta enviada a reenvios de eventos já registrados.
+        """
+        return Response(
+            {"detail": "Evento já registrado"},
+            status=status.HTTP_200_OK
+        )
+
+    def _forbidden_device_response(self) -> Response:
+        """
+        Resposta enviada quando a chave de dispositivo não corresponde
+        ao MAC do evento.
+        """
+        return Response(
+            {"detail": "Chave não autorizada para o dispositivo informado"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+
+class MonitoringBatchCreateView(APIView):
+    """
+    View responsável pelo recebimento de lotes de eventos
+    de monitoramento enviados por dispositivos edge.
+
+    Permite que o dispositivo envie N eventos e suas N evidências
+    em uma única requisição, reduzindo round trips, validações
+    de token e registros de log por evento.
+
+    O lote é tratado de forma atômica: ou todos os eventos são
+    registrados, ou nenhum é.
+    """
+
+    authentication_classes = [DeviceKeyAuthentication, JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [DeviceRateThrottle]
+    parser_classes = [EvidenceMultiPartParser, FormParser]
+
+    @extend_schema(
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "events": {"type": "string"},
+                    "evidence_0": {"type": "string", "format": "binary"},
+                },
+            }
+        },
+        responses={201: None, 400: None, 401: None, 403: None, 409: None, 429: None, 500: None},
+        description=(
+            "Recebe um lote de eventos de monitoramento. O campo `events` "
+            "contém uma lista JSON de eventos e a evidência de cada item "
+            "é enviada na parte `evidence_<índice>`."
+        )
+    )
+    def post(self, request: Request) -> Response:
+        """
+        Processa o registro de um lote de eventos de monitoramento.
+
+        Responsabilidades:
+        - Montar os itens do lote a partir do payload multipart
+        - Validar todos os itens com o MonitoringEventSerializer
+        - Ignorar itens que sejam reenvios de eventos já registrados
+        - Persistir os eventos em uma única transação, agrupando-os em
+          incidentes quando MONITORING_COALESCE_WINDOW estiver habilitado
+        - Retornar o resultado de cada item do lote
+        - Registrar um único log para o lote
+
+        Espera uma requisição multipart/form-data contendo:
+            - events (lista JSON com mac_address, detected_class e detected_at)
+            - evidence_<índice> (arquivo de imagem de cada item)
+
+        Returns
+        -------
+        Response
+            - 201 Created: Lote registrado com sucesso
+            - 400 Bad Request: Lote ou itens inválidos
+            - 401 Unauthorized: Usuário ou dispositivo não autenticado
+            - 403 Forbidden: Chave de dispositivo usada para outro MAC
+            - 429 Too Many Requests: Limite de taxa do dispositivo excedido
+            - 409 Conflict: Itens registrados concorrentemente
+            - 500 Internal Server Error: Erro inesperado
+        """
+        try:
+            items = build_batch_items(request.data)
+
+            serializer = MonitoringEventSerializer(data=items, many=True)
+
+            if not serializer.is_valid():
+                discard_uploads(request.FILES)
+                results = [
+                    {"index": index, "status": "invalid", "errors": errors}
+                    if errors else
+                    {"index": index, "status": "valid"}
+                    for index, errors in enumerate(serializer.errors)
+                ]
+
+                report_log(
+                    user=request.user,
+                    action="Criar Lote de Eventos de Monitoramento",
+                    status="WARNING",
+                    message=(
+                        f"Lote com {len(items)} eventos rejeitado por "
+                        "dados inválidos"
+                    )
+                )
+                return Response(
+                    {"detail": "Lote contém itens inválidos", "results": results},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            items = serializer.validated_data
+
+            foreign = foreign_devices(request.user, items)
+            if foreign:
+                discard_uploads(request.FILES)
+                return Response(
+                    {
+                        "detail": "Chave não autorizada para o dispositivo informado",
+                        "results": [
+                            {"index": index, "status": "forbidden"} for index in foreign
+                        ],
+                    },
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            duplicates = find_duplicates(items)
+
+            accepted = [
+                index for index in range(len(items))
+                if index not in duplicates
+            ]
+
+            # Um token por evento novo do lote
+            throttle = DeviceRateThrottle()
+            if not throttle.charge(request, [items[index] for index in accepted]):
+                discard_uploads(request.FILES)
+                return throttled_response(throttle)
+            events = persist_events([
+                MonitoringEvent(**items[index]) for index in accepted
+            ])
+            remember(items)
+
+            results = batch_results(len(items), accepted, events)
+
+            report_log(
+                user=request.user,
+                action="Criar Lote de Eventos de Monitoramento",
+                status="SUCCESS",
+                message=(
+                    f"Lote com {len(events)} eventos registrado "
+                    f"({len(duplicates)} reenvios ignorados)"
+                )
+            )
+            return Response(
+                {"detail": "Lote registrado com sucesso", "results": results},
+                status=status.HTTP_201_CREATED
+            )
+
+        except ValidationError as exc:
+            discard_uploads(request.FILES)
+            report_log(
+                user=request.user,
+                action="Criar Lote de Eventos de Monitoramento",
+                status="WARNING",
+                message=f"Lote inválido: {exc}"
+            )
+            return Response(
+                exc.detail,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        except IntegrityError as exc:
+            discard_uploads(request.FILES)
+
+            # Itens do lote registrados concorrentemente: o dispositivo
+            # deve reenviar o lote, cujos itens já registrados serão
+            # identificados como reenvios
+            if recorded_concurrently(items):
+                return Response(
+                    {"detail": "Lote contém eventos registrados concorrentemente"},
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            report_log(
+                user=request.user,
+                action="Criar Lote de Eventos de Monitoramento",
+                status="ERROR",
+                message=f"Violação de integridade ao criar lote: {str(exc)}"
+            )
+            return Response(
+                {"detail": "Erro interno do servidor"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        except Exception as exc:
+            discard_uploads(request.FILES)
+            report_log(
+                user=request.user,
+                action="Criar Lote de Eventos de Monitoramento",
+                status="ERROR",
+                message=f"Erro inesperado ao criar lote: {str(exc)}"
+            )
+            return Response(
+                {"detail": "Erro interno do servidor"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class MonitoringBinaryCreateView(APIView):
+    """
+    View responsável pelo recebimento de eventos de monitoramento
+    no protocolo binário compacto (ver `monitoring.binary`).
+
+    Alternativa ao multipart/form-data para dispositivos em links
+    restritos: cada frame carrega MAC, classe e data/hora em um
+    cabeçalho de tamanho fixo, seguido da imagem de evidência, e a
+    validação é feita sem serializers do DRF.
+
+    Assim como no endpoint de lote, os frames são tratados de forma
+    atômica: ou todos os eventos são registrados, ou nenhum é.
+    """
+
+    authentication_classes = [DeviceKeyAuthentication, JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [DeviceRateThrottle]
+    parser_classes = [BinaryEventParser]
+
+    @extend_schema(
+        request={BinaryEventParser.media_type: {"type": "string", "format": "binary"}},
+        responses={201: None, 400: None, 401: None, 403: None, 409: None, 415: None, 429: None, 500: None, 503: None},
+        description=(
+            "Recebe um ou mais eventos de monitoramento no protocolo binário. "
+            "Cada frame contém MAC (6 bytes), classe (uint16), data/hora em "
+            "epoch ms (uint64) e tamanho da imagem (uint32), seguidos da imagem."
+        )
+    )
+    def post(self, request: Request) -> Response:
+        """
+        Processa o registro de eventos enviados no protocolo binário.
+
+        Responsabilidades:
+        - Decodificar os frames do corpo da requisição
+        - Validar cada frame (classe, data/hora e imagem)
+        - Ignorar frames que sejam reenvios de eventos já registrados
+        - Persistir os eventos em uma única transação
+        - Retornar o resultado de cada frame
+        - Registrar um único log para a requisição
+
+        Espera uma requisição com Content-Type
+        application/vnd.edge-monitor.events.
+
+        Returns
+        -------
+        Response
+            - 201 Created: Eventos registrados com sucesso
+            - 400 Bad Request: Frames malformados ou inválidos
+            - 401 Unauthorized: Usuário ou dispositivo não autenticado
+            - 403 Forbidden: Chave de dispositivo usada para outro MAC
+            - 429 Too Many Requests: Limite de taxa do dispositivo excedido
+            - 409 Conflict: Eventos registrados concorrentemente
+            - 415 Unsupported Media Type: Content-Type não suportado
+            - 500 Internal Server Error: Erro inesperado
+            - 503 Service Unavailable: Classes de detecção não configuradas
+        """
+        if not settings.MONITORING_DETECTION_CLASSES:
+            report_log(
+                user=request.user,
+                action="Criar Eventos de Monitoramento (Binário)",
+                status="ERROR",
+                message="MONITORING_DETECTION_CLASSES não configurado"
+            )
+            return Response(
+                {"detail": "Protocolo binário não configurado no servidor"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        try:
+            frames = request.data
+
+            items = []
+            errors = []
+            for index, frame in enumerate(frames):
+                try:
+                    items.append(validate_frame(frame))
+                except FrameValidationError as exc:
+                    errors.append({"index": index, "status": "invalid", "errors": [str(exc)]})
+
+            if errors:
+                report_log(
+                    user=request.user,
+                    action="Criar Eventos de Monitoramento (Binário)",
+                    status="WARNING",
+                    message=(
+                        f"Requisição com {len(frames)} frames rejeitada por "
+                        "dados inválidos"
+                    )
+                )
+                return Response(
+                    {"detail": "Requisição contém frames inválidos", "results": errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            foreign = foreign_devices(request.user, items)
+            if foreign:
+                return Response(
+                    {
+                        "detail": "Chave não autorizada para o dispositivo informado",
+                        "results": [
+                            {"index": index, "status": "forbidden"} for index in foreign
+                        ],
+                    },
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            duplicates = find_duplicates(items)
+
+            accepted = [
+                index for index in range(len(items))
+                if index not in duplicates
+            ]
+
+            # Um token por frame novo
+            throttle = DeviceRateThrottle()
+            if not throttle.charge(request, [items[index] for index in accepted]):
+                return throttled_response(throttle)
+            events = persist_events([
+                MonitoringEvent(**items[index]) for index in accepted
+            ])
+            remember(items)
+
+            report_log(
+                user=request.user,
+                action="Criar Eventos de Monitoramento (Binário)",
+                status="SUCCESS",
+                message=(
+                    f"{len(events)} eventos registrados "
+                    f"({len(duplicates)} reenvios ignorados)"
+                )
+            )
+            return Response(
+                {
+                    "detail": "Eventos registrados com sucesso",
+                    "results": batch_results(len(items), accepted, events),
+                },
+                status=status.HTTP_201_CREATED
+            )
+
+        except ParseError as exc:
+            report_log(
+                user=request.user,
+                action="Criar Eventos de Monitoramento (Binário)",
+                status="WARNING",
+                message=f"Requisição malformada: {exc}"
+            )
+            return Response(
+                {"detail": str(exc.detail)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        except IntegrityError as exc:
+            if recorded_concurrently(items):
+                return Response(
+                    {"detail": "Requisição contém eventos registrados concorrentemente"},
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            report_log(
+                user=request.user,
+                action="Criar Eventos de Monitoramento (Binário)",
+                status="ERROR",
+                message=f"Violação de integridade ao criar eventos: {str(exc)}"
+            )
+            return Response(
+                {"detail": "Erro interno do servidor"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        except UnsupportedMediaType:
+            raise
+
+        except Exception as exc:
+            report_log(
+                user=request.user,
+                action="Criar Eventos de Monitoramento (Binário)",
+                status="ERROR",
+                message=f"Erro inesperado ao criar eventos: {str(exc)}"
+            )
+            return Response(
+                {"detail": "Erro interno do servidor"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -68,6 +68,8 @@ INSTALLED_APPS = [
 # MIDDLEWARES
 
 MIDDLEWARE = [
+    # Primeiro middleware: mede a requisição completa
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -132,6 +134,22 @@ DATABASES = {
 }
 
 
+# CACHE
+
+# Cache compartilhado entre os processos da aplicação (ex.: limites de
+# taxa por dispositivo). Em produção, utilizar um backend compartilhado,
+# como django.core.cache.backends.redis.RedisCache
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+
 # VALIDAÇÃO DE SENHAS
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -206,6 +224,295 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# CONFIGURAÇÕES DE PAGINAÇÃO
+
+# Quantidade padrão e máxima de registros por página nas listagens
+# paginadas por cursor (ver core.pagination)
+PAGINATION_PAGE_SIZE = config(
+    "PAGINATION_PAGE_SIZE",
+    default=100,
+    cast=int
+)
+
+PAGINATION_MAX_PAGE_SIZE = config(
+    "PAGINATION_MAX_PAGE_SIZE",
+    default=1000,
+    cast=int
+)
+
+# CONFIGURAÇÕES DE MONITORAMENTO
+
+# Quantidade máxima de eventos aceitos em um único lote
+MONITORING_BATCH_MAX_SIZE = config(
+    "MONITORING_BATCH_MAX_SIZE",
+    default=100,
+    cast=int
+)
+
+# Tamanho máximo (bytes) de cada evidência recebida
+MONITORING_EVIDENCE_MAX_SIZE = config(
+    "MONITORING_EVIDENCE_MAX_SIZE",
+    default=10 * 1024 * 1024,
+    cast=int
+)
+
+# Derivados gerados para cada evidência (nome: maior lado em pixels)
+MONITORING_EVIDENCE_DERIVATIVES = {
+    "thumbnail": 160,
+    "preview": 640,
+}
+
+# Gera os derivados das evidências em segundo plano durante a ingestão,
+# em um pool de processos iniciado pelo próprio processo web. Quando
+# desabilitado, os derivados são gerados sob demanda, no primeiro acesso
+# (ou pelo comando generate_derivatives)
+MONITORING_DERIVATIVES_AT_INGEST = config(
+    "MONITORING_DERIVATIVES_AT_INGEST",
+    default=False,
+    cast=bool
+)
+
+# Quantidade de processos do pool de geração de derivados
+MONITORING_DERIVATIVE_WORKERS = config(
+    "MONITORING_DERIVATIVE_WORKERS",
+    default=2,
+    cast=int
+)
+
+# Quantidade de chaves de eventos recentes mantidas em memória para
+# detecção de reenvios
+MONITORING_IDEMPOTENCY_CACHE_SIZE = config(
+    "MONITORING_IDEMPOTENCY_CACHE_SIZE",
+    default=10000,
+    cast=int
+)
+
+# Quantidade de dispositivos mantidos no cache em memória da resolução
+# MAC -> dispositivo
+MONITORING_DEVICE_CACHE_SIZE = config(
+    "MONITORING_DEVICE_CACHE_SIZE",
+    default=10000,
+    cast=int
+)
+
+# Tempo (segundos) em que um dispositivo resolvido permanece no cache do
+# processo; alterações do dispositivo (ex.: limite de taxa) levam até
+# este tempo para valer em outros processos
+MONITORING_DEVICE_CACHE_TTL = config(
+    "MONITORING_DEVICE_CACHE_TTL",
+    default=300,
+    cast=int
+)
+
+# Considera duplicados eventos com mesmo MAC, classe e data/hora de
+# detecção quando o dispositivo não envia Idempotency-Key. Desabilitado
+# por padrão: detecções legítimas distintas podem coincidir nesses campos
+MONITORING_IDEMPOTENCY_NATURAL_KEY = config(
+    "MONITORING_IDEMPOTENCY_NATURAL_KEY",
+    default=False,
+    cast=bool
+)
+
+# Janela (segundos) para agrupamento de detecções de um mesmo
+# dispositivo e classe em um único incidente (0 desabilita)
+MONITORING_COALESCE_WINDOW = config(
+    "MONITORING_COALESCE_WINDOW",
+    default=0,
+    cast=int
+)
+
+# Aceita eventos de forma assíncrona (202) e delega a persistência
+# aos workers do comando process_monitoring_queue
+MONITORING_ASYNC_INGESTION = config(
+    "MONITORING_ASYNC_INGESTION",
+    default=False,
+    cast=bool
+)
+
+# Diretório da fila durável de eventos aceitos de forma assíncrona
+MONITORING_SPOOL_DIR = config(
+    "MONITORING_SPOOL_DIR",
+    default=str(BASE_DIR / "spool")
+)
+
+# Diretório de preparação das evidências recebidas em streaming, fora
+# de MEDIA_ROOT; no mesmo sistema de arquivos de MEDIA_ROOT, a evidência
+# é movida para o storage sem cópia
+MONITORING_UPLOAD_STAGING_DIR = config(
+    "MONITORING_UPLOAD_STAGING_DIR",
+    default=str(BASE_DIR / "uploads")
+)
+
+# Tempo (segundos) após o qual um evento reivindicado e não concluído
+# é considerado abandonado e devolvido à fila por outro worker
+MONITORING_SPOOL_LEASE_TIMEOUT = config(
+    "MONITORING_SPOOL_LEASE_TIMEOUT",
+    default=600,
+    cast=int
+)
+
+# Espera máxima (segundos) entre tentativas dos workers da fila após
+# erros transitórios do banco de dados (a espera dobra a cada falha)
+MONITORING_SPOOL_RETRY_MAX_DELAY = config(
+    "MONITORING_SPOOL_RETRY_MAX_DELAY",
+    default=60,
+    cast=int
+)
+
+# Classes de detecção aceitas pelo protocolo binário de ingestão; o
+# identificador de classe enviado em cada frame é o índice nesta lista,
+# que deve corresponder à configuração dos dispositivos. Sem classes
+# configuradas, o endpoint binário responde 503 (ver check monitoring.W001)
+MONITORING_DETECTION_CLASSES = config(
+    "MONITORING_DETECTION_CLASSES",
+    default="",
+    cast=Csv()
+)
+
+# Tamanho máximo (bytes) do corpo de uma requisição do protocolo binário
+MONITORING_BINARY_MAX_BODY_SIZE = config(
+    "MONITORING_BINARY_MAX_BODY_SIZE",
+    default=32 * 1024 * 1024,
+    cast=int
+)
+
+# Tempo (segundos) em que uma chave de dispositivo verificada permanece
+# em cache no processo; a revogação leva até este tempo para valer em
+# outros processos
+MONITORING_DEVICE_KEY_CACHE_TTL = config(
+    "MONITORING_DEVICE_KEY_CACHE_TTL",
+    default=60,
+    cast=int
+)
+
+# Limite de taxa padrão por dispositivo (token bucket): requisições de
+# ingestão por segundo e rajada máxima. Pode ser sobrescrito por
+# dispositivo (Device.throttle_rate / Device.throttle_burst); taxa 0
+# desabilita o limite
+MONITORING_THROTTLE_RATE = config(
+    "MONITORING_THROTTLE_RATE",
+    default=5.0,
+    cast=float
+)
+
+MONITORING_THROTTLE_BURST = config(
+    "MONITORING_THROTTLE_BURST",
+    default=20,
+    cast=int
+)
+
+# Meses anteriores ao corrente com partição mensal criada na conversão
+# da tabela de eventos (manage_partitions --convert); eventos mais
+# antigos são gravados na partição padrão
+MONITORING_PARTITION_HORIZON_MONTHS = config(
+    "MONITORING_PARTITION_HORIZON_MONTHS",
+    default=12,
+    cast=int
+)
+
+# Idade (dias) a partir da qual os eventos são arquivados e removidos
+# do banco de dados pelo comando archive_events
+MONITORING_RETENTION_DAYS = config(
+    "MONITORING_RETENTION_DAYS",
+    default=90,
+    cast=int
+)
+
+# Diretório do arquivo frio de eventos e evidências (ver
+# monitoring.archive)
+MONITORING_ARCHIVE_DIR = config(
+    "MONITORING_ARCHIVE_DIR",
+    default=str(BASE_DIR / "archive")
+)
+
+# CONFIGURAÇÕES DO DASHBOARD
+
+# Atualiza as contagens agregadas (rollups) na ingestão; quando
+# desabilitado, devem ser recalculadas periodicamente pelo comando
+# rebuild_rollups
+DASHBOARD_ROLLUPS_AT_INGEST = config(
+    "DASHBOARD_ROLLUPS_AT_INGEST",
+    default=True,
+    cast=bool
+)
+
+# Tempo (segundos) de permanência das respostas do dashboard no cache
+# (CACHES). Novos eventos invalidam as respostas em até
+# DASHBOARD_VERSION_BUMP_INTERVAL segundos; o tempo limita apenas a
+# exibição de eventos já removidos (0 = sem cache de respostas,
+# mantendo ETag / 304)
+DASHBOARD_CACHE_TTL = config(
+    "DASHBOARD_CACHE_TTL",
+    default=300,
+    cast=int
+)
+
+# Intervalo mínimo (segundos) entre os incrementos da versão dos
+# eventos, por processo; ingestões dentro do intervalo são exibidas no
+# dashboard ao final dele (0 = incremento a cada ingestão)
+DASHBOARD_VERSION_BUMP_INTERVAL = config(
+    "DASHBOARD_VERSION_BUMP_INTERVAL",
+    default=1.0,
+    cast=float
+)
+
+# Quantidade de eventos lidos do banco de dados por bloco na exportação
+# em fluxo (/api/dashboard/export/)
+DASHBOARD_EXPORT_CHUNK_SIZE = config(
+    "DASHBOARD_EXPORT_CHUNK_SIZE",
+    default=2000,
+    cast=int
+)
+
+# Intervalo (segundos) entre as mensagens de keepalive das conexões ao
+# vivo (/api/dashboard/live/) sem novos eventos
+DASHBOARD_LIVE_KEEPALIVE = config(
+    "DASHBOARD_LIVE_KEEPALIVE",
+    default=15,
+    cast=int
+)
+
+# Eventos pendentes por conexão ao vivo; acima deste limite, a conexão
+# é encerrada (evento overflow)
+DASHBOARD_LIVE_MAX_PENDING = config(
+    "DASHBOARD_LIVE_MAX_PENDING",
+    default=1000,
+    cast=int
+)
+
+# Validade (segundos) do token da conexão ao vivo, informado na
+# querystring por clientes EventSource (/api/dashboard/live/token/)
+DASHBOARD_LIVE_TOKEN_LIFETIME = config(
+    "DASHBOARD_LIVE_TOKEN_LIFETIME",
+    default=60,
+    cast=int
+)
+
+# Atraso (segundos) do feed de alterações (/api/dashboard/changes/):
+# eventos mais recentes são retornados apenas na consulta seguinte,
+# após o commit das ingestões em andamento. No PostgreSQL, o feed também
+# aguarda as transações de escrita abertas (ver dashboard.queries)
+DASHBOARD_CHANGES_LAG = config(
+    "DASHBOARD_CHANGES_LAG",
+    default=2,
+    cast=int
+)
+
+# CONFIGURAÇÕES DE MÉTRICAS
+
+# Token exigido pelo endpoint /metrics. Sem token, o endpoint responde
+# apenas a requisições originadas de METRICS_ALLOWED_IPS (REMOTE_ADDR;
+# atrás de um proxy reverso, configurar o token).
+# Com vários workers, definir a variável de ambiente
+# PROMETHEUS_MULTIPROC_DIR (ver core.metrics)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+METRICS_ALLOWED_IPS = config(
+    "METRICS_ALLOWED_IPS",
+    default="127.0.0.1,::1",
+    cast=Csv()
+)
+
 # CONFIGURAÇÕES DE EMAIL (SMTP)
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
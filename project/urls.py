@@ -6,6 +6,7 @@ Este módulo define:
 - Exposição do schema OpenAPI
 - Interface Swagger
 - Inclusão das rotas dos módulos da aplicação
+- Exposição das métricas (Prometheus)
 """
 from django.contrib import admin
 from django.urls import include, path
@@ -44,11 +45,25 @@ urlpatterns = [
     
     # MONITORAMENTO
     # POST /api/monitoring/
+    # POST /api/monitoring/batch/
+    # POST /api/monitoring/binary/
+    # POST /api/monitoring/async/
     path("api/monitoring/", include("monitoring.urls")),
     
     # DASHBOARD
     # GET /api/dashboard/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
-    path("api/dashboard/", include("dashboard.urls"))
+    # GET /api/dashboard/async/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    # GET /api/dashboard/changes/?since=<cursor>
+    # GET /api/dashboard/live/?detected_class=person (Server-Sent Events)
+    # GET /api/dashboard/rollups/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&granularity=hour|day
+    # GET /api/dashboard/aggregate/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&bucket=hour&group_by=class
+    # GET /api/dashboard/export/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&file_format=csv
+    # GET /api/dashboard/archive/?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+    path("api/dashboard/", include("dashboard.urls")),
+
+    # MÉTRICAS
+    # GET /metrics
+    path("", include("core.urls")),
 
 ]
 